@@ -5,6 +5,10 @@ Package core contenant la configuration et les utilitaires de l'application.
 from app.core.config import APP_CONFIG
 from app.core.utils import (
     create_csv_if_not_exists,
+    append_csv_rows,
+    append_csv_block,
+    write_csv_atomic,
+    repair_csv_tail,
     load_json_file,
     save_json_file,
     format_currency,
@@ -28,6 +28,22 @@ REVENUS_CSV = os.path.join(DATA_DIR, "Revenus.csv")
 CATEGORIES_JSON = os.path.join(DATA_DIR, "categories.json")
 CATEGORIES_MAPPING_JSON = os.path.join(DATA_DIR, "categories_mapping.json")
 TRANSACTIONS_IMPORTEES_JSON = os.path.join(DATA_DIR, "transactions_importees.json")
+MODELE_CATEGORIES_JSON = os.path.join(DATA_DIR, "modele_categories.json")
+
+# Stockage des dépenses et revenus par colonnes NumPy (pour les gros volumes)
+STOCKAGE_COLONNAIRE = False
+
+# Instantanés binaires (.cache) des CSV, pour éviter leur analyse à chaque démarrage
+INSTANTANES_CSV = True
+
+# Contrôle des totaux du stock (valeur, catégories) par un recalcul complet à chaque
+# consultation : mode de débogage, coûteux sur un gros catalogue
+VERIFIER_TOTAUX_STOCK = False
+
+# Stockage des données : "csv" (fichiers du répertoire data) ou "sqlite" (base BASE_SQLITE,
+# alimentée depuis les CSV au premier lancement)
+STOCKAGE = "csv"
+BASE_SQLITE = os.path.join(DATA_DIR, "gestion.sqlite3")
 
 # S'assurer que le répertoire de données existe
 os.makedirs(DATA_DIR, exist_ok=True)
\ No newline at end of file
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Instantanés binaires des fichiers CSV de données.
+
+Chaque fichier CSV peut être accompagné d'un instantané (même nom, extension .cache)
+contenant les données déjà analysées, sérialisées avec pickle (protocole 5, tampons
+hors bande). L'instantané est identifié par la date de modification, la taille et
+l'empreinte du CSV : il est ignoré et reconstruit dès que le CSV change.
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+from typing import Any, Callable, Optional, Tuple
+
+SNAPSHOT_EXTENSION = ".cache"
+_MAGIC = b"GACACHE1"
+# Signature, date de modification (ns), taille du CSV, empreinte, taille du pickle, nombre de tampons
+_HEADER = struct.Struct("<8sqq32sQI")
+_BUFFER_LENGTH = struct.Struct("<Q")
+_HASH_BLOCK = 1 << 20
+# Une modification du CSV proche de l'écriture de l'instantané peut laisser sa date
+# inchangée (granularité du système de fichiers) : l'empreinte est alors vérifiée
+_RACY_WINDOW_NS = 2_000_000_000
+
+def snapshot_path(csv_path: str) -> str:
+    """
+    Retourne le chemin de l'instantané associé à un fichier CSV.
+
+    Args:
+        csv_path (str): Chemin du fichier CSV.
+
+    Returns:
+        str: Chemin de l'instantané.
+    """
+    return os.path.splitext(csv_path)[0] + SNAPSHOT_EXTENSION
+
+def file_digest(filepath: str, length: Optional[int] = None) -> bytes:
+    """
+    Calcule l'empreinte (BLAKE2b) d'un fichier ou de ses premiers octets.
+
+    Args:
+        filepath (str): Chemin du fichier.
+        length (Optional[int], optional): Nombre d'octets à prendre en compte. Par défaut: tout le fichier.
+
+    Returns:
+        bytes: Empreinte de 32 octets.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    remaining = os.path.getsize(filepath) if length is None else length
+    with open(filepath, 'rb') as f:
+        while remaining > 0:
+            block = f.read(min(_HASH_BLOCK, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest.digest()
+
+def file_signature(filepath: str) -> Tuple[int, int, bytes]:
+    """
+    Retourne la signature d'un fichier : date de modification (ns), taille et empreinte.
+
+    Args:
+        filepath (str): Chemin du fichier.
+
+    Returns:
+        Tuple[int, int, bytes]: Date de modification, taille et empreinte du fichier.
+    """
+    stat = os.stat(filepath)
+    return stat.st_mtime_ns, stat.st_size, file_digest(filepath, stat.st_size)
+
+def save_snapshot(csv_path: str, data: Any, signature: Tuple[int, int, bytes]) -> None:
+    """
+    Enregistre l'instantané des données analysées d'un fichier CSV.
+    Les objets `pickle.PickleBuffer` contenus dans les données sont écrits hors bande,
+    à la suite du pickle, et relus en un seul bloc chacun.
+
+    Args:
+        csv_path (str): Chemin du fichier CSV dont les données sont issues.
+        data (Any): Données à enregistrer.
+        signature (Tuple[int, int, bytes]): Signature du CSV (voir file_signature),
+            relevée avant son analyse.
+    """
+    mtime_ns, size, digest = signature
+    buffers = []
+    payload = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+    raw_buffers = [buffer.raw() for buffer in buffers]
+
+    path = snapshot_path(csv_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, mtime_ns, size, digest, len(payload), len(raw_buffers)))
+        for raw in raw_buffers:
+            f.write(_BUFFER_LENGTH.pack(raw.nbytes))
+        f.write(payload)
+        for raw in raw_buffers:
+            f.write(raw)
+    os.replace(tmp_path, path)
+
+def load_snapshot(csv_path: str) -> Tuple[Optional[Any], int]:
+    """
+    Charge l'instantané d'un fichier CSV, s'il correspond encore à son contenu.
+
+    L'instantané est valide sans relire le CSV si la date de modification et la taille
+    sont inchangées et que le CSV est nettement antérieur à l'instantané ; sinon
+    l'empreinte du CSV est recalculée. Si le CSV n'a fait que s'allonger (lignes
+    ajoutées à la fin), l'instantané est retourné avec le nombre d'octets qu'il couvre,
+    pour que seule la fin du fichier soit analysée.
+
+    Le pickle est lu directement dans la projection mémoire de l'instantané ; les tampons
+    hors bande en sont copiés, pour que la projection soit fermée avant le retour.
+
+    Args:
+        csv_path (str): Chemin du fichier CSV.
+
+    Returns:
+        Tuple[Optional[Any], int]: Données et nombre d'octets du CSV qu'elles couvrent,
+            ou (None, 0) si aucun instantané n'est utilisable.
+    """
+    mapped = None
+    try:
+        with open(snapshot_path(csv_path), 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            written_ns = os.fstat(f.fileno()).st_mtime_ns
+        with memoryview(mapped) as view:
+            magic, mtime_ns, size, digest, payload_length, buffer_count = _HEADER.unpack_from(view)
+            if magic != _MAGIC:
+                return None, 0
+
+            stat = os.stat(csv_path)
+            if stat.st_size < size:
+                return None, 0
+            unchanged = (stat.st_size == size and stat.st_mtime_ns == mtime_ns
+                         and mtime_ns < written_ns - _RACY_WINDOW_NS)
+            if not unchanged:
+                if file_digest(csv_path, size) != digest or not _ends_with_newline(csv_path, size):
+                    return None, 0
+
+            offset = _HEADER.size
+            lengths = []
+            for _ in range(buffer_count):
+                lengths.append(_BUFFER_LENGTH.unpack_from(view, offset)[0])
+                offset += _BUFFER_LENGTH.size
+            payload_offset = offset
+            offset += payload_length
+            buffers = []
+            for length in lengths:
+                buffers.append(bytearray(view[offset:offset + length]))
+                offset += length
+            with view[payload_offset:payload_offset + payload_length] as payload:
+                return pickle.loads(payload, buffers=buffers), size
+    except FileNotFoundError:
+        return None, 0
+    except Exception as e:
+        print(f"Instantané illisible pour {csv_path}, il sera reconstruit: {e}")
+        return None, 0
+    finally:
+        if mapped is not None:
+            mapped.close()
+
+def load_with_snapshot(csv_path: str, parse: Callable[[], Any],
+                       extend: Optional[Callable[[Any, int], Any]] = None) -> Any:
+    """
+    Retourne les données analysées d'un fichier CSV en passant par son instantané.
+
+    Args:
+        csv_path (str): Chemin du fichier CSV.
+        parse (Callable[[], Any]): Analyse complète du CSV.
+        extend (Optional[Callable[[Any, int], Any]], optional): Complète les données d'un
+            instantané avec les lignes situées après l'octet donné. Par défaut: analyse complète.
+
+    Returns:
+        Any: Données analysées.
+    """
+    data, covered = load_snapshot(csv_path)
+    if data is not None and covered == os.path.getsize(csv_path):
+        return data
+
+    # Signature relevée avant l'analyse : un instantané ne doit pas couvrir des octets non analysés
+    signature = file_signature(csv_path)
+    if data is not None and extend is not None:
+        data = extend(data, covered)
+    else:
+        data = parse()
+
+    stat = os.stat(csv_path)
+    if (stat.st_mtime_ns, stat.st_size) != signature[:2]:
+        # CSV modifié pendant l'analyse : l'instantané sera construit au prochain chargement
+        return data
+    try:
+        save_snapshot(csv_path, data, signature)
+    except OSError as e:
+        print(f"Impossible d'enregistrer l'instantané de {csv_path}: {e}")
+    return data
+
+def _ends_with_newline(filepath: str, length: int) -> bool:
+    """Vérifie que les `length` premiers octets d'un fichier se terminent par une fin de ligne."""
+    if length == 0:
+        return True
+    with open(filepath, 'rb') as f:
+        f.seek(length - 1)
+        return f.read(1) == b"\n"
@@ -0,0 +1,587 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Stockage des données dans une base SQLite.
+Ce module définit la classe StockageSQLite, alternative aux fichiers CSV pour les
+gestionnaires financier et de stock. Les lignes échangées avec les gestionnaires sont
+des dictionnaires au format des méthodes `to_dict` des modèles.
+"""
+
+import datetime
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.config import STOCKAGE, BASE_SQLITE, DEPENSES_CSV, REVENUS_CSV
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS depenses (
+    id INTEGER PRIMARY KEY,
+    montant REAL NOT NULL,
+    categorie TEXT NOT NULL,
+    date TEXT NOT NULL,
+    notes TEXT NOT NULL DEFAULT '',
+    recurrence TEXT NOT NULL DEFAULT 'Aucune',
+    id_transaction TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_depenses_date ON depenses(date);
+CREATE INDEX IF NOT EXISTS idx_depenses_categorie ON depenses(categorie);
+
+CREATE TABLE IF NOT EXISTS revenus (
+    id INTEGER PRIMARY KEY,
+    montant REAL NOT NULL,
+    source TEXT NOT NULL,
+    date TEXT NOT NULL,
+    notes TEXT NOT NULL DEFAULT '',
+    recurrence TEXT NOT NULL DEFAULT 'Aucune',
+    id_transaction TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_revenus_date ON revenus(date);
+CREATE INDEX IF NOT EXISTS idx_revenus_source ON revenus(source);
+
+CREATE TABLE IF NOT EXISTS articles (
+    id TEXT PRIMARY KEY,
+    nom TEXT NOT NULL,
+    categorie TEXT NOT NULL,
+    quantite INTEGER NOT NULL DEFAULT 0,
+    prix_unitaire REAL NOT NULL DEFAULT 0,
+    seuil_alerte INTEGER NOT NULL DEFAULT 5,
+    date_peremption TEXT NOT NULL DEFAULT '',
+    fournisseur TEXT NOT NULL DEFAULT '',
+    code_produit TEXT NOT NULL DEFAULT '',
+    emplacement TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_articles_categorie ON articles(categorie);
+
+CREATE TABLE IF NOT EXISTS transactions_stock (
+    id INTEGER PRIMARY KEY,
+    id_article TEXT NOT NULL,
+    type_transaction TEXT NOT NULL,
+    quantite INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    motif TEXT NOT NULL DEFAULT '',
+    prix_unitaire REAL,
+    utilisateur TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_stock_article ON transactions_stock(id_article, date);
+
+CREATE TABLE IF NOT EXISTS parametres (
+    cle TEXT PRIMARY KEY,
+    valeur TEXT NOT NULL
+);
+"""
+
+# Colonne de regroupement de chaque table financière
+COLONNES_CLE = {"depenses": "categorie", "revenus": "source"}
+CHAMPS_ARTICLES = ["id", "nom", "categorie", "quantite", "prix_unitaire", "seuil_alerte",
+                   "date_peremption", "fournisseur", "code_produit", "emplacement"]
+CHAMPS_TRANSACTIONS = ["id_article", "type_transaction", "quantite", "date",
+                       "motif", "prix_unitaire", "utilisateur"]
+
+class StockageSQLite:
+    """
+    Base SQLite des dépenses, revenus, articles et transactions de stock.
+
+    La base est ouverte en mode WAL ; chaque écriture est faite dans une transaction,
+    et les écritures multiples sont regroupées dans une seule transaction. Les requêtes
+    sont paramétrées, donc préparées une fois puis réutilisées par SQLite.
+
+    Attributes:
+        chemin (str): Chemin du fichier de la base.
+    """
+
+    def __init__(self, chemin: str = BASE_SQLITE):
+        """
+        Ouvre (et crée si besoin) la base SQLite.
+
+        Args:
+            chemin (str, optional): Chemin du fichier de la base. Par défaut: BASE_SQLITE.
+        """
+        self.chemin = chemin
+        # La synchronisation bancaire écrit depuis un autre thread : accès protégés par un verrou
+        self._verrou = threading.RLock()
+        self._profondeur = 0
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False, isolation_level=None)
+        self._connexion.row_factory = sqlite3.Row
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        self._connexion.execute("PRAGMA synchronous=NORMAL")
+        self._connexion.executescript(SCHEMA)
+
+    def fermer(self) -> None:
+        """Ferme la connexion à la base."""
+        with self._verrou:
+            self._connexion.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Exécute un bloc d'écritures dans une seule transaction.
+        Les transactions imbriquées sont fusionnées dans la transaction englobante.
+
+        Yields:
+            sqlite3.Connection: Connexion à utiliser dans le bloc.
+        """
+        with self._verrou:
+            if self._profondeur == 0:
+                self._connexion.execute("BEGIN IMMEDIATE")
+            self._profondeur += 1
+            try:
+                yield self._connexion
+            except BaseException:
+                self._profondeur -= 1
+                if self._profondeur == 0:
+                    self._connexion.execute("ROLLBACK")
+                raise
+            self._profondeur -= 1
+            if self._profondeur == 0:
+                self._connexion.execute("COMMIT")
+
+    def _requete(self, sql: str, parametres: Tuple = ()) -> List[sqlite3.Row]:
+        """Exécute une requête de lecture et retourne toutes ses lignes."""
+        with self._verrou:
+            return self._connexion.execute(sql, parametres).fetchall()
+
+    def est_vide(self) -> bool:
+        """
+        Indique si la base ne contient encore aucune donnée.
+
+        Returns:
+            bool: True si toutes les tables sont vides.
+        """
+        return not any(self._requete(f"SELECT 1 FROM {table} LIMIT 1")
+                       for table in ("depenses", "revenus", "articles", "transactions_stock"))
+
+    def lire_parametre(self, cle: str) -> Optional[str]:
+        """
+        Lit un paramètre enregistré dans la base.
+
+        Args:
+            cle (str): Nom du paramètre.
+
+        Returns:
+            Optional[str]: Valeur du paramètre, ou None s'il n'est pas enregistré.
+        """
+        lignes = self._requete("SELECT valeur FROM parametres WHERE cle = ?", (cle,))
+        return lignes[0][0] if lignes else None
+
+    def enregistrer_parametre(self, cle: str, valeur: str) -> None:
+        """
+        Enregistre (ou remplace) un paramètre dans la base.
+
+        Args:
+            cle (str): Nom du paramètre.
+            valeur (str): Valeur du paramètre.
+        """
+        with self.transaction() as connexion:
+            connexion.execute("INSERT OR REPLACE INTO parametres (cle, valeur) VALUES (?, ?)", (cle, valeur))
+
+    # --- Dépenses et revenus ---
+
+    @staticmethod
+    def _colonne_cle(table: str) -> str:
+        """
+        Retourne la colonne de regroupement d'une table financière.
+
+        Raises:
+            ValueError: Si la table n'est pas une table financière.
+        """
+        if table not in COLONNES_CLE:
+            raise ValueError(f"Table financière inconnue: {table}")
+        return COLONNES_CLE[table]
+
+    @staticmethod
+    def _valeurs_finance(cle: str, ligne: Dict[str, Any]) -> Tuple:
+        """Convertit une ligne financière (format to_dict) en valeurs SQL."""
+        return (float(ligne["montant"]), ligne[cle], ligne["date"], ligne.get("notes") or "",
+                ligne.get("recurrence") or "Aucune", ligne.get("id_transaction") or None)
+
+    def lire_colonnes(self, table: str) -> Dict[str, List[Any]]:
+        """
+        Lit toutes les lignes d'une table financière sous forme de colonnes
+        (même format que le chargeur CSV, plus la colonne "id" des identifiants SQL).
+        Les lignes sont dans l'ordre croissant de leurs identifiants.
+
+        Args:
+            table (str): "depenses" ou "revenus".
+
+        Returns:
+            Dict[str, List[Any]]: Colonnes id, montant, catégorie/source, date, notes,
+                recurrence et id_transaction.
+        """
+        cle = self._colonne_cle(table)
+        noms = ["id", "montant", cle, "date", "notes", "recurrence", "id_transaction"]
+        lignes = self._requete(f"SELECT {', '.join(noms)} FROM {table} ORDER BY id")
+
+        colonnes = {nom: [ligne[i] for ligne in lignes] for i, nom in enumerate(noms)}
+        dates = {texte: datetime.date.fromisoformat(texte) for texte in set(colonnes["date"])}
+        colonnes["date"] = [dates[texte] for texte in colonnes["date"]]
+        return colonnes
+
+    def identifiants(self, table: str, date_debut: Optional[datetime.date] = None,
+                     date_fin: Optional[datetime.date] = None) -> List[int]:
+        """
+        Retourne les identifiants des lignes d'une période (bornes incluses), triés par date.
+
+        Args:
+            table (str): "depenses" ou "revenus".
+            date_debut (Optional[datetime.date], optional): Début de la période. Par défaut: sans limite.
+            date_fin (Optional[datetime.date], optional): Fin de la période. Par défaut: sans limite.
+
+        Returns:
+            List[int]: Identifiants des lignes de la période.
+        """
+        self._colonne_cle(table)
+        condition, parametres = self._condition_periode(date_debut, date_fin)
+        return [ligne[0] for ligne in self._requete(
+            f"SELECT id FROM {table}{condition} ORDER BY date, id", parametres)]
+
+    def inserer(self, table: str, lignes: Iterable[Dict[str, Any]]) -> None:
+        """
+        Insère des lignes dans une table financière, en une seule transaction.
+
+        Args:
+            table (str): "depenses" ou "revenus".
+            lignes (Iterable[Dict[str, Any]]): Lignes à insérer (format to_dict).
+        """
+        cle = self._colonne_cle(table)
+        with self.transaction() as connexion:
+            connexion.executemany(self._sql_insertion(table, cle),
+                                  (self._valeurs_finance(cle, ligne) for ligne in lignes))
+
+    def inserer_lot(self, table: str, lignes: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Insère des lignes dans une table financière, en une seule transaction.
+
+        Args:
+            table (str): "depenses" ou "revenus".
+            lignes (Iterable[Dict[str, Any]]): Lignes à insérer (format to_dict).
+
+        Returns:
+            List[int]: Identifiants SQL des lignes insérées, dans l'ordre des lignes fournies.
+        """
+        self._colonne_cle(table)
+        with self.transaction() as connexion:
+            dernier = connexion.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+            self.inserer(table, lignes)
+            return [ligne[0] for ligne in connexion.execute(
+                f"SELECT id FROM {table} WHERE id > ? ORDER BY id", (dernier,))]
+
+    def inserer_ligne(self, table: str, ligne: Dict[str, Any]) -> int:
+        """
+        Insère une ligne dans une table financière.
+
+        Args:
+            table (str): "depenses" ou "revenus".
+            ligne (Dict[str, Any]): Ligne à insérer (format to_dict).
+
+        Returns:
+            int: Identifiant SQL de la ligne insérée.
+        """
+        cle = self._colonne_cle(table)
+        with self.transaction() as connexion:
+            return connexion.execute(self._sql_insertion(table, cle),
+                                     self._valeurs_finance(cle, ligne)).lastrowid
+
+    @staticmethod
+    def _sql_insertion(table: str, cle: str) -> str:
+        """Retourne la requête d'insertion d'une ligne financière."""
+        return (f"INSERT INTO {table} (montant, {cle}, date, notes, recurrence, id_transaction) "
+                "VALUES (?, ?, ?, ?, ?, ?)")
+
+    def remplacer(self, table: str, identifiant: int, ligne: Dict[str, Any]) -> None:
+        """
+        Remplace le contenu d'une ligne d'une table financière.
+
+        Args:
+            table (str): "depenses" ou "revenus".
+            identifiant (int): Identifiant SQL de la ligne.
+            ligne (Dict[str, Any]): Nouveau contenu (format to_dict).
+        """
+        self.remplacer_lignes(table, [(identifiant, ligne)])
+
+    def supprimer(self, table: str, identifiant: int) -> None:
+        """
+        Supprime une ligne d'une table financière.
+
+        Args:
+            table (str): "depenses" ou "revenus".
+            identifiant (int): Identifiant SQL de la ligne.
+        """
+        self._colonne_cle(table)
+        with self.transaction() as connexion:
+            connexion.execute(f"DELETE FROM {table} WHERE id = ?", (identifiant,))
+
+    def remplacer_lignes(self, table: str, lignes: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        """
+        Remplace le contenu de plusieurs lignes d'une table financière, en une seule
+        transaction. Les identifiants des lignes sont conservés.
+
+        Args:
+            table (str): "depenses" ou "revenus".
+            lignes (Iterable[Tuple[int, Dict[str, Any]]]): Identifiant SQL et nouveau contenu
+                (format to_dict) de chaque ligne.
+        """
+        cle = self._colonne_cle(table)
+        with self.transaction() as connexion:
+            connexion.executemany(
+                f"UPDATE {table} SET montant = ?, {cle} = ?, date = ?, notes = ?, recurrence = ?, "
+                "id_transaction = ? WHERE id = ?",
+                (self._valeurs_finance(cle, ligne) + (identifiant,) for identifiant, ligne in lignes))
+
+    @staticmethod
+    def _condition_periode(date_debut: Optional[datetime.date],
+                           date_fin: Optional[datetime.date]) -> Tuple[str, Tuple]:
+        """Construit la clause WHERE d'une période (dates ISO, comparables comme du texte)."""
+        conditions = []
+        parametres = []
+        if date_debut is not None:
+            conditions.append("date >= ?")
+            parametres.append(date_debut.isoformat())
+        if date_fin is not None:
+            conditions.append("date <= ?")
+            parametres.append(date_fin.isoformat())
+        if not conditions:
+            return "", ()
+        return " WHERE " + " AND ".join(conditions), tuple(parametres)
+
+    def compter(self, table: str) -> int:
+        """
+        Retourne le nombre de lignes d'une table financière.
+
+        Args:
+            table (str): "depenses" ou "revenus".
+
+        Returns:
+            int: Nombre de lignes.
+        """
+        self._colonne_cle(table)
+        return self._requete(f"SELECT COUNT(*) FROM {table}")[0][0]
+
+    def somme(self, table: str, date_debut: Optional[datetime.date] = None,
+              date_fin: Optional[datetime.date] = None) -> float:
+        """
+        Calcule la somme des montants d'une table financière sur une période.
+
+        Args:
+            table (str): "depenses" ou "revenus".
+            date_debut (Optional[datetime.date], optional): Début de la période. Par défaut: sans limite.
+            date_fin (Optional[datetime.date], optional): Fin de la période. Par défaut: sans limite.
+
+        Returns:
+            float: Somme des montants.
+        """
+        self._colonne_cle(table)
+        condition, parametres = self._condition_periode(date_debut, date_fin)
+        return self._requete(f"SELECT COALESCE(SUM(montant), 0) FROM {table}{condition}", parametres)[0][0]
+
+    def totaux_par_mois(self, table: str) -> Dict[str, float]:
+        """
+        Calcule les totaux mensuels d'une table financière.
+
+        Args:
+            table (str): "depenses" ou "revenus".
+
+        Returns:
+            Dict[str, float]: Totaux par mois (format 'YYYY-MM').
+        """
+        self._colonne_cle(table)
+        lignes = self._requete(
+            f"SELECT substr(date, 1, 7) AS mois, SUM(montant) FROM {table} GROUP BY mois ORDER BY mois")
+        return {mois: total for mois, total in lignes}
+
+    def totaux_par_cle(self, table: str) -> Dict[str, float]:
+        """
+        Calcule les totaux par catégorie (dépenses) ou par source (revenus).
+
+        Args:
+            table (str): "depenses" ou "revenus".
+
+        Returns:
+            Dict[str, float]: Totaux par catégorie ou par source.
+        """
+        cle = self._colonne_cle(table)
+        lignes = self._requete(f"SELECT {cle}, SUM(montant) FROM {table} GROUP BY {cle}")
+        return {valeur: total for valeur, total in lignes}
+
+    # --- Articles et transactions de stock ---
+
+    def lire_articles(self) -> List[Dict[str, Any]]:
+        """
+        Lit tous les articles.
+
+        Returns:
+            List[Dict[str, Any]]: Articles (format to_dict).
+        """
+        return [dict(ligne) for ligne in self._requete(f"SELECT {', '.join(CHAMPS_ARTICLES)} FROM articles")]
+
+    def enregistrer_articles(self, articles: Iterable[Dict[str, Any]]) -> None:
+        """
+        Insère ou met à jour des articles, en une seule transaction.
+
+        Args:
+            articles (Iterable[Dict[str, Any]]): Articles (format to_dict).
+        """
+        with self.transaction() as connexion:
+            connexion.executemany(
+                f"INSERT OR REPLACE INTO articles ({', '.join(CHAMPS_ARTICLES)}) "
+                f"VALUES ({', '.join('?' * len(CHAMPS_ARTICLES))})",
+                (tuple(article[champ] for champ in CHAMPS_ARTICLES) for article in articles))
+
+    def supprimer_article(self, id_article: str) -> None:
+        """
+        Supprime un article.
+
+        Args:
+            id_article (str): Identifiant de l'article.
+        """
+        with self.transaction() as connexion:
+            connexion.execute("DELETE FROM articles WHERE id = ?", (id_article,))
+
+    def remplacer_articles(self, articles: Iterable[Dict[str, Any]]) -> None:
+        """
+        Remplace tous les articles, en une seule transaction.
+
+        Args:
+            articles (Iterable[Dict[str, Any]]): Articles (format to_dict).
+        """
+        with self.transaction() as connexion:
+            connexion.execute("DELETE FROM articles")
+            self.enregistrer_articles(articles)
+
+    def lire_transactions(self, id_article: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Lit les transactions de stock, éventuellement celles d'un seul article.
+
+        Args:
+            id_article (Optional[str], optional): Identifiant de l'article. Par défaut: toutes.
+
+        Returns:
+            List[Dict[str, Any]]: Transactions (format to_dict), dans l'ordre d'enregistrement.
+        """
+        champs = ", ".join(CHAMPS_TRANSACTIONS)
+        if id_article is None:
+            lignes = self._requete(f"SELECT {champs} FROM transactions_stock ORDER BY id")
+        else:
+            lignes = self._requete(
+                f"SELECT {champs} FROM transactions_stock WHERE id_article = ? ORDER BY id", (id_article,))
+        return [self._transaction_depuis_ligne(ligne) for ligne in lignes]
+
+    @staticmethod
+    def _transaction_depuis_ligne(ligne: sqlite3.Row) -> Dict[str, Any]:
+        """Convertit une ligne SQL en transaction au format to_dict."""
+        transaction = dict(ligne)
+        if transaction["prix_unitaire"] is None:
+            transaction["prix_unitaire"] = ""
+        return transaction
+
+    def inserer_transactions(self, transactions: Iterable[Dict[str, Any]]) -> None:
+        """
+        Ajoute des transactions de stock, en une seule transaction SQL.
+
+        Args:
+            transactions (Iterable[Dict[str, Any]]): Transactions (format to_dict).
+        """
+        with self.transaction() as connexion:
+            connexion.executemany(
+                f"INSERT INTO transactions_stock ({', '.join(CHAMPS_TRANSACTIONS)}) "
+                f"VALUES ({', '.join('?' * len(CHAMPS_TRANSACTIONS))})",
+                (self._valeurs_transaction(transaction) for transaction in transactions))
+
+    @staticmethod
+    def _valeurs_transaction(transaction: Dict[str, Any]) -> Tuple:
+        """Convertit une transaction (format to_dict) en valeurs SQL (prix absent -> NULL)."""
+        valeurs = [transaction[champ] for champ in CHAMPS_TRANSACTIONS]
+        position_prix = CHAMPS_TRANSACTIONS.index("prix_unitaire")
+        if valeurs[position_prix] == "":
+            valeurs[position_prix] = None
+        return tuple(valeurs)
+
+    def remplacer_transactions(self, transactions: Iterable[Dict[str, Any]]) -> None:
+        """
+        Remplace toutes les transactions de stock, en une seule transaction SQL.
+
+        Args:
+            transactions (Iterable[Dict[str, Any]]): Transactions (format to_dict).
+        """
+        with self.transaction() as connexion:
+            connexion.execute("DELETE FROM transactions_stock")
+            self.inserer_transactions(transactions)
+
+    def enregistrer_mouvement(self, transaction: Dict[str, Any], quantite_article: int) -> None:
+        """
+        Enregistre un mouvement de stock et la nouvelle quantité de l'article, ensemble.
+
+        Args:
+            transaction (Dict[str, Any]): Transaction (format to_dict).
+            quantite_article (int): Quantité de l'article après le mouvement.
+        """
+        with self.transaction() as connexion:
+            self.inserer_transactions([transaction])
+            connexion.execute("UPDATE articles SET quantite = ? WHERE id = ?",
+                              (quantite_article, transaction["id_article"]))
+
+def ouvrir_stockage_configure() -> Optional[StockageSQLite]:
+    """
+    Ouvre la base SQLite si la configuration le demande (STOCKAGE = "sqlite").
+    Lors de la première ouverture, les données des fichiers CSV y sont migrées.
+
+    Returns:
+        Optional[StockageSQLite]: Base ouverte, ou None si les données restent en CSV.
+    """
+    if STOCKAGE != "sqlite":
+        return None
+    stockage = StockageSQLite(BASE_SQLITE)
+    migrer_csv(stockage)
+    return stockage
+
+def migrer_csv(stockage: StockageSQLite, fichier_depenses: str = DEPENSES_CSV, fichier_revenus: str = REVENUS_CSV,
+               fichier_articles: Optional[str] = None, fichier_transactions: Optional[str] = None) -> bool:
+    """
+    Copie les données des fichiers CSV dans une base vide (migration unique).
+    Le journal des mouvements de stock est rejoué avant la copie. La migration est
+    notée dans la base (paramètre "migration_csv") : elle n'est faite qu'une fois,
+    même si les fichiers CSV étaient vides.
+
+    Args:
+        stockage (StockageSQLite): Base de destination.
+        fichier_depenses (str, optional): CSV des dépenses. Par défaut: DEPENSES_CSV.
+        fichier_revenus (str, optional): CSV des revenus. Par défaut: REVENUS_CSV.
+        fichier_articles (str, optional): CSV des articles. Par défaut: celui de GestionnaireStock,
+            c'est-à-dire le fichier où l'application écrit le stock.
+        fichier_transactions (str, optional): CSV des transactions de stock. Par défaut: celui de
+            GestionnaireStock.
+
+    Returns:
+        bool: True si la migration a eu lieu, False si elle avait déjà été faite.
+    """
+    if stockage.lire_parametre("migration_csv") is not None:
+        return False
+    if not stockage.est_vide():
+        # Base alimentée avant que la migration ne soit notée
+        stockage.enregistrer_parametre("migration_csv", datetime.datetime.now().isoformat(timespec="seconds"))
+        return False
+
+    # Imports locaux : les gestionnaires dépendent eux-mêmes de ce module
+    from app.finance.controllers.gestionnaire_financier import GestionnaireFinancier
+    from app.stock.controllers.gestionnaire_stock import GestionnaireStock
+
+    financier = GestionnaireFinancier(fichier_depenses, fichier_revenus, instantanes=False)
+    # Sans chemin explicite, lire les fichiers que GestionnaireStock utilise par défaut
+    fichiers_stock = {}
+    if fichier_articles is not None:
+        fichiers_stock["fichier_articles"] = fichier_articles
+    if fichier_transactions is not None:
+        fichiers_stock["fichier_transactions"] = fichier_transactions
+    stock = GestionnaireStock(instantanes=False, **fichiers_stock)
+    with stockage.transaction():
+        stockage.inserer("depenses", (depense.to_dict() for depense in financier.depenses))
+        stockage.inserer("revenus", (revenu.to_dict() for revenu in financier.revenus))
+        stockage.enregistrer_articles(article.to_dict() for article in stock.articles.values())
+        stockage.inserer_transactions(transaction.to_dict() for transaction in stock.transactions)
+        stockage.enregistrer_parametre("migration_csv", datetime.datetime.now().isoformat(timespec="seconds"))
+    financier.fermer()
+    print(f"Migration vers {stockage.chemin}: {len(financier.depenses)} dépenses, {len(financier.revenus)} revenus, "
+          f"{len(stock.articles)} articles, {len(stock.transactions)} mouvements de stock.")
+    return True
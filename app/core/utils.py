@@ -7,8 +7,9 @@ Fonctions utilitaires pour l'application.
 
 import os
 import csv
+import io
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 
 def create_csv_if_not_exists(filepath: str, headers: List[str]) -> None:
     """
@@ -23,6 +24,134 @@ def create_csv_if_not_exists(filepath: str, headers: List[str]) -> None:
             writer = csv.writer(f)
             writer.writerow(headers)
 
+def append_csv_rows(filepath: str, headers: List[str], rows: Iterable[Dict[str, Any]], 
+                    sync: bool = True) -> int:
+    """
+    Ajoute des lignes à la fin d'un fichier CSV sans réécrire son contenu.
+    L'en-tête est écrit si le fichier n'existe pas encore ou s'il est vide.
+    
+    Args:
+        filepath (str): Chemin du fichier CSV.
+        headers (List[str]): Liste des en-têtes de colonnes.
+        rows (Iterable[Dict[str, Any]]): Lignes à ajouter.
+        sync (bool, optional): Force l'écriture sur disque (fsync). Par défaut: True.
+        
+    Returns:
+        int: Nombre de lignes ajoutées.
+    """
+    nouveau_fichier = not os.path.exists(filepath) or os.path.getsize(filepath) == 0
+    nombre = 0
+    with open(filepath, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=headers)
+        if nouveau_fichier:
+            writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            nombre += 1
+        f.flush()
+        if sync:
+            os.fsync(f.fileno())
+    return nombre
+
+def append_csv_block(filepath: str, headers: List[str], rows: Iterable[Dict[str, Any]]) -> int:
+    """
+    Ajoute des lignes à la fin d'un fichier CSV en une seule écriture suivie d'un fsync.
+    Si l'écriture échoue, le fichier est ramené à sa taille d'origine : les lignes
+    sont soit toutes ajoutées, soit aucune.
+    
+    Args:
+        filepath (str): Chemin du fichier CSV.
+        headers (List[str]): Liste des en-têtes de colonnes.
+        rows (Iterable[Dict[str, Any]]): Lignes à ajouter.
+        
+    Returns:
+        int: Nombre de lignes ajoutées.
+    """
+    tampon = io.StringIO(newline='')
+    writer = csv.DictWriter(tampon, fieldnames=headers)
+    if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
+        writer.writeheader()
+    nombre = 0
+    for row in rows:
+        writer.writerow(row)
+        nombre += 1
+    
+    donnees = memoryview(tampon.getvalue().encode('utf-8'))
+    with open(filepath, 'ab', buffering=0) as f:
+        taille = f.seek(0, os.SEEK_END)
+        try:
+            while donnees:
+                donnees = donnees[f.write(donnees):]
+            os.fsync(f.fileno())
+        except BaseException:
+            f.truncate(taille)
+            raise
+    return nombre
+
+def write_csv_atomic(filepath: str, headers: List[str], rows: Iterable[Dict[str, Any]]) -> None:
+    """
+    Réécrit entièrement un fichier CSV de manière atomique.
+    Le contenu est d'abord écrit dans un fichier temporaire qui remplace ensuite
+    l'original, de sorte qu'une interruption ne laisse jamais un fichier tronqué.
+    
+    Args:
+        filepath (str): Chemin du fichier CSV.
+        headers (List[str]): Liste des en-têtes de colonnes.
+        rows (Iterable[Dict[str, Any]]): Lignes à écrire.
+    """
+    fichier_temporaire = f"{filepath}.tmp"
+    with open(fichier_temporaire, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=headers)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(fichier_temporaire, filepath)
+
+def repair_csv_tail(filepath: str, headers: List[str]) -> bool:
+    """
+    Répare la fin d'un fichier CSV après une écriture interrompue.
+    Une dernière ligne non terminée par un saut de ligne est supprimée, même si elle
+    contient toutes les colonnes : sa dernière valeur peut être tronquée. Un en-tête
+    interrompu est réécrit en entier.
+    
+    Args:
+        filepath (str): Chemin du fichier CSV.
+        headers (List[str]): Liste des en-têtes de colonnes.
+        
+    Returns:
+        bool: True si le fichier a été modifié, False sinon.
+    """
+    if not os.path.exists(filepath):
+        return False
+    
+    with open(filepath, 'rb+') as f:
+        taille = f.seek(0, os.SEEK_END)
+        if taille == 0:
+            return False
+        f.seek(taille - 1)
+        if f.read(1) == b"\n":
+            return False
+        
+        # Rechercher le début de la dernière ligne
+        debut = taille
+        while debut > 0:
+            pas = min(4096, debut)
+            f.seek(debut - pas)
+            bloc = f.read(pas)
+            position = bloc.rfind(b"\n")
+            if position != -1:
+                debut = debut - pas + position + 1
+                break
+            debut -= pas
+        
+        f.truncate(debut)
+        if debut == 0:
+            f.seek(0)
+            f.write((",".join(headers) + "\r\n").encode('utf-8'))
+    return True
+
 def load_json_file(filepath: str) -> Dict[str, Any]:
     """
     Charge un fichier JSON et retourne son contenu.
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Agrégats financiers maintenus de façon incrémentale.
+Ce module définit la classe AgregatsFinanciers qui conserve le total, les totaux
+mensuels et les totaux par catégorie (ou par source) d'une collection de dépenses
+ou de revenus, mis à jour par différence à chaque ajout, modification ou suppression.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable
+
+class AgregatsFinanciers:
+    """
+    Totaux d'une collection d'éléments possédant les attributs `montant`, `date`
+    et un attribut de regroupement (`categorie` pour les dépenses, `source` pour les revenus).
+
+    Attributes:
+        attribut_cle (str): Nom de l'attribut de regroupement.
+        total (float): Somme de tous les montants.
+        nombre (int): Nombre d'éléments agrégés.
+        par_mois (Dict[str, float]): Totaux par mois (format 'YYYY-MM').
+        par_cle (Dict[str, float]): Totaux par catégorie ou par source.
+    """
+
+    def __init__(self, attribut_cle: str, elements: Iterable[Any] = ()):
+        """
+        Initialise les agrégats.
+
+        Args:
+            attribut_cle (str): Nom de l'attribut de regroupement ("categorie" ou "source").
+            elements (Iterable[Any], optional): Éléments à agréger. Par défaut: aucun.
+        """
+        self.attribut_cle = attribut_cle
+        self.reconstruire(elements)
+
+    def reconstruire(self, elements: Iterable[Any]) -> None:
+        """
+        Recalcule entièrement les agrégats à partir d'une collection.
+
+        Args:
+            elements (Iterable[Any]): Éléments à agréger.
+        """
+        self.total = 0.0
+        self.nombre = 0
+        self.par_mois = {}
+        self.par_cle = {}
+        # Nombre d'éléments par groupe, pour retirer les groupes devenus vides
+        self._nombre_par_mois = defaultdict(int)
+        self._nombre_par_cle = defaultdict(int)
+        for element in elements:
+            self.ajouter(element)
+
+    def ajouter(self, element: Any) -> None:
+        """
+        Ajoute le montant d'un élément aux agrégats.
+
+        Args:
+            element (Any): Élément ajouté.
+        """
+        self._appliquer(element, 1)
+
+    def retirer(self, element: Any) -> None:
+        """
+        Retire le montant d'un élément des agrégats.
+
+        Args:
+            element (Any): Élément retiré.
+        """
+        self._appliquer(element, -1)
+
+    def _appliquer(self, element: Any, sens: int) -> None:
+        """Applique la contribution d'un élément (sens = 1 pour un ajout, -1 pour un retrait)."""
+        montant = sens * element.montant
+        mois = element.date.strftime("%Y-%m")
+        cle = getattr(element, self.attribut_cle)
+
+        self.total += montant
+        self.nombre += sens
+        self._mettre_a_jour(self.par_mois, self._nombre_par_mois, mois, montant, sens)
+        self._mettre_a_jour(self.par_cle, self._nombre_par_cle, cle, montant, sens)
+
+    @staticmethod
+    def _mettre_a_jour(totaux: Dict[str, float], nombres: Dict[str, int],
+                       cle: str, montant: float, sens: int) -> None:
+        """Met à jour le total d'un groupe et le supprime lorsqu'il ne contient plus d'élément."""
+        nombres[cle] += sens
+        if nombres[cle] <= 0:
+            del nombres[cle]
+            totaux.pop(cle, None)
+        else:
+            totaux[cle] = totaux.get(cle, 0.0) + montant
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Reconnaissance des mots-clés de catégories dans les libellés de transactions.
+Ce module définit la classe AutomateCategories, automate d'Aho–Corasick compilé une fois
+à partir d'un dictionnaire mot-clé -> catégorie.
+"""
+
+from typing import Dict, Optional
+
+class AutomateCategories:
+    """
+    Automate d'Aho–Corasick associant des mots-clés à des catégories.
+
+    Un libellé est parcouru une seule fois, quel que soit le nombre de mots-clés.
+    Lorsque plusieurs mots-clés apparaissent dans le libellé, la catégorie retenue est
+    celle du premier mot-clé dans l'ordre du dictionnaire, comme avec un parcours
+    séquentiel des correspondances.
+
+    Attributes:
+        _transitions (List[Dict[str, int]]): Transitions de chaque état, par caractère.
+        _echecs (List[int]): Lien d'échec de chaque état (plus long suffixe propre reconnu).
+        _priorites (List[int]): Rang du meilleur mot-clé reconnu dans chaque état,
+            liens d'échec compris (len(_categories) si aucun).
+        _categories (List[str]): Catégories, dans l'ordre des mots-clés.
+    """
+
+    def __init__(self, correspondances: Dict[str, str]):
+        """
+        Compile l'automate.
+
+        Args:
+            correspondances (Dict[str, str]): Mots-clés et catégories associées, par ordre de priorité.
+        """
+        self._categories = list(correspondances.values())
+        aucun = len(self._categories)
+        self._transitions = [{}]
+        self._priorites = [aucun]
+
+        for rang, mot_cle in enumerate(correspondances):
+            etat = 0
+            for caractere in mot_cle:
+                suivant = self._transitions[etat].get(caractere)
+                if suivant is None:
+                    suivant = len(self._transitions)
+                    self._transitions[etat][caractere] = suivant
+                    self._transitions.append({})
+                    self._priorites.append(aucun)
+                etat = suivant
+            self._priorites[etat] = min(self._priorites[etat], rang)
+
+        # Liens d'échec, calculés en largeur : les états moins profonds sont complets
+        self._echecs = [0] * len(self._transitions)
+        file = list(self._transitions[0].values())
+        for etat in file:
+            for caractere, suivant in self._transitions[etat].items():
+                echec = self._echecs[etat]
+                while echec and caractere not in self._transitions[echec]:
+                    echec = self._echecs[echec]
+                echec = self._transitions[echec].get(caractere, 0)
+                self._echecs[suivant] = echec if echec != suivant else 0
+                self._priorites[suivant] = min(self._priorites[suivant], self._priorites[self._echecs[suivant]])
+                file.append(suivant)
+
+    def rechercher(self, texte: str) -> Optional[str]:
+        """
+        Recherche la catégorie du premier mot-clé (par priorité) contenu dans un texte.
+
+        Args:
+            texte (str): Texte à analyser.
+
+        Returns:
+            Optional[str]: Catégorie trouvée, ou None si aucun mot-clé n'apparaît.
+        """
+        transitions = self._transitions
+        echecs = self._echecs
+        priorites = self._priorites
+        meilleur = priorites[0]
+        etat = 0
+
+        for caractere in texte:
+            if meilleur == 0:
+                break
+            while etat and caractere not in transitions[etat]:
+                etat = echecs[etat]
+            etat = transitions[etat].get(caractere, 0)
+            if priorites[etat] < meilleur:
+                meilleur = priorites[etat]
+
+        return self._categories[meilleur] if meilleur < len(self._categories) else None
@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chargement en bloc des fichiers CSV de dépenses et de revenus.
+Ce module lit un fichier entier puis convertit chaque colonne d'un seul tenant
+(montants, dates) au lieu de construire et valider les lignes une à une.
+"""
+
+import csv
+import datetime
+import gc
+import io
+import pickle
+from array import array
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.snapshot import load_with_snapshot
+
+@contextmanager
+def gc_suspendu() -> Iterator[None]:
+    """
+    Suspend le ramasse-miettes cyclique le temps d'un chargement.
+    La création de millions de listes et d'objets déclencherait sinon de nombreux
+    passages inutiles, aucun cycle n'étant créé pendant le chargement.
+    """
+    actif = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if actif:
+            gc.enable()
+
+def _decouper_lignes(texte: str) -> List[List[str]]:
+    """
+    Découpe le contenu d'un fichier CSV en lignes de champs.
+    Un fichier sans guillemets ni retour chariot isolé est découpé directement ;
+    sinon, le module csv gère les champs entre guillemets.
+
+    Args:
+        texte (str): Contenu du fichier.
+
+    Returns:
+        List[List[str]]: Lignes du fichier, en-tête compris.
+    """
+    normalise = texte.replace("\r\n", "\n")
+    if '"' in normalise or "\r" in normalise:
+        return list(csv.reader(io.StringIO(texte, newline="")))
+    lignes = normalise.split("\n")
+    if lignes and not lignes[-1]:
+        lignes.pop()
+    return [ligne.split(",") for ligne in lignes]
+
+def _convertir_date(texte: str) -> datetime.date:
+    """
+    Convertit une date au format 'YYYY-MM-DD'.
+
+    Args:
+        texte (str): Date à convertir.
+
+    Returns:
+        datetime.date: Date convertie.
+
+    Raises:
+        ValueError: Si la date est invalide.
+    """
+    if len(texte) == 10 and texte[4] == "-" and texte[7] == "-":
+        # Format ISO à largeur fixe : chemin rapide
+        return datetime.date.fromisoformat(texte)
+    return datetime.datetime.strptime(texte, "%Y-%m-%d").date()
+
+def charger_colonnes(fichier: str, attribut_cle: str) -> Tuple[Dict[str, List[Any]], List[Tuple[int, str]]]:
+    """
+    Charge un fichier CSV de dépenses ou de revenus sous forme de colonnes.
+
+    Les lignes invalides (incomplètes, montant ou date incorrects) sont écartées et
+    retournées avec leur numéro de ligne. Les champs optionnels vides prennent les
+    valeurs par défaut des modèles ("Aucune" pour la récurrence, None pour l'identifiant).
+
+    Args:
+        fichier (str): Chemin du fichier CSV.
+        attribut_cle (str): Colonne de regroupement ("categorie" ou "source").
+
+    Returns:
+        Tuple[Dict[str, List[Any]], List[Tuple[int, str]]]: Colonnes chargées (montant,
+            attribut_cle, date, notes, recurrence, id_transaction) et lignes écartées
+            (numéro de ligne, motif).
+
+    Raises:
+        ValueError: Si une colonne obligatoire est absente de l'en-tête.
+    """
+    colonnes, erreurs, _, _ = _charger(fichier, attribut_cle)
+    return colonnes, erreurs
+
+def charger_colonnes_avec_instantane(fichier: str,
+                                     attribut_cle: str) -> Tuple[Dict[str, List[Any]], List[Tuple[int, str]]]:
+    """
+    Charge un fichier CSV comme charger_colonnes, en passant par son instantané binaire.
+    Le CSV n'est analysé que s'il a changé depuis l'instantané ; s'il a seulement été
+    complété par de nouvelles lignes, seules celles-ci sont analysées.
+
+    Args:
+        fichier (str): Chemin du fichier CSV.
+        attribut_cle (str): Colonne de regroupement ("categorie" ou "source").
+
+    Returns:
+        Tuple[Dict[str, List[Any]], List[Tuple[int, str]]]: Colonnes chargées et lignes écartées.
+    """
+    def analyser():
+        colonnes, erreurs, entetes, ligne_suivante = _charger(fichier, attribut_cle)
+        return _vers_instantane(colonnes, erreurs, attribut_cle, entetes, ligne_suivante)
+
+    def prolonger(instantane, debut):
+        colonnes, erreurs = _depuis_instantane(instantane, attribut_cle)
+        nouvelles, nouvelles_erreurs, _, ligne_suivante = _charger(
+            fichier, attribut_cle, debut, instantane["entetes"], instantane["ligne_suivante"])
+        for nom, valeurs in nouvelles.items():
+            colonnes[nom].extend(valeurs)
+        return _vers_instantane(colonnes, erreurs + nouvelles_erreurs, attribut_cle,
+                                instantane["entetes"], ligne_suivante)
+
+    return _depuis_instantane(load_with_snapshot(fichier, analyser, prolonger), attribut_cle)
+
+def _charger(fichier: str, attribut_cle: str, debut: int = 0, entetes: Optional[List[str]] = None,
+             premiere_ligne: int = 2) -> Tuple[Dict[str, List[Any]], List[Tuple[int, str]], List[str], int]:
+    """
+    Charge un fichier CSV (ou sa fin, à partir de l'octet `debut`) sous forme de colonnes.
+
+    Args:
+        fichier (str): Chemin du fichier CSV.
+        attribut_cle (str): Colonne de regroupement ("categorie" ou "source").
+        debut (int, optional): Position de la première ligne à lire. Par défaut: 0.
+        entetes (Optional[List[str]], optional): En-têtes à utiliser si la lecture ne
+            commence pas au début du fichier. Par défaut: None.
+        premiere_ligne (int, optional): Numéro de la première ligne lue. Par défaut: 2.
+
+    Returns:
+        Tuple[Dict[str, List[Any]], List[Tuple[int, str]], List[str], int]: Colonnes,
+            lignes écartées, en-têtes et numéro de la ligne suivant la dernière lue.
+    """
+    with open(fichier, mode="rb") as file:
+        file.seek(debut)
+        texte = file.read().decode("utf-8")
+    with gc_suspendu():
+        lignes = _decouper_lignes(texte)
+        if entetes is not None:
+            lignes.insert(0, entetes)
+        colonnes, erreurs = _convertir_colonnes(fichier, lignes, attribut_cle, premiere_ligne)
+    return colonnes, erreurs, lignes[0] if lignes else [], premiere_ligne + max(len(lignes) - 1, 0)
+
+def _vers_instantane(colonnes: Dict[str, List[Any]], erreurs: List[Tuple[int, str]], attribut_cle: str,
+                     entetes: List[str], ligne_suivante: int) -> Dict[str, Any]:
+    """
+    Convertit des colonnes chargées en données d'instantané compactes.
+    Montants, dates (ordinaux) et codes de catégorie sont stockés dans des tableaux
+    binaires écrits hors bande.
+    """
+    valeurs = list(dict.fromkeys(colonnes[attribut_cle]))
+    codes = {valeur: code for code, valeur in enumerate(valeurs)}
+    return {
+        "entetes": entetes,
+        "ligne_suivante": ligne_suivante,
+        "erreurs": erreurs,
+        "montant": pickle.PickleBuffer(array("d", colonnes["montant"])),
+        "date": pickle.PickleBuffer(array("i", map(datetime.date.toordinal, colonnes["date"]))),
+        "codes": pickle.PickleBuffer(array("i", map(codes.__getitem__, colonnes[attribut_cle]))),
+        "valeurs": valeurs,
+        "notes": colonnes["notes"],
+        "recurrence": colonnes["recurrence"],
+        "id_transaction": colonnes["id_transaction"],
+    }
+
+def _depuis_instantane(instantane: Dict[str, Any],
+                       attribut_cle: str) -> Tuple[Dict[str, List[Any]], List[Tuple[int, str]]]:
+    """Reconstitue les colonnes et les lignes écartées à partir de données d'instantané."""
+    with gc_suspendu():
+        ordinaux = memoryview(instantane["date"]).cast("B").cast("i").tolist()
+        dates = {ordinal: datetime.date.fromordinal(ordinal) for ordinal in set(ordinaux)}
+        colonnes = {
+            "montant": memoryview(instantane["montant"]).cast("B").cast("d").tolist(),
+            attribut_cle: list(map(instantane["valeurs"].__getitem__,
+                                   memoryview(instantane["codes"]).cast("B").cast("i").tolist())),
+            "date": list(map(dates.__getitem__, ordinaux)),
+            "notes": list(instantane["notes"]),
+            "recurrence": list(instantane["recurrence"]),
+            "id_transaction": list(instantane["id_transaction"]),
+        }
+    return colonnes, list(instantane["erreurs"])
+
+def _convertir_colonnes(fichier: str, lignes: List[List[str]], attribut_cle: str,
+                        premiere_ligne: int = 2) -> Tuple[Dict[str, List[Any]], List[Tuple[int, str]]]:
+    """Convertit les lignes découpées d'un fichier en colonnes (voir charger_colonnes)."""
+    entetes = lignes[0] if lignes else []
+    lignes = lignes[1:]
+
+    noms = ["montant", attribut_cle, "date", "notes", "recurrence", "id_transaction"]
+    manquantes = [nom for nom in noms[:3] if nom not in entetes]
+    if manquantes:
+        raise ValueError(f"Colonnes manquantes dans {fichier}: {', '.join(manquantes)}")
+
+    erreurs = []
+    largeur = len(entetes)
+    numeros = range(premiere_ligne, premiere_ligne + len(lignes))
+
+    # Les lignes de largeur inattendue (rares) sont traitées à part
+    if lignes and set(map(len, lignes)) != {largeur}:
+        minimum = max(entetes.index(nom) for nom in noms[:3]) + 1
+        conservees = []
+        conserves = []
+        for numero, ligne in zip(numeros, lignes):
+            if not ligne or ligne == [""]:
+                continue
+            if len(ligne) < minimum:
+                erreurs.append((numero, "ligne incomplète"))
+                continue
+            conservees.append((ligne + [""] * largeur)[:largeur])
+            conserves.append(numero)
+        lignes, numeros = conservees, conserves
+
+    colonnes_brutes = list(zip(*lignes)) if lignes else [()] * largeur
+    colonnes = {}
+    for nom in noms:
+        colonnes[nom] = colonnes_brutes[entetes.index(nom)] if nom in entetes else ("",) * len(lignes)
+
+    invalides = {}  # Position -> motif
+
+    # Montants : conversion de toute la colonne, puis recherche des fautifs en cas d'échec
+    try:
+        montants = list(map(float, colonnes["montant"]))
+    except ValueError:
+        montants = []
+        for position, texte in enumerate(colonnes["montant"]):
+            try:
+                montants.append(float(texte))
+            except ValueError:
+                montants.append(0.0)
+                invalides[position] = f"montant invalide: {texte!r}"
+
+    # Dates : chaque valeur distincte n'est convertie qu'une fois
+    conversions = {}
+    for texte in set(colonnes["date"]):
+        try:
+            conversions[texte] = _convertir_date(texte)
+        except ValueError:
+            conversions[texte] = None
+    dates = [conversions[texte] for texte in colonnes["date"]]
+    if None in conversions.values():
+        for position, date in enumerate(dates):
+            if date is None:
+                invalides.setdefault(position, f"date invalide: {colonnes['date'][position]!r}")
+
+    resultat = {
+        "montant": montants,
+        attribut_cle: list(colonnes[attribut_cle]),
+        "date": dates,
+        "notes": list(colonnes["notes"]),
+        "recurrence": [recurrence or "Aucune" for recurrence in colonnes["recurrence"]],
+        "id_transaction": [identifiant or None for identifiant in colonnes["id_transaction"]],
+    }
+
+    if invalides:
+        numeros = list(numeros)
+        erreurs.extend((numeros[position], motif) for position, motif in invalides.items())
+        erreurs.sort()
+        for nom, valeurs in resultat.items():
+            resultat[nom] = [valeur for position, valeur in enumerate(valeurs) if position not in invalides]
+
+    return resultat, erreurs
+
+def creer_elements(classe: type, attribut_cle: str, colonnes: Dict[str, List[Any]]) -> List[Any]:
+    """
+    Construit les objets Depense ou Revenu correspondant à des colonnes chargées.
+
+    Args:
+        classe (type): Classe des éléments (Depense ou Revenu).
+        attribut_cle (str): Colonne de regroupement ("categorie" ou "source").
+        colonnes (Dict[str, List[Any]]): Colonnes retournées par charger_colonnes.
+
+    Returns:
+        List[Any]: Éléments construits, dans l'ordre du fichier.
+    """
+    with gc_suspendu():
+        return list(map(classe, colonnes["montant"], colonnes[attribut_cle], colonnes["date"],
+                        colonnes["notes"], colonnes["recurrence"], colonnes["id_transaction"]))
+
+def signaler_lignes_invalides(fichier: str, erreurs: List[Tuple[int, str]], maximum: int = 5) -> None:
+    """
+    Affiche un résumé unique des lignes écartées lors d'un chargement.
+
+    Args:
+        fichier (str): Chemin du fichier chargé.
+        erreurs (List[Tuple[int, str]]): Lignes écartées (numéro de ligne, motif).
+        maximum (int, optional): Nombre de lignes détaillées. Par défaut: 5.
+    """
+    if not erreurs:
+        return
+    details = "; ".join(f"ligne {numero}: {motif}" for numero, motif in erreurs[:maximum])
+    if len(erreurs) > maximum:
+        details += f"; ... ({len(erreurs) - maximum} autre(s))"
+    print(f"{len(erreurs)} ligne(s) invalide(s) ignorée(s) dans {fichier} ({details})")
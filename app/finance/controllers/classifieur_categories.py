@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Catégorisation apprise des libellés de transactions.
+Ce module définit la classe ClassifieurCategories, classifieur bayésien naïf sur
+les mots et trigrammes hachés des libellés, entraîné à partir des dépenses et revenus
+déjà catégorisés, ainsi que les fonctions d'entraînement et de persistance des modèles.
+
+Entraînement hors ligne sur les données configurées :
+
+    python -m app.finance.controllers.classifieur_categories
+"""
+
+import json
+import math
+import os
+import re
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : l'inférence se fait alors en Python pur
+    np = None
+
+from app.core.config import MODELE_CATEGORIES_JSON
+
+VERSION_MODELE = 1
+_SEPARATEURS = re.compile(r"[^A-Z]+")  # Les chiffres (dates, numéros de carte) sont ignorés
+
+class ClassifieurCategories:
+    """
+    Classifieur bayésien naïf multinomial sur caractéristiques hachées.
+
+    Les caractéristiques d'un libellé sont ses mots et les trigrammes de ses mots,
+    hachés (CRC32, stable d'une exécution à l'autre) dans `taille` cases. Les
+    caractéristiques d'un libellé déjà vu sont conservées en cache, et les prédictions
+    d'un lot de libellés sont calculées ensemble (par NumPy lorsqu'il est installé).
+
+    Attributes:
+        taille (int): Nombre de cases du hachage.
+        alpha (float): Lissage additif des fréquences.
+        seuil (float): Probabilité minimale d'une prédiction.
+        documents (Dict[str, int]): Nombre d'exemples d'entraînement par catégorie.
+        compteurs (Dict[str, Dict[int, int]]): Occurrences de chaque case, par catégorie.
+    """
+
+    def __init__(self, taille: int = 2 ** 18, alpha: float = 0.1, seuil: float = 0.5):
+        """
+        Initialise un classifieur vide.
+
+        Args:
+            taille (int, optional): Nombre de cases du hachage. Par défaut: 2**18.
+            alpha (float, optional): Lissage additif. Par défaut: 0.1.
+            seuil (float, optional): Probabilité minimale d'une prédiction. Par défaut: 0.5.
+        """
+        self.taille = taille
+        self.alpha = alpha
+        self.seuil = seuil
+        self.documents = {}
+        self.compteurs = {}
+        self._cache = {}  # Caractéristiques par libellé
+        self._compiler()
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'exemples d'entraînement."""
+        return sum(self.documents.values())
+
+    def caracteristiques(self, libelle: str) -> List[int]:
+        """
+        Retourne les cases hachées des mots et trigrammes d'un libellé.
+
+        Args:
+            libelle (str): Libellé de la transaction.
+
+        Returns:
+            List[int]: Cases des caractéristiques (avec répétitions).
+        """
+        cases = []
+        for mot in _SEPARATEURS.split(libelle.upper()):
+            if not mot:
+                continue
+            cases.append(zlib.crc32(mot.encode()) % self.taille)
+            borne = f" {mot} "
+            for i in range(len(borne) - 2):
+                cases.append(zlib.crc32(borne[i:i + 3].encode(), 1) % self.taille)
+        return cases
+
+    def entrainer(self, exemples: Iterable[Tuple[str, str]]) -> None:
+        """
+        Entraîne le classifieur (en remplaçant l'entraînement précédent).
+
+        Args:
+            exemples (Iterable[Tuple[str, str]]): Couples (libellé, catégorie).
+        """
+        self.documents = {}
+        self.compteurs = {}
+        for libelle, categorie in exemples:
+            cases = self.caracteristiques(libelle)
+            if not cases or not categorie:
+                continue
+            self.documents[categorie] = self.documents.get(categorie, 0) + 1
+            compteur = self.compteurs.setdefault(categorie, {})
+            for case in cases:
+                compteur[case] = compteur.get(case, 0) + 1
+        self._compiler()
+
+    def predire(self, libelles: Sequence[str]) -> List[Optional[str]]:
+        """
+        Prédit la catégorie d'un lot de libellés.
+
+        Args:
+            libelles (Sequence[str]): Libellés à catégoriser.
+
+        Returns:
+            List[Optional[str]]: Catégorie de chaque libellé, ou None si le libellé ne contient
+                aucune caractéristique connue ou si la prédiction est trop incertaine.
+        """
+        if not self._categories:
+            return [None] * len(libelles)
+
+        lignes = [self._lignes(libelle) for libelle in libelles]
+        if np is not None:
+            return self._predire_numpy(lignes)
+        return [self._predire_ligne(l) for l in lignes]
+
+    def vers_dict(self) -> Dict[str, Any]:
+        """
+        Convertit le classifieur en dictionnaire sérialisable en JSON.
+
+        Returns:
+            Dict[str, Any]: Paramètres et compteurs du classifieur.
+        """
+        return {
+            "taille": self.taille,
+            "alpha": self.alpha,
+            "seuil": self.seuil,
+            "documents": self.documents,
+            "compteurs": {c: {str(case): n for case, n in compteur.items()}
+                          for c, compteur in self.compteurs.items()}
+        }
+
+    @classmethod
+    def depuis_dict(cls, data: Dict[str, Any]) -> 'ClassifieurCategories':
+        """
+        Crée un classifieur à partir d'un dictionnaire produit par vers_dict.
+
+        Args:
+            data (Dict[str, Any]): Paramètres et compteurs du classifieur.
+
+        Returns:
+            ClassifieurCategories: Classifieur entraîné.
+        """
+        classifieur = cls(data["taille"], data["alpha"], data["seuil"])
+        classifieur.documents = dict(data["documents"])
+        classifieur.compteurs = {c: {int(case): n for case, n in compteur.items()}
+                                 for c, compteur in data["compteurs"].items()}
+        classifieur._compiler()
+        return classifieur
+
+    def _compiler(self) -> None:
+        """
+        Précalcule les scores : log a priori et normalisation de chaque catégorie, et pour
+        chaque case vue, l'écart de log-vraisemblance avec une case jamais vue (commun à
+        toutes les catégories, donc sans effet sur le classement).
+        """
+        self._cache = {}
+        self._categories = sorted(self.documents)
+        total_documents = sum(self.documents.values())
+        self._bases = []
+        self._normalisations = []
+        for categorie in self._categories:
+            occurrences = sum(self.compteurs[categorie].values())
+            self._bases.append(math.log(self.documents[categorie] / total_documents))
+            self._normalisations.append(math.log(occurrences + self.alpha * self.taille))
+
+        # Ligne 0 : écarts nuls, présente dans chaque libellé pour éviter les lots vides
+        self._rangs = {}
+        self._ecarts = [[0.0] * len(self._categories)]
+        log_alpha = math.log(self.alpha)
+        for k, categorie in enumerate(self._categories):
+            for case, n in self.compteurs[categorie].items():
+                rang = self._rangs.get(case)
+                if rang is None:
+                    rang = self._rangs[case] = len(self._ecarts)
+                    self._ecarts.append([0.0] * len(self._categories))
+                self._ecarts[rang][k] = math.log(n + self.alpha) - log_alpha
+
+        if np is not None:
+            self._ecarts = np.array(self._ecarts, dtype=np.float64)
+            self._bases = np.array(self._bases, dtype=np.float64)
+            self._normalisations = np.array(self._normalisations, dtype=np.float64)
+
+    def _lignes(self, libelle: str) -> Tuple[int, List[int]]:
+        """Retourne, en cache, le nombre de caractéristiques d'un libellé et les lignes d'écarts connues."""
+        lignes = self._cache.get(libelle)
+        if lignes is None:
+            if len(self._cache) >= 100000:
+                self._cache.clear()
+            cases = self.caracteristiques(libelle)
+            lignes = self._cache[libelle] = (len(cases), [0] + [self._rangs[c] for c in cases if c in self._rangs])
+        return lignes
+
+    def _predire_numpy(self, lignes: List[Tuple[int, List[int]]]) -> List[Optional[str]]:
+        """Prédit un lot de libellés par réductions vectorisées."""
+        nombres = np.array([n for n, _ in lignes], dtype=np.float64)
+        debuts = np.cumsum([0] + [len(l) for _, l in lignes[:-1]])
+        indices = np.fromiter((i for _, l in lignes for i in l), dtype=np.intp)
+        scores = np.add.reduceat(self._ecarts[indices], debuts, axis=0)
+        scores += self._bases - nombres[:, None] * self._normalisations
+        meilleurs = scores.argmax(axis=1)
+        # Probabilité de la meilleure catégorie : 1 / somme des exp(écart au meilleur score)
+        probabilites = 1.0 / np.exp(scores - scores.max(axis=1)[:, None]).sum(axis=1)
+        return [self._categories[m] if len(l) > 1 and p >= self.seuil else None
+                for m, p, (_, l) in zip(meilleurs, probabilites, lignes)]
+
+    def _predire_ligne(self, ligne: Tuple[int, List[int]]) -> Optional[str]:
+        """Prédit un libellé en Python pur."""
+        nombre, rangs = ligne
+        if len(rangs) == 1:
+            return None
+        scores = [b - nombre * n for b, n in zip(self._bases, self._normalisations)]
+        for rang in rangs:
+            for k, ecart in enumerate(self._ecarts[rang]):
+                scores[k] += ecart
+        meilleur = max(scores)
+        probabilite = 1.0 / sum(math.exp(s - meilleur) for s in scores)
+        return self._categories[scores.index(meilleur)] if probabilite >= self.seuil else None
+
+def entrainer_depuis_gestionnaire(gestionnaire: Any) -> Dict[str, ClassifieurCategories]:
+    """
+    Entraîne un classifieur des dépenses et un des revenus à partir des notes (libellés
+    bancaires des transactions importées) et des catégories d'un gestionnaire financier.
+
+    Args:
+        gestionnaire (GestionnaireFinancier): Gestionnaire dont les données servent d'exemples.
+
+    Returns:
+        Dict[str, ClassifieurCategories]: Classifieurs "depenses" et "revenus".
+    """
+    depenses = ClassifieurCategories()
+    depenses.entrainer((d.notes, d.categorie) for d in gestionnaire.depenses if d.notes)
+    revenus = ClassifieurCategories()
+    revenus.entrainer((r.notes, r.source) for r in gestionnaire.revenus if r.notes)
+    return {"depenses": depenses, "revenus": revenus}
+
+def sauvegarder_modeles(modeles: Dict[str, ClassifieurCategories], fichier: str = MODELE_CATEGORIES_JSON) -> None:
+    """
+    Sauvegarde les classifieurs dans un fichier JSON (écriture atomique).
+
+    Args:
+        modeles (Dict[str, ClassifieurCategories]): Classifieurs par type de transaction.
+        fichier (str, optional): Chemin du fichier. Par défaut: MODELE_CATEGORIES_JSON.
+    """
+    temporaire = f"{fichier}.tmp"
+    with open(temporaire, "w", encoding="utf-8") as f:
+        json.dump({"version": VERSION_MODELE,
+                   "modeles": {type_: m.vers_dict() for type_, m in modeles.items()}}, f, ensure_ascii=False)
+    os.replace(temporaire, fichier)
+
+def charger_modeles(fichier: str = MODELE_CATEGORIES_JSON) -> Dict[str, ClassifieurCategories]:
+    """
+    Charge les classifieurs sauvegardés.
+
+    Args:
+        fichier (str, optional): Chemin du fichier. Par défaut: MODELE_CATEGORIES_JSON.
+
+    Returns:
+        Dict[str, ClassifieurCategories]: Classifieurs par type de transaction
+            (vide si le fichier est absent, illisible ou d'une autre version).
+    """
+    try:
+        with open(fichier, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != VERSION_MODELE:
+        return {}
+    return {type_: ClassifieurCategories.depuis_dict(m) for type_, m in data["modeles"].items()}
+
+if __name__ == "__main__":
+    from app.core.stockage_sqlite import ouvrir_stockage_configure
+    from app.finance.controllers.gestionnaire_financier import GestionnaireFinancier
+
+    stockage = ouvrir_stockage_configure()
+    gestionnaire = GestionnaireFinancier(stockage=stockage)
+    modeles = entrainer_depuis_gestionnaire(gestionnaire)
+    sauvegarder_modeles(modeles)
+    gestionnaire.fermer()
+    if stockage is not None:
+        stockage.fermer()
+    for type_, modele in modeles.items():
+        print(f"{type_}: {len(modele)} exemples, {len(modele.documents)} catégories")
+    print(f"Modèle enregistré dans {MODELE_CATEGORIES_JSON}")
@@ -9,17 +9,32 @@ Ce module définit la classe GestionnaireFinancier qui gère les revenus et dép
 import csv
 import datetime
 import json
+import math
 import os
-from collections import defaultdict
-from typing import Dict, List, Optional, Any, Tuple
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 
 from app.finance.models.depense import Depense
 from app.finance.models.revenu import Revenu
-from app.core.config import DEPENSES_CSV, REVENUS_CSV, CATEGORIES_JSON
-from app.core.utils import create_csv_if_not_exists, load_json_file
+from app.finance.controllers.index_periode import IndexPeriode
+from app.finance.controllers.agregats import AgregatsFinanciers
+from app.finance.controllers.registre_colonnaire import RegistreColonnaire, NUMPY_DISPONIBLE
+from app.finance.controllers.vue_sqlite import VueSQLite
+from app.finance.controllers.automate_categories import AutomateCategories
+from app.finance.controllers.chargeur_csv import (
+    charger_colonnes, charger_colonnes_avec_instantane, creer_elements, signaler_lignes_invalides
+)
+from app.core.config import DEPENSES_CSV, REVENUS_CSV, CATEGORIES_JSON, STOCKAGE_COLONNAIRE, INSTANTANES_CSV
+from app.core.stockage_sqlite import StockageSQLite
+from app.core.utils import (
+    create_csv_if_not_exists, load_json_file, write_csv_atomic, repair_csv_tail, append_csv_block
+)
+
+CHAMPS_DEPENSES = ["montant", "categorie", "date", "notes", "recurrence", "id_transaction"]
+CHAMPS_REVENUS = ["montant", "source", "date", "notes", "recurrence", "id_transaction"]
 
 class GestionnaireFinancier:
     """
@@ -29,26 +44,59 @@ class GestionnaireFinancier:
     Attributes:
         fichier_depenses (str): Chemin du fichier CSV des dépenses.
         fichier_revenus (str): Chemin du fichier CSV des revenus.
-        depenses (List[Depense]): Liste des dépenses chargées.
-        revenus (List[Revenu]): Liste des revenus chargés.
+        depenses (List[Depense]): Liste des dépenses chargées (ou registre colonnaire).
+        revenus (List[Revenu]): Liste des revenus chargés (ou registre colonnaire).
+        taille_lot_fsync (int): Nombre de lignes ajoutées entre deux synchronisations sur disque.
+        stockage_colonnaire (bool): True si les données sont stockées par colonnes NumPy.
+        instantanes (bool): True si les CSV sont chargés via leurs instantanés binaires.
+        stockage (Optional[StockageSQLite]): Base SQLite utilisée à la place des CSV, le cas échéant.
+        modifications (Dict[str, int]): Nombre de modifications des dépenses et des revenus
+            ("depenses", "revenus") : chargements, ajouts, imports, modifications et suppressions.
     """
     
-    def __init__(self, fichier_depenses: str = DEPENSES_CSV, fichier_revenus: str = REVENUS_CSV):
+    def __init__(self, fichier_depenses: str = DEPENSES_CSV, fichier_revenus: str = REVENUS_CSV,
+                 taille_lot_fsync: int = 32, stockage_colonnaire: bool = STOCKAGE_COLONNAIRE,
+                 instantanes: bool = INSTANTANES_CSV, stockage: Optional[StockageSQLite] = None):
         """
         Initialise le gestionnaire financier.
         
         Args:
             fichier_depenses (str, optional): Chemin du fichier CSV des dépenses. Par défaut: DEPENSES_CSV.
             fichier_revenus (str, optional): Chemin du fichier CSV des revenus. Par défaut: REVENUS_CSV.
+            taille_lot_fsync (int, optional): Nombre de lignes ajoutées entre deux fsync. Par défaut: 32.
+            stockage_colonnaire (bool, optional): Stocker les données par colonnes NumPy
+                (ignoré si NumPy n'est pas installé). Par défaut: STOCKAGE_COLONNAIRE.
+            instantanes (bool, optional): Charger les CSV via leurs instantanés binaires.
+                Par défaut: INSTANTANES_CSV.
+            stockage (Optional[StockageSQLite], optional): Base SQLite à utiliser à la place
+                des fichiers CSV. Par défaut: None (fichiers CSV).
         """
         self.fichier_depenses = fichier_depenses
         self.fichier_revenus = fichier_revenus
+        self.taille_lot_fsync = taille_lot_fsync
+        if stockage_colonnaire and not NUMPY_DISPONIBLE:
+            print("NumPy n'est pas installé : stockage colonnaire désactivé.")
+        self.stockage_colonnaire = stockage_colonnaire and NUMPY_DISPONIBLE
+        self.instantanes = instantanes
+        self.stockage = stockage
         self.depenses = []
         self.revenus = []
+        self._fichiers_ajout = {}  # Fichiers CSV ouverts en mode ajout, par chemin
+        self._lignes_non_synchronisees = 0
+        self._index_depenses = IndexPeriode()  # Dépenses triées par date
+        self._index_revenus = IndexPeriode()  # Revenus triés par date
+        self._agregats_depenses = AgregatsFinanciers("categorie")  # Totaux par mois et par catégorie
+        self._agregats_revenus = AgregatsFinanciers("source")  # Totaux par mois et par source
+        self._ids_depenses = []  # Identifiants SQL des dépenses (stockage SQLite)
+        self._ids_revenus = []  # Identifiants SQL des revenus (stockage SQLite)
+        self.modifications = {"depenses": 0, "revenus": 0}
+        self._versions_structures = {"depenses": 0, "revenus": 0}  # Modifications reportées dans l'index et les agrégats
+        self._automates_categories = None  # Mappings de catégories compilés, par type de transaction
+        self._signature_categories = None  # Date et taille du fichier de mappings compilé
         self.charger_donnees()
 
     def charger_donnees(self) -> None:
-        """Charge les données de dépenses et de revenus depuis les fichiers CSV."""
+        """Charge les données de dépenses et de revenus depuis les fichiers CSV (ou la base SQLite)."""
         self.charger_depenses()
         self.charger_revenus()
 
@@ -57,86 +105,553 @@ class GestionnaireFinancier:
         Charge les dépenses depuis le fichier CSV.
         Crée le fichier s'il n'existe pas.
         """
-        # S'assurer que le fichier existe
-        create_csv_if_not_exists(self.fichier_depenses, ["montant", "categorie", "date", "notes", "recurrence", "id_transaction"])
+        if self.stockage is not None:
+            colonnes = self.stockage.lire_colonnes("depenses")
+            self._ids_depenses = colonnes.pop("id")
+            self.depenses, self._index_depenses, self._agregats_depenses = self._organiser(
+                colonnes, Depense, "categorie", ("depenses", self._ids_depenses))
+            self._noter_chargement("depenses")
+            return
+
+        # S'assurer que le fichier existe et que sa dernière ligne est complète
+        self._fermer_fichier_ajout(self.fichier_depenses)
+        create_csv_if_not_exists(self.fichier_depenses, CHAMPS_DEPENSES)
+        repair_csv_tail(self.fichier_depenses, CHAMPS_DEPENSES)
         
         try:
-            with open(self.fichier_depenses, mode="r", newline="", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
-                self.depenses = []
-                for row in reader:
-                    try:
-                        self.depenses.append(Depense.from_dict(row))
-                    except ValueError as e:
-                        print(f"Erreur lors du chargement d'une dépense: {e}")
+            colonnes, erreurs = self._charger_colonnes(self.fichier_depenses, "categorie")
+            signaler_lignes_invalides(self.fichier_depenses, erreurs)
         except Exception as e:
             print(f"Erreur lors du chargement des dépenses: {e}")
-            self.depenses = []
+            colonnes = {champ: [] for champ in CHAMPS_DEPENSES}
+        self.depenses, self._index_depenses, self._agregats_depenses = self._organiser(
+            colonnes, Depense, "categorie")
+        self._noter_chargement("depenses")
 
     def charger_revenus(self) -> None:
         """
         Charge les revenus depuis le fichier CSV.
         Crée le fichier s'il n'existe pas.
         """
-        # S'assurer que le fichier existe
-        create_csv_if_not_exists(self.fichier_revenus, ["montant", "source", "date", "notes", "recurrence", "id_transaction"])
+        if self.stockage is not None:
+            colonnes = self.stockage.lire_colonnes("revenus")
+            self._ids_revenus = colonnes.pop("id")
+            self.revenus, self._index_revenus, self._agregats_revenus = self._organiser(
+                colonnes, Revenu, "source", ("revenus", self._ids_revenus))
+            self._noter_chargement("revenus")
+            return
+
+        # S'assurer que le fichier existe et que sa dernière ligne est complète
+        self._fermer_fichier_ajout(self.fichier_revenus)
+        create_csv_if_not_exists(self.fichier_revenus, CHAMPS_REVENUS)
+        repair_csv_tail(self.fichier_revenus, CHAMPS_REVENUS)
         
         try:
-            with open(self.fichier_revenus, mode="r", newline="", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
-                self.revenus = []
-                for row in reader:
-                    try:
-                        self.revenus.append(Revenu.from_dict(row))
-                    except ValueError as e:
-                        print(f"Erreur lors du chargement d'un revenu: {e}")
+            colonnes, erreurs = self._charger_colonnes(self.fichier_revenus, "source")
+            signaler_lignes_invalides(self.fichier_revenus, erreurs)
         except Exception as e:
             print(f"Erreur lors du chargement des revenus: {e}")
-            self.revenus = []
+            colonnes = {champ: [] for champ in CHAMPS_REVENUS}
+        self.revenus, self._index_revenus, self._agregats_revenus = self._organiser(
+            colonnes, Revenu, "source")
+        self._noter_chargement("revenus")
 
     def sauvegarder_depenses(self) -> None:
-        """Sauvegarde les dépenses dans le fichier CSV."""
+        """
+        Sauvegarde toutes les dépenses dans le fichier CSV (réécriture complète).
+        Utilisée uniquement lorsqu'une dépense existante est modifiée ou supprimée.
+        Avec une base SQLite, chaque ligne est mise à jour par son identifiant, sans
+        réécrire la table.
+        """
         try:
-            with open(self.fichier_depenses, mode="w", newline="", encoding="utf-8") as file:
-                fieldnames = ["montant", "categorie", "date", "notes", "recurrence", "id_transaction"]
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                writer.writeheader()
-                for depense in self.depenses:
-                    writer.writerow(depense.to_dict())
+            if self.stockage is not None:
+                self.stockage.remplacer_lignes(
+                    "depenses", zip(self._ids_depenses, (depense.to_dict() for depense in self.depenses)))
+                return
+            self._fermer_fichier_ajout(self.fichier_depenses)
+            write_csv_atomic(self.fichier_depenses, CHAMPS_DEPENSES,
+                             (depense.to_dict() for depense in self.depenses))
         except Exception as e:
             print(f"Erreur lors de la sauvegarde des dépenses: {e}")
 
     def sauvegarder_revenus(self) -> None:
-        """Sauvegarde les revenus dans le fichier CSV."""
+        """
+        Sauvegarde tous les revenus dans le fichier CSV (réécriture complète).
+        Utilisée uniquement lorsqu'un revenu existant est modifié ou supprimé.
+        Avec une base SQLite, chaque ligne est mise à jour par son identifiant, sans
+        réécrire la table.
+        """
         try:
-            with open(self.fichier_revenus, mode="w", newline="", encoding="utf-8") as file:
-                fieldnames = ["montant", "source", "date", "notes", "recurrence", "id_transaction"]
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                writer.writeheader()
-                for revenu in self.revenus:
-                    writer.writerow(revenu.to_dict())
+            if self.stockage is not None:
+                self.stockage.remplacer_lignes(
+                    "revenus", zip(self._ids_revenus, (revenu.to_dict() for revenu in self.revenus)))
+                return
+            self._fermer_fichier_ajout(self.fichier_revenus)
+            write_csv_atomic(self.fichier_revenus, CHAMPS_REVENUS,
+                             (revenu.to_dict() for revenu in self.revenus))
         except Exception as e:
             print(f"Erreur lors de la sauvegarde des revenus: {e}")
 
+    def _ajouter_ligne(self, fichier: str, champs: List[str], ligne: Dict[str, Any]) -> None:
+        """
+        Ajoute une seule ligne à la fin d'un fichier CSV.
+        La ligne est transmise au système à chaque ajout ; l'écriture physique sur
+        disque (fsync) est regroupée tous les `taille_lot_fsync` ajouts.
+        
+        Args:
+            fichier (str): Chemin du fichier CSV.
+            champs (List[str]): En-têtes du fichier.
+            ligne (Dict[str, Any]): Ligne à ajouter.
+        """
+        fichier_ajout = self._fichiers_ajout.get(fichier)
+        if fichier_ajout is None:
+            create_csv_if_not_exists(fichier, champs)
+            fichier_ajout = open(fichier, mode="a", newline="", encoding="utf-8")
+            self._fichiers_ajout[fichier] = fichier_ajout
+        
+        csv.DictWriter(fichier_ajout, fieldnames=champs).writerow(ligne)
+        fichier_ajout.flush()
+        
+        self._lignes_non_synchronisees += 1
+        if self._lignes_non_synchronisees >= self.taille_lot_fsync:
+            self.synchroniser_disque()
+
+    def _fermer_fichier_ajout(self, fichier: str) -> None:
+        """
+        Synchronise et ferme le fichier ouvert en mode ajout, s'il y en a un.
+        
+        Args:
+            fichier (str): Chemin du fichier CSV.
+        """
+        fichier_ajout = self._fichiers_ajout.pop(fichier, None)
+        if fichier_ajout is not None:
+            fichier_ajout.flush()
+            os.fsync(fichier_ajout.fileno())
+            fichier_ajout.close()
+
+    def synchroniser_disque(self) -> None:
+        """Force l'écriture sur disque des lignes ajoutées depuis la dernière synchronisation."""
+        for fichier_ajout in self._fichiers_ajout.values():
+            fichier_ajout.flush()
+            os.fsync(fichier_ajout.fileno())
+        self._lignes_non_synchronisees = 0
+
+    def fermer(self) -> None:
+        """Synchronise et ferme les fichiers de données ouverts. À appeler à la fermeture de l'application."""
+        for fichier in list(self._fichiers_ajout):
+            self._fermer_fichier_ajout(fichier)
+        self._lignes_non_synchronisees = 0
+
     def ajouter_depense(self, depense: Depense) -> None:
         """
-        Ajoute une dépense à la liste et sauvegarde.
+        Ajoute une dépense à la liste et l'ajoute à la fin du fichier CSV.
         
         Args:
             depense (Depense): Dépense à ajouter.
         """
-        self.depenses.append(depense)
-        self.sauvegarder_depenses()
+        if self.stockage is not None:
+            # Ligne écrite en base avant la mise à jour de la liste : un échec ne change rien
+            try:
+                identifiant = self.stockage.inserer_ligne("depenses", depense.to_dict())
+            except Exception as e:
+                print(f"Erreur lors de l'ajout d'une dépense: {e}")
+                return
+        with self._modification("depenses") as (index, agregats):
+            self.depenses.append(depense)
+            if self.stockage is not None:
+                self._ids_depenses.append(identifiant)
+            index.ajouter(depense)
+            agregats.ajouter(depense)
+        if self.stockage is not None:
+            return
+        try:
+            self._ajouter_ligne(self.fichier_depenses, CHAMPS_DEPENSES, depense.to_dict())
+        except Exception as e:
+            print(f"Erreur lors de l'ajout d'une dépense: {e}")
 
     def ajouter_revenu(self, revenu: Revenu) -> None:
         """
-        Ajoute un revenu à la liste et sauvegarde.
+        Ajoute un revenu à la liste et l'ajoute à la fin du fichier CSV.
         
         Args:
             revenu (Revenu): Revenu à ajouter.
         """
-        self.revenus.append(revenu)
-        self.sauvegarder_revenus()
+        if self.stockage is not None:
+            # Ligne écrite en base avant la mise à jour de la liste : un échec ne change rien
+            try:
+                identifiant = self.stockage.inserer_ligne("revenus", revenu.to_dict())
+            except Exception as e:
+                print(f"Erreur lors de l'ajout d'un revenu: {e}")
+                return
+        with self._modification("revenus") as (index, agregats):
+            self.revenus.append(revenu)
+            if self.stockage is not None:
+                self._ids_revenus.append(identifiant)
+            index.ajouter(revenu)
+            agregats.ajouter(revenu)
+        if self.stockage is not None:
+            return
+        try:
+            self._ajouter_ligne(self.fichier_revenus, CHAMPS_REVENUS, revenu.to_dict())
+        except Exception as e:
+            print(f"Erreur lors de l'ajout d'un revenu: {e}")
+
+    def importer_lot(self, elements: Iterable[Any]) -> Dict[str, int]:
+        """
+        Importe un lot de dépenses et de revenus.
+        Le lot est entièrement validé avant toute modification, puis écrit en une seule
+        fois (un bloc ajouté à chaque CSV ou une seule transaction SQLite) et l'index et
+        les agrégats sont mis à jour une seule fois.
+        
+        Args:
+            elements (Iterable[Any]): Objets Depense et Revenu à importer, dans l'ordre.
+            
+        Returns:
+            Dict[str, int]: Nombre de dépenses et de revenus importés.
+            
+        Raises:
+            ValueError: Si un élément du lot est invalide (aucun élément n'est alors importé).
+        """
+        depenses = []
+        revenus = []
+        erreurs = []
+        for position, element in enumerate(elements, start=1):
+            erreur = self._erreur_validation(element)
+            if erreur:
+                erreurs.append(f"élément {position}: {erreur}")
+            elif isinstance(element, Depense):
+                depenses.append(element)
+            else:
+                revenus.append(element)
+        if erreurs:
+            suite = f" (et {len(erreurs) - 5} autres)" if len(erreurs) > 5 else ""
+            raise ValueError(f"Lot refusé, {len(erreurs)} élément(s) invalide(s): {'; '.join(erreurs[:5])}{suite}")
+        
+        self._persister_lot(depenses, revenus)
+        if depenses:
+            with self._modification("depenses") as (index, agregats):
+                self._integrer_lot(self.depenses, index, agregats, depenses)
+        if revenus:
+            with self._modification("revenus") as (index, agregats):
+                self._integrer_lot(self.revenus, index, agregats, revenus)
+        return {"depenses": len(depenses), "revenus": len(revenus)}
+
+    @staticmethod
+    def _erreur_validation(element: Any) -> Optional[str]:
+        """Retourne la raison pour laquelle un élément à importer est invalide, ou None."""
+        if isinstance(element, Depense):
+            cle = element.categorie
+        elif isinstance(element, Revenu):
+            cle = element.source
+        else:
+            return f"type non pris en charge ({type(element).__name__})"
+        if isinstance(element.montant, bool) or not isinstance(element.montant, (int, float)) \
+                or not math.isfinite(element.montant) or element.montant < 0:
+            return f"montant invalide ({element.montant!r})"
+        if not isinstance(element.date, datetime.date):
+            return f"date invalide ({element.date!r})"
+        if not cle:
+            return "catégorie ou source manquante"
+        return None
+
+    def _persister_lot(self, depenses: List[Depense], revenus: List[Revenu]) -> None:
+        """
+        Écrit les dépenses et les revenus d'un lot (tout ou rien) : en base, dans une
+        seule transaction ; en CSV, le bloc des dépenses est retiré si celui des revenus
+        ne peut pas être écrit.
+        """
+        lignes_depenses = [depense.to_dict() for depense in depenses]
+        lignes_revenus = [revenu.to_dict() for revenu in revenus]
+        if self.stockage is not None:
+            with self.stockage.transaction():
+                ids_depenses = self.stockage.inserer_lot("depenses", lignes_depenses) if depenses else []
+                ids_revenus = self.stockage.inserer_lot("revenus", lignes_revenus) if revenus else []
+            # Identifiants retenus seulement une fois la transaction validée
+            self._ids_depenses.extend(ids_depenses)
+            self._ids_revenus.extend(ids_revenus)
+            return
+
+        # Les fichiers ouverts en ajout sont fermés pour que les blocs ne s'intercalent pas dans leur tampon
+        self._fermer_fichier_ajout(self.fichier_depenses)
+        self._fermer_fichier_ajout(self.fichier_revenus)
+        taille_depenses = os.path.getsize(self.fichier_depenses) if os.path.exists(self.fichier_depenses) else None
+        if depenses:
+            append_csv_block(self.fichier_depenses, CHAMPS_DEPENSES, lignes_depenses)
+        if revenus:
+            try:
+                append_csv_block(self.fichier_revenus, CHAMPS_REVENUS, lignes_revenus)
+            except BaseException:
+                if depenses:
+                    self._retirer_bloc(self.fichier_depenses, taille_depenses)
+                raise
+
+    @staticmethod
+    def _retirer_bloc(fichier: str, taille: Optional[int]) -> None:
+        """Ramène un fichier CSV à sa taille d'avant un ajout (le supprime s'il n'existait pas)."""
+        if taille is None:
+            os.remove(fichier)
+            return
+        with open(fichier, "r+b") as f:
+            f.truncate(taille)
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def _integrer_lot(liste: List[Any], index: IndexPeriode, agregats: AgregatsFinanciers,
+                      elements: List[Any]) -> None:
+        """Ajoute un lot persisté à la liste, à son index par date et à ses agrégats."""
+        liste.extend(elements)
+        if isinstance(index, IndexPeriode):
+            index.ajouter_lot(elements)
+            for element in elements:
+                agregats.ajouter(element)
+
+    def modifier_depense(self, depense: Depense, nouvelle_depense: Depense) -> None:
+        """
+        Remplace une dépense existante et réécrit le fichier CSV.
+        
+        Args:
+            depense (Depense): Dépense à remplacer.
+            nouvelle_depense (Depense): Nouvelle valeur de la dépense.
+            
+        Raises:
+            ValueError: Si la dépense n'existe pas.
+        """
+        position = self._position(self.depenses, depense, "La dépense n'existe pas.")
+        if self.stockage is not None and not self._modifier_ligne(
+                "depenses", self._ids_depenses[position], nouvelle_depense):
+            return
+        with self._modification("depenses") as (index, agregats):
+            self.depenses[position] = nouvelle_depense
+            index.retirer(depense)
+            index.ajouter(nouvelle_depense)
+            agregats.retirer(depense)
+            agregats.ajouter(nouvelle_depense)
+        if self.stockage is None:
+            self.sauvegarder_depenses()
+
+    def supprimer_depense(self, depense: Depense) -> None:
+        """
+        Supprime une dépense existante et réécrit le fichier CSV.
+        
+        Args:
+            depense (Depense): Dépense à supprimer.
+            
+        Raises:
+            ValueError: Si la dépense n'existe pas.
+        """
+        position = self._position(self.depenses, depense, "La dépense n'existe pas.")
+        if self.stockage is not None and not self._modifier_ligne("depenses", self._ids_depenses[position]):
+            return
+        with self._modification("depenses") as (index, agregats):
+            del self.depenses[position]
+            if self.stockage is not None:
+                del self._ids_depenses[position]
+            index.retirer(depense)
+            agregats.retirer(depense)
+        if self.stockage is None:
+            self.sauvegarder_depenses()
+
+    def modifier_revenu(self, revenu: Revenu, nouveau_revenu: Revenu) -> None:
+        """
+        Remplace un revenu existant et réécrit le fichier CSV.
+        
+        Args:
+            revenu (Revenu): Revenu à remplacer.
+            nouveau_revenu (Revenu): Nouvelle valeur du revenu.
+            
+        Raises:
+            ValueError: Si le revenu n'existe pas.
+        """
+        position = self._position(self.revenus, revenu, "Le revenu n'existe pas.")
+        if self.stockage is not None and not self._modifier_ligne(
+                "revenus", self._ids_revenus[position], nouveau_revenu):
+            return
+        with self._modification("revenus") as (index, agregats):
+            self.revenus[position] = nouveau_revenu
+            index.retirer(revenu)
+            index.ajouter(nouveau_revenu)
+            agregats.retirer(revenu)
+            agregats.ajouter(nouveau_revenu)
+        if self.stockage is None:
+            self.sauvegarder_revenus()
+
+    def supprimer_revenu(self, revenu: Revenu) -> None:
+        """
+        Supprime un revenu existant et réécrit le fichier CSV.
+        
+        Args:
+            revenu (Revenu): Revenu à supprimer.
+            
+        Raises:
+            ValueError: Si le revenu n'existe pas.
+        """
+        position = self._position(self.revenus, revenu, "Le revenu n'existe pas.")
+        if self.stockage is not None and not self._modifier_ligne("revenus", self._ids_revenus[position]):
+            return
+        with self._modification("revenus") as (index, agregats):
+            del self.revenus[position]
+            if self.stockage is not None:
+                del self._ids_revenus[position]
+            index.retirer(revenu)
+            agregats.retirer(revenu)
+        if self.stockage is None:
+            self.sauvegarder_revenus()
+
+    def _modifier_ligne(self, table: str, identifiant: int, element: Any = None) -> bool:
+        """
+        Enregistre dans la base SQLite la modification (ou la suppression si `element`
+        est None) d'une ligne, avant que la liste en mémoire ne soit modifiée.
+        
+        Args:
+            table (str): Table concernée ("depenses" ou "revenus").
+            identifiant (int): Identifiant SQL de la ligne.
+            element (Any, optional): Nouvelle valeur de l'élément. Par défaut: None (suppression).
+            
+        Returns:
+            bool: True si la base a été modifiée, False en cas d'échec (la liste doit alors rester inchangée).
+        """
+        try:
+            if element is None:
+                self.stockage.supprimer(table, identifiant)
+            else:
+                self.stockage.remplacer(table, identifiant, element.to_dict())
+        except Exception as e:
+            print(f"Erreur lors de l'enregistrement dans la base ({table}): {e}")
+            return False
+        return True
+
+    @staticmethod
+    def _position(elements: List[Any], element: Any, message: str) -> int:
+        """
+        Retourne la position d'un élément dans une liste (comparaison par identité).
+        
+        Raises:
+            ValueError: Si l'élément n'est pas dans la liste.
+        """
+        for index, candidat in enumerate(elements):
+            if candidat is element:
+                return index
+        raise ValueError(message)
+
+    def _charger_colonnes(self, fichier: str,
+                          attribut_cle: str) -> Tuple[Dict[str, List[Any]], List[Tuple[int, str]]]:
+        """Charge un fichier CSV par colonnes, via son instantané si ceux-ci sont activés."""
+        if self.instantanes:
+            return charger_colonnes_avec_instantane(fichier, attribut_cle)
+        return charger_colonnes(fichier, attribut_cle)
+
+    def _organiser(self, colonnes: Dict[str, List[Any]], classe: type, attribut_cle: str,
+                   table_sqlite: Optional[Tuple[str, List[int]]] = None) -> Tuple[List[Any], IndexPeriode, AgregatsFinanciers]:
+        """
+        Prépare la collection chargée, son index par date et ses agrégats.
+        En stockage colonnaire, le registre est rempli directement à partir des colonnes
+        et sert lui-même d'index et d'agrégats. Avec une base SQLite, l'index et les
+        agrégats sont remplacés par des requêtes sur la base.
+        
+        Args:
+            colonnes (Dict[str, List[Any]]): Colonnes chargées depuis le fichier CSV ou la base.
+            classe (type): Classe des éléments (Depense ou Revenu).
+            attribut_cle (str): Attribut de regroupement ("categorie" ou "source").
+            table_sqlite (Optional[Tuple[str, List[int]]], optional): Table SQLite d'origine
+                et identifiants SQL des lignes (stockage SQLite uniquement). Par défaut: None.
+        
+        Returns:
+            Tuple[List[Any], IndexPeriode, AgregatsFinanciers]: Collection, index et agrégats.
+        """
+        if self.stockage_colonnaire:
+            elements = RegistreColonnaire.depuis_colonnes(
+                classe, attribut_cle, colonnes["montant"], colonnes["date"], colonnes[attribut_cle],
+                colonnes["notes"], colonnes["recurrence"], colonnes["id_transaction"])
+        else:
+            elements = creer_elements(classe, attribut_cle, colonnes)
+        if table_sqlite is not None:
+            vue = VueSQLite(self.stockage, table_sqlite[0], elements, table_sqlite[1])
+            return elements, vue, vue
+        if self.stockage_colonnaire:
+            return elements, elements, elements
+        return elements, IndexPeriode(elements), AgregatsFinanciers(attribut_cle, elements)
+
+    def _structures_a_jour(self, nom: str, elements: List[Any], index: IndexPeriode,
+                           agregats: AgregatsFinanciers) -> Tuple[IndexPeriode, AgregatsFinanciers]:
+        """
+        Retourne l'index par date et les agrégats d'une liste, cohérents avec celle-ci.
+        Ils sont reconstruits si une modification de la liste n'y a pas été reportée
+        (modification interrompue par une erreur).
+        
+        Args:
+            nom (str): "depenses" ou "revenus".
+            elements (List[Any]): Liste des dépenses ou des revenus.
+            index (IndexPeriode): Index par date de la liste.
+            agregats (AgregatsFinanciers): Agrégats de la liste.
+        
+        Returns:
+            Tuple[IndexPeriode, AgregatsFinanciers]: Index et agrégats à jour.
+        """
+        # Un registre colonnaire ou une base SQLite n'a pas de structures séparées à reconstruire
+        if isinstance(index, IndexPeriode) and self._versions_structures[nom] != self.modifications[nom]:
+            index.reconstruire(elements)
+            agregats.reconstruire(elements)
+        self._versions_structures[nom] = self.modifications[nom]
+        return index, agregats
+
+    def _structures_depenses(self) -> Tuple[IndexPeriode, AgregatsFinanciers]:
+        """Retourne l'index par date et les agrégats des dépenses, à jour."""
+        return self._structures_a_jour("depenses", self.depenses, self._index_depenses, self._agregats_depenses)
+
+    def _structures_revenus(self) -> Tuple[IndexPeriode, AgregatsFinanciers]:
+        """Retourne l'index par date et les agrégats des revenus, à jour."""
+        return self._structures_a_jour("revenus", self.revenus, self._index_revenus, self._agregats_revenus)
+
+    @contextmanager
+    def _modification(self, nom: str) -> Iterator[Tuple[IndexPeriode, AgregatsFinanciers]]:
+        """
+        Encadre une modification des dépenses ou des revenus et incrémente son compteur.
+        L'index et les agrégats fournis ne sont notés à jour qu'à la fin du bloc : si
+        celui-ci échoue, ils sont reconstruits au prochain accès.
+        
+        Args:
+            nom (str): "depenses" ou "revenus".
+        
+        Yields:
+            Tuple[IndexPeriode, AgregatsFinanciers]: Index et agrégats à mettre à jour.
+        """
+        structures = self._structures_depenses() if nom == "depenses" else self._structures_revenus()
+        self.modifications[nom] += 1
+        yield structures
+        self._versions_structures[nom] = self.modifications[nom]
+
+    def _noter_chargement(self, nom: str) -> None:
+        """Compte le chargement des dépenses ou des revenus, dont l'index et les agrégats viennent d'être construits."""
+        self.modifications[nom] += 1
+        self._versions_structures[nom] = self.modifications[nom]
+
+    def depenses_periode(self, date_debut: Optional[datetime.date] = None,
+                         date_fin: Optional[datetime.date] = None) -> List[Depense]:
+        """
+        Retourne les dépenses d'une période, triées par date croissante.
+        
+        Args:
+            date_debut (Optional[datetime.date], optional): Date de début (incluse). Par défaut: sans limite.
+            date_fin (Optional[datetime.date], optional): Date de fin (incluse). Par défaut: sans limite.
+            
+        Returns:
+            List[Depense]: Dépenses de la période.
+        """
+        return self._structures_depenses()[0].elements(date_debut, date_fin)
+
+    def revenus_periode(self, date_debut: Optional[datetime.date] = None,
+                        date_fin: Optional[datetime.date] = None) -> List[Revenu]:
+        """
+        Retourne les revenus d'une période, triés par date croissante.
+        
+        Args:
+            date_debut (Optional[datetime.date], optional): Date de début (incluse). Par défaut: sans limite.
+            date_fin (Optional[datetime.date], optional): Date de fin (incluse). Par défaut: sans limite.
+            
+        Returns:
+            List[Revenu]: Revenus de la période.
+        """
+        return self._structures_revenus()[0].elements(date_debut, date_fin)
 
     def calculer_solde(self) -> float:
         """
@@ -145,9 +660,25 @@ class GestionnaireFinancier:
         Returns:
             float: Solde global.
         """
-        total_revenus = sum(revenu.montant for revenu in self.revenus)
-        total_depenses = sum(depense.montant for depense in self.depenses)
-        return total_revenus - total_depenses
+        return self.total_revenus() - self.total_depenses()
+
+    def total_depenses(self) -> float:
+        """
+        Retourne le total de toutes les dépenses.
+        
+        Returns:
+            float: Total des dépenses.
+        """
+        return self._structures_depenses()[1].total
+
+    def total_revenus(self) -> float:
+        """
+        Retourne le total de tous les revenus.
+        
+        Returns:
+            float: Total des revenus.
+        """
+        return self._structures_revenus()[1].total
 
     def calculer_solde_periode(self, date_debut: datetime.date, date_fin: datetime.date) -> float:
         """
@@ -160,11 +691,8 @@ class GestionnaireFinancier:
         Returns:
             float: Solde pour la période.
         """
-        revenus_periode = [r for r in self.revenus if date_debut <= r.date <= date_fin]
-        depenses_periode = [d for d in self.depenses if date_debut <= d.date <= date_fin]
-        
-        total_revenus = sum(r.montant for r in revenus_periode)
-        total_depenses = sum(d.montant for d in depenses_periode)
+        total_revenus = self._structures_revenus()[0].somme(date_debut, date_fin)
+        total_depenses = self._structures_depenses()[0].somme(date_debut, date_fin)
         
         return total_revenus - total_depenses
 
@@ -175,10 +703,7 @@ class GestionnaireFinancier:
         Returns:
             Dict[str, float]: Dictionnaire avec les catégories et leurs montants.
         """
-        totaux = defaultdict(float)
-        for depense in self.depenses:
-            totaux[depense.categorie] += depense.montant
-        return dict(totaux)
+        return dict(self._structures_depenses()[1].par_cle)
 
     def total_revenus_par_source(self) -> Dict[str, float]:
         """
@@ -187,10 +712,7 @@ class GestionnaireFinancier:
         Returns:
             Dict[str, float]: Dictionnaire avec les sources et leurs montants.
         """
-        totaux = defaultdict(float)
-        for revenu in self.revenus:
-            totaux[revenu.source] += revenu.montant
-        return dict(totaux)
+        return dict(self._structures_revenus()[1].par_cle)
 
     def depenses_mensuelles(self) -> Dict[str, float]:
         """
@@ -199,11 +721,31 @@ class GestionnaireFinancier:
         Returns:
             Dict[str, float]: Dictionnaire avec les mois (format 'YYYY-MM') et leurs montants.
         """
-        depenses_par_mois = defaultdict(float)
-        for depense in self.depenses:
-            mois = depense.date.strftime("%Y-%m")
-            depenses_par_mois[mois] += depense.montant
-        return dict(sorted(depenses_par_mois.items()))
+        return dict(sorted(self._structures_depenses()[1].par_mois.items()))
+
+    def depenses_du_mois(self, mois: str) -> float:
+        """
+        Retourne le total des dépenses d'un mois.
+        
+        Args:
+            mois (str): Mois au format 'YYYY-MM'.
+            
+        Returns:
+            float: Total des dépenses du mois.
+        """
+        return self._structures_depenses()[1].par_mois.get(mois, 0.0)
+
+    def revenus_du_mois(self, mois: str) -> float:
+        """
+        Retourne le total des revenus d'un mois.
+        
+        Args:
+            mois (str): Mois au format 'YYYY-MM'.
+            
+        Returns:
+            float: Total des revenus du mois.
+        """
+        return self._structures_revenus()[1].par_mois.get(mois, 0.0)
 
     def revenus_mensuels(self) -> Dict[str, float]:
         """
@@ -212,11 +754,7 @@ class GestionnaireFinancier:
         Returns:
             Dict[str, float]: Dictionnaire avec les mois (format 'YYYY-MM') et leurs montants.
         """
-        revenus_par_mois = defaultdict(float)
-        for revenu in self.revenus:
-            mois = revenu.date.strftime("%Y-%m")
-            revenus_par_mois[mois] += revenu.montant
-        return dict(sorted(revenus_par_mois.items()))
+        return dict(sorted(self._structures_revenus()[1].par_mois.items()))
 
     def creer_camembert_depenses(self) -> Figure:
         """
@@ -385,7 +923,7 @@ class GestionnaireFinancier:
             f.write(f"Solde global: {self.calculer_solde():.2f}€\n\n")
             
             # Résumé des revenus
-            total_revenus = sum(r.montant for r in self.revenus)
+            total_revenus = self.total_revenus()
             f.write(f"REVENUS TOTAUX: {total_revenus:.2f}€\n")
             f.write("------------------------------\n")
             revenus_par_source = self.total_revenus_par_source()
@@ -396,7 +934,7 @@ class GestionnaireFinancier:
             f.write("\n")
             
             # Résumé des dépenses
-            total_depenses = sum(d.montant for d in self.depenses)
+            total_depenses = self.total_depenses()
             f.write(f"DÉPENSES TOTALES: {total_depenses:.2f}€\n")
             f.write("------------------------------\n")
             depenses_par_categorie = self.total_depenses_par_categorie()
@@ -442,17 +980,34 @@ class GestionnaireFinancier:
         Returns:
             str: Catégorie devinée.
         """
-        libelle_upper = libelle.upper()
-        
-        # Charger les mappings
-        mappings = self.charger_categories_mapping()
-        
         # Chercher dans les mappings existants
-        category_dict = mappings["depenses"] if type_transaction == "depense" else mappings["revenus"]
-        
-        for keyword, category in category_dict.items():
-            if keyword in libelle_upper:
-                return category
+        automates = self._automates_categories_a_jour()
+        automate = automates["depenses"] if type_transaction == "depense" else automates["revenus"]
+        category = automate.rechercher(libelle.upper())
+        if category is not None:
+            return category
         
         # Par défaut
-        return "divers" if type_transaction == "depense" else "autres_revenus"
\ No newline at end of file
+        return "divers" if type_transaction == "depense" else "autres_revenus"
+
+    def _automates_categories_a_jour(self) -> Dict[str, AutomateCategories]:
+        """
+        Retourne les mappings de catégories compilés, recompilés seulement si le fichier a changé.
+        
+        Returns:
+            Dict[str, AutomateCategories]: Automates des dépenses et des revenus.
+        """
+        try:
+            etat = os.stat(CATEGORIES_JSON)
+            signature = (etat.st_mtime_ns, etat.st_size)
+        except OSError:
+            signature = None
+        
+        if self._automates_categories is None or signature != self._signature_categories:
+            mappings = self.charger_categories_mapping()
+            self._automates_categories = {
+                "depenses": AutomateCategories(mappings.get("depenses", {})),
+                "revenus": AutomateCategories(mappings.get("revenus", {}))
+            }
+            self._signature_categories = signature
+        return self._automates_categories
\ No newline at end of file
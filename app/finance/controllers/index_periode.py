@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Index par date pour les calculs sur une période.
+Ce module définit la classe IndexPeriode qui maintient une collection de dépenses
+ou de revenus triée par date, accompagnée des sommes cumulées de leurs montants.
+"""
+
+import bisect
+import datetime
+from typing import Any, Iterable, List, Optional, Tuple
+
+class IndexPeriode:
+    """
+    Index trié par date d'une collection d'éléments possédant les attributs `date` et `montant`.
+
+    Le total d'une période s'obtient par deux recherches dichotomiques et une soustraction
+    entre sommes cumulées, et la liste des éléments d'une période est une simple tranche.
+
+    Attributes:
+        _dates (List[datetime.date]): Dates des éléments, triées.
+        _elements (List[Any]): Éléments, dans le même ordre que les dates.
+        _cumuls (List[float]): _cumuls[i] est la somme des montants des i premiers éléments.
+        _cumuls_valides (bool): False si les cumuls doivent être recalculés.
+    """
+
+    def __init__(self, elements: Iterable[Any] = ()):
+        """
+        Initialise l'index.
+
+        Args:
+            elements (Iterable[Any], optional): Éléments à indexer. Par défaut: aucun.
+        """
+        self._dates = []
+        self._elements = []
+        self._cumuls = [0.0]
+        self._cumuls_valides = True
+        self.reconstruire(elements)
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'éléments indexés."""
+        return len(self._elements)
+
+    def reconstruire(self, elements: Iterable[Any]) -> None:
+        """
+        Reconstruit entièrement l'index à partir d'une collection.
+
+        Args:
+            elements (Iterable[Any]): Éléments à indexer.
+        """
+        self._elements = sorted(elements, key=lambda e: e.date)
+        self._dates = [e.date for e in self._elements]
+        self._recalculer_cumuls()
+
+    def ajouter(self, element: Any) -> None:
+        """
+        Ajoute un élément à l'index en conservant l'ordre des dates.
+        Un ajout en fin d'index (cas le plus courant) met à jour les cumuls en O(1) ;
+        un ajout antérieur les invalide jusqu'à la prochaine requête.
+
+        Args:
+            element (Any): Élément à ajouter.
+        """
+        position = bisect.bisect_right(self._dates, element.date)
+        self._dates.insert(position, element.date)
+        self._elements.insert(position, element)
+
+        if self._cumuls_valides and position == len(self._elements) - 1:
+            self._cumuls.append(self._cumuls[-1] + element.montant)
+        else:
+            self._cumuls_valides = False
+
+    def ajouter_lot(self, elements: Iterable[Any]) -> None:
+        """
+        Ajoute plusieurs éléments à l'index en une fois.
+        Un lot postérieur à tout l'index est ajouté en fin (cumuls prolongés) ; sinon
+        l'index est fusionné avec le lot trié, en un seul passage.
+
+        Args:
+            elements (Iterable[Any]): Éléments à ajouter.
+        """
+        lot = sorted(elements, key=lambda e: e.date)
+        if not lot:
+            return
+        if not self._dates or lot[0].date >= self._dates[-1]:
+            self._dates.extend(e.date for e in lot)
+            self._elements.extend(lot)
+            if self._cumuls_valides:
+                total = self._cumuls[-1]
+                for element in lot:
+                    total += element.montant
+                    self._cumuls.append(total)
+            return
+        # Deux séquences triées : le tri (stable) de leur concaténation est une fusion
+        self.reconstruire(self._elements + lot)
+
+    def retirer(self, element: Any) -> bool:
+        """
+        Retire un élément de l'index (comparaison par identité).
+
+        Args:
+            element (Any): Élément à retirer.
+
+        Returns:
+            bool: True si l'élément a été trouvé et retiré.
+        """
+        debut = bisect.bisect_left(self._dates, element.date)
+        fin = bisect.bisect_right(self._dates, element.date)
+        for position in range(debut, fin):
+            if self._elements[position] is element:
+                del self._dates[position]
+                del self._elements[position]
+                self._cumuls_valides = False
+                return True
+        return False
+
+    def somme(self, date_debut: Optional[datetime.date] = None,
+              date_fin: Optional[datetime.date] = None) -> float:
+        """
+        Calcule la somme des montants sur une période (bornes incluses).
+
+        Args:
+            date_debut (Optional[datetime.date], optional): Début de la période. Par défaut: sans limite.
+            date_fin (Optional[datetime.date], optional): Fin de la période. Par défaut: sans limite.
+
+        Returns:
+            float: Somme des montants de la période.
+        """
+        if not self._cumuls_valides:
+            self._recalculer_cumuls()
+        debut, fin = self._bornes(date_debut, date_fin)
+        return self._cumuls[fin] - self._cumuls[debut]
+
+    def elements(self, date_debut: Optional[datetime.date] = None,
+                 date_fin: Optional[datetime.date] = None) -> List[Any]:
+        """
+        Retourne les éléments d'une période (bornes incluses), triés par date croissante.
+
+        Args:
+            date_debut (Optional[datetime.date], optional): Début de la période. Par défaut: sans limite.
+            date_fin (Optional[datetime.date], optional): Fin de la période. Par défaut: sans limite.
+
+        Returns:
+            List[Any]: Éléments de la période.
+        """
+        debut, fin = self._bornes(date_debut, date_fin)
+        return self._elements[debut:fin]
+
+    def _bornes(self, date_debut: Optional[datetime.date],
+                date_fin: Optional[datetime.date]) -> Tuple[int, int]:
+        """Retourne les positions délimitant une période dans l'index."""
+        debut = 0 if date_debut is None else bisect.bisect_left(self._dates, date_debut)
+        fin = len(self._dates) if date_fin is None else bisect.bisect_right(self._dates, date_fin)
+        return debut, max(debut, fin)
+
+    def _recalculer_cumuls(self) -> None:
+        """Recalcule les sommes cumulées des montants."""
+        cumuls = [0.0]
+        total = 0.0
+        for element in self._elements:
+            total += element.montant
+            cumuls.append(total)
+        self._cumuls = cumuls
+        self._cumuls_valides = True
@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Stockage colonnaire optionnel des dépenses et des revenus.
+Ce module définit la classe RegistreColonnaire qui conserve une collection de
+dépenses ou de revenus sous forme de tableaux NumPy (montants, dates et catégories
+encodées), tout en se comportant comme une liste d'objets Depense ou Revenu.
+"""
+
+import datetime
+import weakref
+from collections.abc import MutableSequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : le stockage en listes reste disponible
+    np = None
+
+NUMPY_DISPONIBLE = np is not None
+
+class RegistreColonnaire(MutableSequence):
+    """
+    Liste de dépenses ou de revenus stockée par colonnes.
+
+    Les montants sont stockés en float64, les dates en datetime64[D] et les catégories
+    (ou sources) sous forme de codes entiers renvoyant à un dictionnaire de valeurs.
+    Les objets ne sont construits qu'à la demande, lors d'un accès par position, et ne
+    sont retenus (par référence faible) que tant qu'ils sont utilisés ailleurs : une
+    position renvoie alors toujours le même objet, sans que le registre conserve un
+    objet par élément.
+
+    Le registre offre également les opérations de IndexPeriode et de AgregatsFinanciers
+    (somme et éléments d'une période, totaux par mois et par catégorie), calculées
+    par réductions vectorisées sur les colonnes.
+
+    Les objets obtenus ne doivent pas être modifiés sur place : une modification
+    passe par une affectation (`registre[i] = nouvel_objet`).
+
+    Attributes:
+        classe (type): Classe des éléments (Depense ou Revenu).
+        attribut_cle (str): Nom de l'attribut encodé ("categorie" ou "source").
+    """
+
+    CAPACITE_INITIALE = 64
+
+    def __init__(self, classe: type, attribut_cle: str, elements: Iterable[Any] = ()):
+        """
+        Initialise le registre.
+
+        Args:
+            classe (type): Classe des éléments (Depense ou Revenu).
+            attribut_cle (str): Nom de l'attribut encodé ("categorie" ou "source").
+            elements (Iterable[Any], optional): Éléments initiaux. Par défaut: aucun.
+
+        Raises:
+            ImportError: Si NumPy n'est pas installé.
+        """
+        if np is None:
+            raise ImportError("NumPy est requis pour le stockage colonnaire.")
+
+        self.classe = classe
+        self.attribut_cle = attribut_cle
+        self._taille = 0
+        self._montants = np.empty(self.CAPACITE_INITIALE, dtype=np.float64)
+        self._dates = np.empty(self.CAPACITE_INITIALE, dtype="datetime64[D]")
+        self._codes = np.empty(self.CAPACITE_INITIALE, dtype=np.int32)
+        self._valeurs = []  # Code -> catégorie ou source
+        self._codes_par_valeur = {}  # Catégorie ou source -> code
+        self._notes = []
+        self._recurrences = []
+        self._ids_transaction = []
+        self._objets = weakref.WeakValueDictionary()  # Objets encore utilisés, par position
+        self.extend(elements)
+
+    @classmethod
+    def depuis_colonnes(cls, classe: type, attribut_cle: str, montants: Any, dates: Any,
+                        valeurs_cle: List[str], notes: List[str], recurrences: List[str],
+                        ids_transaction: List[Optional[str]]) -> "RegistreColonnaire":
+        """
+        Construit un registre directement à partir de colonnes, sans créer d'objets.
+
+        Args:
+            classe (type): Classe des éléments (Depense ou Revenu).
+            attribut_cle (str): Nom de l'attribut encodé ("categorie" ou "source").
+            montants (Any): Montants (séquence de nombres).
+            dates (Any): Dates (séquence de datetime.date ou de datetime64[D]).
+            valeurs_cle (List[str]): Catégories ou sources.
+            notes (List[str]): Notes.
+            recurrences (List[str]): Récurrences.
+            ids_transaction (List[Optional[str]]): Identifiants de transaction.
+
+        Returns:
+            RegistreColonnaire: Registre contenant les colonnes fournies.
+        """
+        registre = cls(classe, attribut_cle)
+        taille = len(valeurs_cle)
+        registre._reserver(taille)
+        registre._montants[:taille] = np.asarray(montants, dtype=np.float64)
+        registre._dates[:taille] = np.asarray(dates, dtype="datetime64[D]")
+        registre._codes[:taille] = [registre._encoder(valeur) for valeur in valeurs_cle]
+        registre._notes = list(notes)
+        registre._recurrences = list(recurrences)
+        registre._ids_transaction = list(ids_transaction)
+        registre._taille = taille
+        return registre
+
+    # --- Interface de liste ---
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'éléments."""
+        return self._taille
+
+    def __getitem__(self, position):
+        """Retourne l'élément (ou la liste d'éléments) à une position donnée."""
+        if isinstance(position, slice):
+            return [self._objet(i) for i in range(*position.indices(self._taille))]
+        return self._objet(self._normaliser(position))
+
+    def __setitem__(self, position: int, element: Any) -> None:
+        """Remplace l'élément à une position donnée."""
+        if isinstance(position, slice):
+            raise TypeError("Le registre colonnaire ne permet pas l'affectation par tranche.")
+        self._ecrire(self._normaliser(position), element)
+
+    def __delitem__(self, position: int) -> None:
+        """Supprime l'élément à une position donnée."""
+        if isinstance(position, slice):
+            raise TypeError("Le registre colonnaire ne permet pas la suppression par tranche.")
+        i = self._normaliser(position)
+        fin = self._taille
+        for colonne in (self._montants, self._dates, self._codes):
+            colonne[i:fin - 1] = colonne[i + 1:fin]
+        for liste in (self._notes, self._recurrences, self._ids_transaction):
+            del liste[i]
+        self._objets.pop(i, None)
+        self._decaler_objets(i + 1, -1)
+        self._taille -= 1
+
+    def insert(self, position: int, element: Any) -> None:
+        """Insère un élément avant une position donnée."""
+        fin = self._taille
+        i = min(max(position + fin if position < 0 else position, 0), fin)
+        self._reserver(fin + 1)
+        for colonne in (self._montants, self._dates, self._codes):
+            colonne[i + 1:fin + 1] = colonne[i:fin]
+        for liste in (self._notes, self._recurrences, self._ids_transaction):
+            liste.insert(i, None)
+        if i < fin:
+            self._decaler_objets(i, 1)
+        self._taille += 1
+        self._ecrire(i, element)
+
+    def extend(self, elements: Iterable[Any]) -> None:
+        """Ajoute plusieurs éléments en fin de registre."""
+        elements = list(elements)
+        self._reserver(self._taille + len(elements))
+        for element in elements:
+            self.insert(self._taille, element)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Parcourt les éléments dans l'ordre."""
+        for i in range(self._taille):
+            yield self._objet(i)
+
+    # --- Interface de IndexPeriode ---
+
+    def somme(self, date_debut: Optional[datetime.date] = None,
+              date_fin: Optional[datetime.date] = None) -> float:
+        """
+        Calcule la somme des montants sur une période (bornes incluses).
+
+        Args:
+            date_debut (Optional[datetime.date], optional): Début de la période. Par défaut: sans limite.
+            date_fin (Optional[datetime.date], optional): Fin de la période. Par défaut: sans limite.
+
+        Returns:
+            float: Somme des montants de la période.
+        """
+        montants = self._montants[:self._taille]
+        return float(montants[self._masque(date_debut, date_fin)].sum())
+
+    def elements(self, date_debut: Optional[datetime.date] = None,
+                 date_fin: Optional[datetime.date] = None) -> List[Any]:
+        """
+        Retourne les éléments d'une période (bornes incluses), triés par date croissante.
+
+        Args:
+            date_debut (Optional[datetime.date], optional): Début de la période. Par défaut: sans limite.
+            date_fin (Optional[datetime.date], optional): Fin de la période. Par défaut: sans limite.
+
+        Returns:
+            List[Any]: Éléments de la période.
+        """
+        positions = np.flatnonzero(self._masque(date_debut, date_fin))
+        ordre = np.argsort(self._dates[positions], kind="stable")
+        return [self._objet(int(i)) for i in positions[ordre]]
+
+    # --- Interface de AgregatsFinanciers ---
+
+    @property
+    def nombre(self) -> int:
+        """Nombre d'éléments agrégés."""
+        return self._taille
+
+    @property
+    def total(self) -> float:
+        """Somme de tous les montants."""
+        return float(self._montants[:self._taille].sum())
+
+    @property
+    def par_mois(self) -> Dict[str, float]:
+        """Totaux par mois (format 'YYYY-MM')."""
+        if not self._taille:
+            return {}
+        mois = self._dates[:self._taille].astype("datetime64[M]")
+        mois_uniques, groupes = np.unique(mois, return_inverse=True)
+        totaux = np.bincount(groupes, weights=self._montants[:self._taille])
+        return {str(m): float(total) for m, total in zip(mois_uniques, totaux)}
+
+    @property
+    def par_cle(self) -> Dict[str, float]:
+        """Totaux par catégorie ou par source."""
+        codes = self._codes[:self._taille]
+        nombres = np.bincount(codes, minlength=len(self._valeurs))
+        totaux = np.bincount(codes, weights=self._montants[:self._taille], minlength=len(self._valeurs))
+        return {self._valeurs[code]: float(totaux[code]) for code in np.flatnonzero(nombres)}
+
+    def ajouter(self, element: Any) -> None:
+        """Sans effet : les colonnes sont déjà à jour après un ajout au registre."""
+
+    def retirer(self, element: Any) -> bool:
+        """Sans effet : les colonnes sont déjà à jour après une suppression du registre."""
+        return True
+
+    def reconstruire(self, elements: Iterable[Any]) -> None:
+        """Sans effet : les réductions sont toujours calculées sur les colonnes courantes."""
+
+    # --- Fonctions internes ---
+
+    def _normaliser(self, position: int) -> int:
+        """Convertit une position (éventuellement négative) en indice valide."""
+        if position < 0:
+            position += self._taille
+        if not 0 <= position < self._taille:
+            raise IndexError("Indice hors du registre.")
+        return position
+
+    def _reserver(self, capacite: int) -> None:
+        """Agrandit les colonnes pour contenir au moins `capacite` éléments."""
+        if capacite <= len(self._montants):
+            return
+        nouvelle_capacite = max(capacite, 2 * len(self._montants))
+        for nom in ("_montants", "_dates", "_codes"):
+            colonne = getattr(self, nom)
+            agrandie = np.empty(nouvelle_capacite, dtype=colonne.dtype)
+            agrandie[:self._taille] = colonne[:self._taille]
+            setattr(self, nom, agrandie)
+
+    def _encoder(self, valeur: str) -> int:
+        """Retourne le code d'une catégorie ou d'une source, en l'ajoutant au dictionnaire si besoin."""
+        code = self._codes_par_valeur.get(valeur)
+        if code is None:
+            code = len(self._valeurs)
+            self._valeurs.append(valeur)
+            self._codes_par_valeur[valeur] = code
+        return code
+
+    def _ecrire(self, i: int, element: Any) -> None:
+        """Écrit les champs d'un élément à la position i."""
+        self._montants[i] = element.montant
+        self._dates[i] = np.datetime64(element.date, "D")
+        self._codes[i] = self._encoder(getattr(element, self.attribut_cle))
+        self._notes[i] = element.notes
+        self._recurrences[i] = element.recurrence
+        self._ids_transaction[i] = element.id_transaction
+        self._objets[i] = element
+
+    def _objet(self, i: int) -> Any:
+        """Retourne l'objet à la position i, en le construisant si nécessaire."""
+        objet = self._objets.get(i)
+        if objet is None:
+            objet = self.classe(
+                float(self._montants[i]),
+                self._valeurs[self._codes[i]],
+                self._dates[i].item(),
+                self._notes[i],
+                self._recurrences[i],
+                self._ids_transaction[i]
+            )
+            self._objets[i] = objet
+        return objet
+
+    def _decaler_objets(self, debut: int, decalage: int) -> None:
+        """Décale les positions des objets retenus situés à partir de `debut`."""
+        decales = [(i, objet) for i, objet in self._objets.items() if i >= debut]
+        for i, _ in decales:
+            del self._objets[i]
+        for i, objet in decales:
+            self._objets[i + decalage] = objet
+
+    def _masque(self, date_debut: Optional[datetime.date], date_fin: Optional[datetime.date]) -> Any:
+        """Retourne le masque booléen des éléments compris dans une période."""
+        dates = self._dates[:self._taille]
+        masque = np.ones(self._taille, dtype=bool)
+        if date_debut is not None:
+            masque &= dates >= np.datetime64(date_debut, "D")
+        if date_fin is not None:
+            masque &= dates <= np.datetime64(date_fin, "D")
+        return masque
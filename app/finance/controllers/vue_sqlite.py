@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Requêtes SQLite sur les dépenses ou les revenus.
+Ce module définit la classe VueSQLite qui offre les opérations de IndexPeriode et de
+AgregatsFinanciers en les déléguant à la base SQLite (filtres et sommes en SQL).
+"""
+
+import datetime
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.stockage_sqlite import StockageSQLite
+
+class VueSQLite:
+    """
+    Index par date et agrégats d'une table financière, calculés par la base SQLite.
+
+    Les éléments retournés sont ceux de la liste du gestionnaire : `identifiants[i]` est
+    l'identifiant SQL de `elements[i]`, et les identifiants sont croissants (les ajouts
+    se font en fin de liste et de table).
+
+    Attributes:
+        stockage (StockageSQLite): Base SQLite.
+        table (str): Table interrogée ("depenses" ou "revenus").
+        elements (List[Any]): Liste des dépenses ou des revenus du gestionnaire.
+        identifiants (List[int]): Identifiants SQL des éléments, dans le même ordre.
+    """
+
+    def __init__(self, stockage: StockageSQLite, table: str, elements: List[Any], identifiants: List[int]):
+        """
+        Initialise la vue.
+
+        Args:
+            stockage (StockageSQLite): Base SQLite.
+            table (str): Table interrogée ("depenses" ou "revenus").
+            elements (List[Any]): Liste des dépenses ou des revenus du gestionnaire.
+            identifiants (List[int]): Identifiants SQL des éléments, dans le même ordre.
+        """
+        self.stockage = stockage
+        self.table = table
+        self.elements_charges = elements
+        self.identifiants = identifiants
+
+    # --- Interface de IndexPeriode ---
+
+    def somme(self, date_debut: Optional[datetime.date] = None,
+              date_fin: Optional[datetime.date] = None) -> float:
+        """
+        Calcule la somme des montants sur une période (bornes incluses).
+
+        Args:
+            date_debut (Optional[datetime.date], optional): Début de la période. Par défaut: sans limite.
+            date_fin (Optional[datetime.date], optional): Fin de la période. Par défaut: sans limite.
+
+        Returns:
+            float: Somme des montants de la période.
+        """
+        return self.stockage.somme(self.table, date_debut, date_fin)
+
+    def elements(self, date_debut: Optional[datetime.date] = None,
+                 date_fin: Optional[datetime.date] = None) -> List[Any]:
+        """
+        Retourne les éléments d'une période (bornes incluses), triés par date croissante.
+
+        Args:
+            date_debut (Optional[datetime.date], optional): Début de la période. Par défaut: sans limite.
+            date_fin (Optional[datetime.date], optional): Fin de la période. Par défaut: sans limite.
+
+        Returns:
+            List[Any]: Éléments de la période.
+        """
+        return [self.elements_charges[bisect_left(self.identifiants, identifiant)]
+                for identifiant in self.stockage.identifiants(self.table, date_debut, date_fin)]
+
+    # --- Interface de AgregatsFinanciers ---
+
+    @property
+    def nombre(self) -> int:
+        """Nombre de lignes de la table."""
+        return self.stockage.compter(self.table)
+
+    @property
+    def total(self) -> float:
+        """Somme de tous les montants."""
+        return self.stockage.somme(self.table)
+
+    @property
+    def par_mois(self) -> Dict[str, float]:
+        """Totaux par mois (format 'YYYY-MM')."""
+        return self.stockage.totaux_par_mois(self.table)
+
+    @property
+    def par_cle(self) -> Dict[str, float]:
+        """Totaux par catégorie ou par source."""
+        return self.stockage.totaux_par_cle(self.table)
+
+    def ajouter(self, element: Any) -> None:
+        """Sans effet : la table est mise à jour par le gestionnaire."""
+
+    def retirer(self, element: Any) -> bool:
+        """Sans effet : la table est mise à jour par le gestionnaire."""
+        return True
+
+    def reconstruire(self, elements: Iterable[Any]) -> None:
+        """Sans effet : les requêtes portent toujours sur le contenu courant de la table."""
@@ -1,31 +1,60 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import datetime
 import hashlib
 import os
 import time
-from urllib.parse import urlencode, quote_plus
+from urllib.parse import urlencode, urljoin, quote_plus
 import tkinter as tk
 from tkinter import ttk, messagebox
 import keyring
 import webbrowser
-from threading import Thread
+from threading import Thread, Lock, RLock, Event
+from concurrent.futures import ThreadPoolExecutor
+import queue
 import traceback
 
+from app.core.config import MODELE_CATEGORIES_JSON
+from app.finance.controllers.automate_categories import AutomateCategories
+from app.finance.controllers.classifieur_categories import (charger_modeles, entrainer_depuis_gestionnaire,
+                                                            sauvegarder_modeles)
+
 class APISyncException(Exception):
     """Exception spécifique pour les erreurs d'API bancaire"""
     pass
 
+class RetryPlafonne(Retry):
+    """Nouvelles tentatives urllib3 dont l'attente imposée par Retry-After est plafonnée"""
+    
+    def get_retry_after(self, response):
+        attente = super().get_retry_after(response)
+        if attente is None:
+            return None
+        return min(attente, ConnexionAPISingleton.DELAI_MAX_RETRY_AFTER)
+
 class ConnexionAPISingleton:
     """
     Singleton pour gérer les connexions aux API bancaires
     """
     _instance = None
     
+    # Connexions HTTP : une session par banque, connexions conservées (keep-alive)
+    TAILLE_POOL_HTTP = 10  # Connexions simultanées par banque
+    NOMBRE_TENTATIVES = 5  # Nouvelles tentatives sur erreur de connexion, et sur 429 et 5xx en GET
+    FACTEUR_ATTENTE = 0.5  # Attente exponentielle entre tentatives : 0.5 s, 1 s, 2 s...
+    DELAI_REQUETE = 30  # Délai maximal d'une requête, en secondes
+    CODES_A_REESSAYER = (429, 500, 502, 503, 504)
+    METHODES_A_REESSAYER = frozenset({"GET"})  # Un POST en échec a pu être traité : ne pas le rejouer
+    DELAI_MAX_RETRY_AFTER = 60  # Attente maximale imposée par un en-tête Retry-After, en secondes
+    
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ConnexionAPISingleton, cls).__new__(cls)
             cls._instance.tokens = {}
+            cls._instance.sessions = {}
+            cls._instance.verrou_sessions = Lock()
             cls._instance.api_configs = {
                 "monabanq": {
                     "base_url": "https://api.monabanq.com/v1",
@@ -73,9 +102,43 @@ class ConnexionAPISingleton:
                     "transactions_url": "/accounts/{account_id}/transactions"
                 }
             }
+            # Plusieurs comptes d'une même banque peuvent demander un rafraîchissement en même temps
+            cls._instance.verrous_tokens = {bank: Lock() for bank in cls._instance.api_configs}
             cls._instance.load_api_keys()
         return cls._instance
     
+    def get_session(self, bank):
+        """Retourne la session HTTP de la banque (pool de connexions et nouvelles tentatives)"""
+        with self.verrou_sessions:
+            session = self.sessions.get(bank)
+            if session is None:
+                # Le code d'erreur final est rendu à l'appelant, qui lève APISyncException ;
+                # l'en-tête Retry-After des réponses 429/503 est respecté, dans la limite de
+                # DELAI_MAX_RETRY_AFTER. Les erreurs de connexion (requête non envoyée) sont
+                # retentées quelle que soit la méthode, les codes d'erreur seulement en GET
+                retry = RetryPlafonne(
+                    total=self.NOMBRE_TENTATIVES,
+                    read=False,  # Une requête peut avoir été traitée : ne pas la rejouer
+                    backoff_factor=self.FACTEUR_ATTENTE,
+                    status_forcelist=self.CODES_A_REESSAYER,
+                    allowed_methods=self.METHODES_A_REESSAYER,
+                    respect_retry_after_header=True,
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.TAILLE_POOL_HTTP, max_retries=retry)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self.sessions[bank] = session
+            return session
+    
+    def close_sessions(self):
+        """Ferme les sessions HTTP ouvertes"""
+        with self.verrou_sessions:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions = {}
+    
     def load_api_keys(self):
         """Chargement des clés API depuis le stockage sécurisé"""
         try:
@@ -139,7 +202,7 @@ class ConnexionAPISingleton:
             "client_secret": config["client_secret"]
         }
         
-        response = requests.post(config["token_url"], data=data)
+        response = self.get_session(bank).post(config["token_url"], data=data, timeout=self.DELAI_REQUETE)
         
         if response.status_code != 200:
             raise APISyncException(f"Erreur lors de l'échange du code: {response.text}")
@@ -152,6 +215,13 @@ class ConnexionAPISingleton:
 
     def refresh_token_if_needed(self, bank):
         """Rafraîchit le token si nécessaire"""
+        if bank not in self.verrous_tokens:
+            raise ValueError(f"Aucun token disponible pour {bank}")
+        with self.verrous_tokens[bank]:
+            return self._refresh_token_if_needed(bank)
+    
+    def _refresh_token_if_needed(self, bank):
+        """Rafraîchit le token si nécessaire (appelé sous verrou)"""
         if bank not in self.tokens:
             raise ValueError(f"Aucun token disponible pour {bank}")
         
@@ -168,7 +238,7 @@ class ConnexionAPISingleton:
                 "client_secret": config["client_secret"]
             }
             
-            response = requests.post(config["token_url"], data=data)
+            response = self.get_session(bank).post(config["token_url"], data=data, timeout=self.DELAI_REQUETE)
             
             if response.status_code != 200:
                 raise APISyncException(f"Erreur lors du rafraîchissement du token: {response.text}")
@@ -194,7 +264,8 @@ class ConnexionAPISingleton:
             "Content-Type": "application/json"
         }
         
-        response = requests.get(f"{config['base_url']}{config['accounts_url']}", headers=headers)
+        response = self.get_session(bank).get(f"{config['base_url']}{config['accounts_url']}", headers=headers,
+                                              timeout=self.DELAI_REQUETE)
         
         if response.status_code != 200:
             raise APISyncException(f"Erreur lors de la récupération des comptes: {response.text}")
@@ -202,17 +273,25 @@ class ConnexionAPISingleton:
         return response.json()
 
     def get_transactions(self, bank, account_id, from_date=None, to_date=None):
-        """Récupère les transactions d'un compte bancaire"""
+        """Récupère toutes les transactions d'un compte bancaire (toutes les pages)"""
+        transactions = []
+        for page in self.iter_transactions(bank, account_id, from_date, to_date):
+            transactions.extend(page)
+        return {"transactions": transactions}
+
+    def iter_transactions(self, bank, account_id, from_date=None, to_date=None):
+        """
+        Parcourt les transactions d'un compte bancaire page par page (générateur).
+        Chaque page est demandée seulement quand la précédente a été consommée.
+        La page suivante est désignée par un lien (champ "next", "links.next", "_links.next.href"
+        ou en-tête Link), un curseur ("next_cursor", "pagination.next_cursor") ou un numéro
+        de page ("pagination.page" / "pagination.total_pages").
+        """
         if bank not in self.api_configs:
             raise ValueError(f"Banque non supportée: {bank}")
         
         config = self.api_configs[bank]
-        token_data = self.refresh_token_if_needed(bank)
-        
-        headers = {
-            "Authorization": f"Bearer {token_data['access_token']}",
-            "Content-Type": "application/json"
-        }
+        session = self.get_session(bank)
         
         params = {}
         if from_date:
@@ -221,29 +300,92 @@ class ConnexionAPISingleton:
             params["dateTo"] = to_date.strftime("%Y-%m-%d")
         
         url = f"{config['base_url']}{config['transactions_url'].format(account_id=account_id)}"
-        if params:
-            url += f"?{urlencode(params)}"
-        
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code != 200:
-            raise APISyncException(f"Erreur lors de la récupération des transactions: {response.text}")
-        
-        return response.json()
+        pages_vues = set()
+        while True:
+            # Le token peut expirer pendant une longue récupération
+            token_data = self.refresh_token_if_needed(bank)
+            headers = {
+                "Authorization": f"Bearer {token_data['access_token']}",
+                "Content-Type": "application/json"
+            }
+            
+            response = session.get(url, params=params, headers=headers, timeout=self.DELAI_REQUETE)
+            
+            if response.status_code != 200:
+                raise APISyncException(f"Erreur lors de la récupération des transactions: {response.text}")
+            
+            data = response.json()
+            page = data.get("transactions", [])
+            if page:
+                yield page
+            
+            suivante = self._page_suivante(response, data, url, params)
+            # Arrêt sur page vide ou si la banque renvoie une page déjà lue
+            if suivante is None or not page:
+                return
+            cle = (suivante[0], tuple(sorted(suivante[1].items())))
+            if cle in pages_vues:
+                return
+            pages_vues.add(cle)
+            url, params = suivante
+
+    @staticmethod
+    def _page_suivante(response, data, url, params):
+        """Retourne l'URL et les paramètres de la page suivante, ou None s'il n'y en a pas"""
+        pagination = data.get("pagination") or {}
+        liens = data.get("links") or {}
+        liens_hal = data.get("_links") or {}
+        
+        # Lien vers la page suivante (corps de la réponse ou en-tête Link)
+        lien = data.get("next") or liens.get("next") or (liens_hal.get("next") or {}).get("href")
+        if not lien and "next" in response.links:
+            lien = response.links["next"]["url"]
+        if isinstance(lien, str) and lien:
+            # Le lien contient déjà tous les paramètres de la requête
+            return urljoin(url, lien), {}
+        
+        # Curseur opaque à renvoyer tel quel
+        curseur = data.get("next_cursor") or pagination.get("next_cursor")
+        if curseur:
+            return url, dict(params, cursor=curseur)
+        
+        # Numérotation des pages
+        if "page" in pagination and "total_pages" in pagination:
+            page = int(pagination["page"])
+            if page < int(pagination["total_pages"]):
+                return url, dict(params, page=page + 1)
+        return None
 
 
 class SynchronisationBancaire:
     """
     Classe pour synchroniser les données bancaires avec l'application
     """
-    def __init__(self, gestionnaire_financier):
+    NOMBRE_MAX_REQUETES = 8  # Requêtes bancaires simultanées lors d'une synchronisation globale
+    
+    def __init__(self, gestionnaire_financier, fichier_transactions_importees="transactions_importees.json",
+                 fichier_reperes="reperes_synchronisation.json", chevauchement_jours=3,
+                 fichier_modele_categories=MODELE_CATEGORIES_JSON):
         self.gestionnaire = gestionnaire_financier
         self.api = ConnexionAPISingleton()
         self.categories_mapping = {}  # Mappings pour associer les libellés aux catégories
+        self.automates_categories = {}  # Mappings compilés, par type ; vidés à chaque chargement ou sauvegarde
+        self.fichier_transactions_importees = fichier_transactions_importees
+        self.transactions_importees = set()  # IDs déjà importés, chargés une fois par synchronisation
+        self.nouvelles_transactions_importees = []  # IDs importés depuis la dernière sauvegarde
+        self.verrou = RLock()  # Une seule synchronisation à la fois modifie le gestionnaire
+        # Repères par banque et par compte : dernière date d'opération synchronisée
+        self.fichier_reperes = fichier_reperes
+        self.chevauchement_jours = chevauchement_jours  # Jours relus avant le repère (opérations tardives)
+        self.reperes = {}
         self.load_categories_mapping()
+        # Classifieurs appris sur les transactions déjà catégorisées (après les mappings)
+        self.fichier_modele_categories = fichier_modele_categories
+        self.modeles_categories = charger_modeles(fichier_modele_categories)
     
     def load_categories_mapping(self):
         """Charge les mappings de catégories depuis un fichier"""
+        self.automates_categories = {}
         try:
             with open("categories_mapping.json", "r", encoding="utf-8") as f:
                 self.categories_mapping = json.load(f)
@@ -255,22 +397,39 @@ class SynchronisationBancaire:
     
     def save_categories_mapping(self):
         """Sauvegarde les mappings de catégories dans un fichier"""
+        self.automates_categories = {}
         with open("categories_mapping.json", "w", encoding="utf-8") as f:
             json.dump(self.categories_mapping, f, indent=4, ensure_ascii=False)
     
     def guess_category(self, transaction_type, libelle):
         """Devine la catégorie en fonction du libellé de la transaction"""
-        libelle_upper = libelle.upper()
-        
-        # Chercher dans les mappings existants
-        category_dict = self.categories_mapping["depenses"] if transaction_type == "DEBIT" else self.categories_mapping["revenus"]
-        
-        for keyword, category in category_dict.items():
-            if keyword in libelle_upper:
-                return category
+        return self.guess_categories(transaction_type, [libelle])[0]
+    
+    def guess_categories(self, transaction_type, libelles):
+        """Devine les catégories d'un lot de libellés : mappings, puis modèle appris, puis catégorie par défaut"""
+        # Chercher dans les mappings existants, compilés au premier appel
+        cle = "depenses" if transaction_type == "DEBIT" else "revenus"
+        automate = self.automates_categories.get(cle)
+        if automate is None:
+            automate = self.automates_categories[cle] = AutomateCategories(self.categories_mapping[cle])
+        categories = [automate.rechercher(libelle.upper()) for libelle in libelles]
+        
+        # Le modèle appris ne traite que les libellés sans mapping, en un seul lot
+        modele = self.modeles_categories.get(cle)
+        inconnus = [i for i, category in enumerate(categories) if category is None]
+        if modele is not None and inconnus:
+            for i, category in zip(inconnus, modele.predire([libelles[i] for i in inconnus])):
+                categories[i] = category
         
         # Par défaut
-        return "divers" if transaction_type == "DEBIT" else "autres_revenus"
+        defaut = "divers" if transaction_type == "DEBIT" else "autres_revenus"
+        return [category or defaut for category in categories]
+    
+    def entrainer_modele_categories(self):
+        """Entraîne et sauvegarde le modèle de catégories sur les transactions déjà catégorisées"""
+        self.modeles_categories = entrainer_depuis_gestionnaire(self.gestionnaire)
+        sauvegarder_modeles(self.modeles_categories, self.fichier_modele_categories)
+        return {cle: len(modele) for cle, modele in self.modeles_categories.items()}
     
     def add_category_mapping(self, transaction_type, keyword, category):
         """Ajoute un nouveau mapping de catégorie"""
@@ -279,107 +438,326 @@ class SynchronisationBancaire:
         self.save_categories_mapping()
     
     def synchroniser_transactions(self, bank, account_id, start_date=None, end_date=None):
-        """Synchronise les transactions bancaires avec l'application"""
-        try:
-            # Par défaut, synchroniser les transactions du dernier mois
-            if not start_date:
-                start_date = datetime.datetime.now() - datetime.timedelta(days=30)
-            if not end_date:
-                end_date = datetime.datetime.now()
-            
-            # Récupérer les transactions
-            transactions_data = self.api.get_transactions(bank, account_id, start_date, end_date)
-            
-            # Initialiser les compteurs
-            stats = {
-                "revenus_ajoutes": 0,
-                "depenses_ajoutees": 0,
-                "transactions_ignorees": 0
-            }
-            
-            for transaction in transactions_data.get("transactions", []):
-                # Vérifier si la transaction est déjà enregistrée (basé sur une référence unique)
-                # On pourrait utiliser une référence fournie par la banque ou générer un hash
-                transaction_id = transaction.get("id") or hashlib.md5(
-                    f"{transaction['date']}_{transaction['amount']}_{transaction['description']}".encode()
-                ).hexdigest()
+        """
+        Synchronise les transactions bancaires avec l'application, page par page.
+        Sans date de début, la synchronisation reprend au repère du compte (moins le
+        chevauchement), ou couvre le dernier mois pour un compte jamais synchronisé.
+        """
+        with self.verrou:
+            try:
+                # Charger une seule fois les IDs déjà importés et les repères
+                self.charger_transactions_importees()
+                self.charger_reperes()
                 
-                # Vérifier si cette transaction existe déjà dans notre système
-                if self._transaction_existe(transaction_id):
-                    stats["transactions_ignorees"] += 1
-                    continue
+                debut = self._debut_synchronisation(bank, account_id, start_date)
+                end_date = end_date or datetime.datetime.now()
                 
-                # Convertir la date
-                date_transaction = datetime.datetime.strptime(transaction["date"], "%Y-%m-%d").date()
+                # Chaque page est intégrée (et écrite) avant que la suivante soit demandée
+                stats = self._nouvelles_stats()
+                date_max = None
+                occurrences = {}  # Rangs des transactions sans référence, sur tout le compte
+                for page in self.api.iter_transactions(bank, account_id, debut, end_date):
+                    self._integrer_transactions(page, stats, occurrences)
+                    date_max = max([date_max or ""] + [t["date"] for t in page])
                 
-                # Traiter selon le type (débit ou crédit)
-                if transaction["type"] == "DEBIT":
-                    # C'est une dépense
-                    montant = abs(float(transaction["amount"]))
-                    categorie = self.guess_category("DEBIT", transaction["description"])
-                    
-                    # Créer et ajouter la dépense
-                    from app.finance.models.depense import Depense
-                    nouvelle_depense = Depense(
-                        montant=montant,
-                        categorie=categorie,
-                        date=date_transaction
-                    )
-                    self.gestionnaire.depenses.append(nouvelle_depense)
-                    stats["depenses_ajoutees"] += 1
-                    
-                elif transaction["type"] == "CREDIT":
-                    # C'est un revenu
-                    montant = float(transaction["amount"])
-                    source = self.guess_category("CREDIT", transaction["description"])
-                    
-                    # Créer et ajouter le revenu
-                    from app.finance.models.revenu import Revenu
-                    nouveau_revenu = Revenu(
-                        montant=montant,
-                        source=source,
-                        date=date_transaction
-                    )
-                    self.gestionnaire.revenus.append(nouveau_revenu)
-                    stats["revenus_ajoutes"] += 1
+                # Les ajouts sont déjà écrits en fin de fichier ; forcer leur écriture sur disque
+                self.gestionnaire.synchroniser_disque()
+                self._avancer_repere(bank, account_id, debut, date_max)
                 
-                # Enregistrer l'ID de la transaction pour éviter les doublons lors des prochaines synchros
-                self._enregistrer_transaction_id(transaction_id)
-            
-            # Sauvegarder les changements
-            self.gestionnaire.sauvegarder_depenses()
-            self.gestionnaire.sauvegarder_revenus()
-            
-            return stats
-            
+                return stats
+                
+            except Exception as e:
+                traceback.print_exc()
+                raise APISyncException(f"Erreur lors de la synchronisation: {str(e)}")
+            finally:
+                # Une seule écriture des IDs importés, y compris après une synchronisation interrompue
+                self.sauvegarder_transactions_importees()
+                self.sauvegarder_reperes()
+    
+    def synchroniser_tout(self, start_date=None, end_date=None, max_workers=None):
+        """
+        Synchronise en parallèle tous les comptes de toutes les banques authentifiées.
+        Les requêtes passent par un pool de threads borné ; les pages de transactions reçues
+        sont intégrées au fur et à mesure par le thread appelant, puis enregistrées en une fois.
+        Une banque ou un compte en erreur n'interrompt pas les autres (voir stats["erreurs"]).
+        Sans date de début, chaque compte reprend à son repère (voir synchroniser_transactions).
+        """
+        end_date = end_date or datetime.datetime.now()
+        max_workers = max_workers or self.NOMBRE_MAX_REQUETES
+        stats = self._nouvelles_stats()
+        stats["comptes_synchronises"] = 0
+        stats["erreurs"] = []
+        banques = [bank for bank in self.api.api_configs if bank in self.api.tokens]
+        
+        # File bornée : un compte qui reçoit ses pages plus vite qu'elles ne sont intégrées attend
+        messages = queue.Queue(maxsize=2 * max_workers)
+        # Levé si l'intégration s'arrête sur une erreur : les threads cessent d'attendre la file
+        arret = Event()
+        
+        def envoyer(message):
+            """Dépose un message dans la file ; retourne False si la synchronisation est arrêtée"""
+            while not arret.is_set():
+                try:
+                    messages.put(message, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def lister_comptes(bank):
+            try:
+                envoyer(("comptes", bank, None, self.api.get_accounts(bank).get("accounts", [])))
+            except Exception as e:
+                envoyer(("erreur", bank, None, e))
+        
+        def recuperer_transactions(bank, account_id):
+            try:
+                debut = self._debut_synchronisation(bank, account_id, start_date)
+                for page in self.api.iter_transactions(bank, account_id, debut, end_date):
+                    if not envoyer(("page", bank, account_id, page)):
+                        return
+                envoyer(("fin", bank, account_id, debut))
+            except Exception as e:
+                envoyer(("erreur", bank, account_id, e))
+        
+        dates_max = {}  # Dernière date d'opération reçue, par compte
+        occurrences = {}  # Rangs des transactions sans référence, par compte
+        comptes_en_echec = set()  # Comptes dont une page n'a pas pu être intégrée : repère inchangé
+        with self.verrou:
+            self.charger_transactions_importees()
+            self.charger_reperes()
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    try:
+                        for bank in banques:
+                            executor.submit(lister_comptes, bank)
+                        taches = len(banques)
+                        
+                        while taches:
+                            nature, bank, account_id, contenu = messages.get()
+                            if nature == "page":
+                                dates_max[(bank, account_id)] = max(
+                                    [dates_max.get((bank, account_id), "")] + [t.get("date", "") for t in contenu])
+                                try:
+                                    self._integrer_transactions(
+                                        contenu, stats, occurrences.setdefault((bank, account_id), {}))
+                                except Exception as e:
+                                    comptes_en_echec.add((bank, account_id))
+                                    stats["erreurs"].append(f"{bank} ({account_id}): {e}")
+                                continue
+                        
+                            taches -= 1
+                            if nature == "comptes":
+                                # Chaque liste de comptes reçue lance la récupération de leurs transactions
+                                for account in contenu:
+                                    executor.submit(recuperer_transactions, bank, account["id"])
+                                    taches += 1
+                            elif nature == "fin":
+                                if (bank, account_id) in comptes_en_echec:
+                                    continue
+                                stats["comptes_synchronises"] += 1
+                                self._avancer_repere(bank, account_id, contenu,
+                                                     dates_max.get((bank, account_id)) or None)
+                            else:
+                                compte = f" ({account_id})" if account_id is not None else ""
+                                stats["erreurs"].append(f"{bank}{compte}: {contenu}")
+                    except BaseException:
+                        # Sans arrêt, la sortie du pool attendrait des threads bloqués sur la file pleine
+                        arret.set()
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        raise
+            finally:
+                self.gestionnaire.synchroniser_disque()
+                self.sauvegarder_transactions_importees()
+                self.sauvegarder_reperes()
+        
+        return stats
+    
+    def charger_reperes(self):
+        """Charge les repères de synchronisation des comptes"""
+        try:
+            with open(self.fichier_reperes, "r", encoding="utf-8") as f:
+                self.reperes = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.reperes = {}
+    
+    def sauvegarder_reperes(self):
+        """Sauvegarde les repères de synchronisation des comptes (fichier temporaire puis remplacement)"""
+        try:
+            fichier_temporaire = self.fichier_reperes + ".tmp"
+            with open(fichier_temporaire, "w", encoding="utf-8") as f:
+                json.dump(self.reperes, f, indent=4)
+            os.replace(fichier_temporaire, self.fichier_reperes)
         except Exception as e:
-            traceback.print_exc()
-            raise APISyncException(f"Erreur lors de la synchronisation: {str(e)}")
+            print(f"Erreur lors de l'enregistrement des repères de synchronisation: {e}")
     
-    def _transaction_existe(self, transaction_id):
-        """Vérifie si une transaction a déjà été importée"""
+    def _debut_synchronisation(self, bank, account_id, start_date=None):
+        """
+        Retourne la date de début d'une synchronisation : la date demandée, sinon le repère
+        du compte moins le chevauchement, sinon un mois avant aujourd'hui.
+        """
+        if start_date:
+            return start_date
+        
+        repere = self.reperes.get(bank, {}).get(str(account_id))
+        if not repere:
+            return datetime.datetime.now() - datetime.timedelta(days=30)
+        
+        return (datetime.datetime.strptime(repere["date"], "%Y-%m-%d")
+                - datetime.timedelta(days=self.chevauchement_jours))
+    
+    def _avancer_repere(self, bank, account_id, debut, date_max):
+        """
+        Avance le repère d'un compte après une synchronisation complète.
+        Le repère n'avance que si la période synchronisée le rejoint : une synchronisation
+        commençant après le repère laisserait un trou non synchronisé.
+        """
+        if not date_max:
+            return
+        comptes = self.reperes.setdefault(bank, {})
+        repere = comptes.get(str(account_id))
+        if repere:
+            if debut.strftime("%Y-%m-%d") > repere["date"] or date_max <= repere["date"]:
+                return
+        comptes[str(account_id)] = {"date": date_max}
+    
+    @staticmethod
+    def _nouvelles_stats():
+        """Retourne des compteurs de synchronisation à zéro"""
+        return {
+            "revenus_ajoutes": 0,
+            "depenses_ajoutees": 0,
+            "transactions_ignorees": 0
+        }
+    
+    @staticmethod
+    def _identifiant_transaction(transaction, occurrence=0):
+        """
+        Identifiant d'une transaction sans référence bancaire : empreinte de la date, du montant
+        tel que reçu et du libellé (format des IDs déjà enregistrés), suivie du rang pour les
+        transactions identiques suivantes du compte
+        """
+        cle = f"{transaction['date']}_{transaction['amount']}_{transaction['description']}"
+        if occurrence:
+            cle = f"{cle}_{occurrence}"
+        return hashlib.md5(cle.encode()).hexdigest()
+    
+    def _integrer_transactions(self, transactions, stats, occurrences=None):
+        """
+        Ajoute au gestionnaire, en un seul lot, les transactions bancaires pas encore importées.
+        `occurrences` compte les transactions sans référence déjà vues pour le compte : le passer
+        d'une page à l'autre distingue les transactions identiques réparties sur plusieurs pages.
+        """
+        from app.finance.models.depense import Depense
+        from app.finance.models.revenu import Revenu
+        
+        # Catégories devinées par lot, une fois par libellé distinct de la page
+        categories = {}
+        for transaction_type in ("DEBIT", "CREDIT"):
+            libelles = list({t["description"]: None for t in transactions if t["type"] == transaction_type})
+            categories[transaction_type] = dict(zip(libelles, self.guess_categories(transaction_type, libelles)))
+        
+        lot = []
+        ids_lot = {}  # IDs de la page, dans l'ordre (dictionnaire servant d'ensemble ordonné)
+        if occurrences is None:
+            occurrences = {}
+        for transaction in transactions:
+            # Convertir la date
+            date_transaction = datetime.datetime.strptime(transaction["date"], "%Y-%m-%d").date()
+            
+            # Vérifier si la transaction est déjà enregistrée (basé sur une référence unique)
+            # On utilise la référence fournie par la banque, sinon un hash des données de la
+            # transaction (les transactions identiques du compte sont distinguées par leur rang)
+            transaction_id = transaction.get("id")
+            if not transaction_id:
+                cle = (transaction["date"], transaction["amount"], transaction["description"])
+                occurrence = occurrences.get(cle, 0)
+                occurrences[cle] = occurrence + 1
+                transaction_id = self._identifiant_transaction(transaction, occurrence)
+            
+            # Vérifier si cette transaction existe déjà dans notre système
+            if self._transaction_existe(transaction_id) or transaction_id in ids_lot:
+                stats["transactions_ignorees"] += 1
+                continue
+            ids_lot[transaction_id] = None
+            
+            # Traiter selon le type (débit ou crédit)
+            if transaction["type"] == "DEBIT":
+                # C'est une dépense
+                montant = abs(float(transaction["amount"]))
+                categorie = categories["DEBIT"][transaction["description"]]
+                
+                # Créer la dépense (le libellé, conservé en note, sert à l'apprentissage)
+                lot.append(Depense(
+                    montant=montant,
+                    categorie=categorie,
+                    date=date_transaction,
+                    notes=transaction["description"],
+                    id_transaction=transaction_id
+                ))
+                
+            elif transaction["type"] == "CREDIT":
+                # C'est un revenu
+                montant = float(transaction["amount"])
+                source = categories["CREDIT"][transaction["description"]]
+                
+                # Créer le revenu
+                lot.append(Revenu(
+                    montant=montant,
+                    source=source,
+                    date=date_transaction,
+                    notes=transaction["description"],
+                    id_transaction=transaction_id
+                ))
+        
+        # Une seule écriture pour la page ; les IDs ne sont enregistrés qu'une fois le lot importé
+        importes = self.gestionnaire.importer_lot(lot)
+        stats["depenses_ajoutees"] += importes["depenses"]
+        stats["revenus_ajoutes"] += importes["revenus"]
+        
+        # Enregistrer les IDs des transactions pour éviter les doublons lors des prochaines synchros
+        for transaction_id in ids_lot:
+            self._enregistrer_transaction_id(transaction_id)
+    
+    def charger_transactions_importees(self):
+        """Charge les IDs des transactions déjà importées dans un ensemble"""
         try:
-            with open("transactions_importees.json", "r") as f:
-                transactions_importees = json.load(f)
-                return transaction_id in transactions_importees
+            with open(self.fichier_transactions_importees, "r") as f:
+                self.transactions_importees = set(json.load(f))
         except (FileNotFoundError, json.JSONDecodeError):
-            return False
+            self.transactions_importees = set()
+        self.nouvelles_transactions_importees = []
     
-    def _enregistrer_transaction_id(self, transaction_id):
-        """Enregistre l'ID d'une transaction importée"""
+    def sauvegarder_transactions_importees(self):
+        """Ajoute au fichier, en une seule écriture, les IDs importés depuis le dernier chargement"""
+        if not self.nouvelles_transactions_importees:
+            return
         try:
             try:
-                with open("transactions_importees.json", "r") as f:
+                with open(self.fichier_transactions_importees, "r") as f:
                     transactions_importees = json.load(f)
             except (FileNotFoundError, json.JSONDecodeError):
                 transactions_importees = []
             
-            transactions_importees.append(transaction_id)
+            transactions_importees.extend(self.nouvelles_transactions_importees)
             
-            with open("transactions_importees.json", "w") as f:
+            # Écriture dans un fichier temporaire puis remplacement, pour ne jamais tronquer l'historique
+            fichier_temporaire = self.fichier_transactions_importees + ".tmp"
+            with open(fichier_temporaire, "w") as f:
                 json.dump(transactions_importees, f)
+            os.replace(fichier_temporaire, self.fichier_transactions_importees)
+            self.nouvelles_transactions_importees = []
         except Exception as e:
-            print(f"Erreur lors de l'enregistrement de l'ID de transaction: {e}")
+            print(f"Erreur lors de l'enregistrement des IDs de transaction: {e}")
+    
+    def _transaction_existe(self, transaction_id):
+        """Vérifie si une transaction a déjà été importée"""
+        return transaction_id in self.transactions_importees
+    
+    def _enregistrer_transaction_id(self, transaction_id):
+        """Enregistre l'ID d'une transaction importée (écrit sur disque en fin de synchronisation)"""
+        self.transactions_importees.add(transaction_id)
+        self.nouvelles_transactions_importees.append(transaction_id)
 
 
 class IntegrationBancaireUI:
@@ -391,6 +769,7 @@ class IntegrationBancaireUI:
         self.gestionnaire = gestionnaire_financier
         self.api = ConnexionAPISingleton()
         self.synchro = SynchronisationBancaire(gestionnaire_financier)
+        self.pont_async = None  # Boucle asyncio de la synchronisation globale, créée au besoin
     
     def afficher_menu_integration(self):
         """Affiche le menu principal d'intégration bancaire"""
@@ -443,6 +822,9 @@ class IntegrationBancaireUI:
         tk.Button(action_frame, text="Voir historique imports", 
                 command=self.afficher_historique_imports, bg="#ccffcc", width=20).pack(side=tk.LEFT, padx=5)
         
+        tk.Button(action_frame, text="Tout synchroniser", 
+                command=lambda: self.demarrer_synchronisation_globale(fenetre), bg="#C1F2B0", width=20).pack(side=tk.LEFT, padx=5)
+        
         # Bouton fermer
         tk.Button(fenetre, text="Fermer", command=fenetre.destroy, width=10).pack(pady=10)
     
@@ -554,6 +936,34 @@ class IntegrationBancaireUI:
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors de la synchronisation: {str(e)}")
     
+    def demarrer_synchronisation_globale(self, fenetre):
+        """Synchronise tous les comptes des banques authentifiées, en arrière-plan"""
+        if not any(bank in self.api.tokens for bank in self.api.api_configs):
+            messagebox.showinfo("Information", "Aucune banque authentifiée. Synchronisez d'abord chaque banque une fois.")
+            return
+        
+        # Import local : le client asynchrone dépend de ce module
+        from app.finance.integrations.api_bancaire_async import (ConnexionAPIAsync, PontAsyncTk,
+                                                                 synchroniser_tout_async)
+        
+        if self.pont_async is None:
+            self.pont_async = PontAsyncTk(self.parent)
+        progress_window = self._afficher_progression()
+        
+        async def synchroniser():
+            async with ConnexionAPIAsync(self.api) as client:
+                return await synchroniser_tout_async(self.synchro, client)
+        
+        def terminer(stats):
+            progress_window.destroy()
+            self._afficher_resultats_synchronisation(stats, fenetre)
+        
+        def echouer(e):
+            progress_window.destroy()
+            messagebox.showerror("Erreur", f"Erreur lors de la synchronisation: {str(e)}")
+        
+        self.pont_async.executer(synchroniser(), terminer, echouer)
+    
     def demarrer_authentification(self, bank):
         """Démarre le processus d'authentification OAuth2"""
         try:
@@ -624,7 +1034,7 @@ class IntegrationBancaireUI:
             # Afficher la fenêtre de sélection
             fenetre = tk.Toplevel(self.parent)
             fenetre.title("Synchronisation des transactions")
-            fenetre.geometry("500x400")
+            fenetre.geometry("500x430")
             fenetre.grab_set()
             
             tk.Label(fenetre, text="Synchronisation des transactions", 
@@ -655,6 +1065,7 @@ class IntegrationBancaireUI:
             
             # Option pour choisir une période prédéfinie
             periode_options = [
+                "Depuis la dernière synchronisation",
                 "Dernier mois",
                 "3 derniers mois",
                 "6 derniers mois",
@@ -711,7 +1122,11 @@ class IntegrationBancaireUI:
                 periode = periode_var.get()
                 today = datetime.datetime.now()
                 
-                if periode == "Dernier mois":
+                if periode == "Depuis la dernière synchronisation":
+                    # Dates déterminées par le repère du compte
+                    debut = None
+                    fin = None
+                elif periode == "Dernier mois":
                     debut = today - datetime.timedelta(days=30)
                     fin = today
                 elif periode == "3 derniers mois":
@@ -797,6 +1212,14 @@ class IntegrationBancaireUI:
         tk.Label(stats_frame, text="Transactions ignorées:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
         tk.Label(stats_frame, text=str(stats["transactions_ignorees"])).grid(row=2, column=1, sticky=tk.W, padx=5, pady=2)
         
+        # Synchronisation globale : comptes traités et erreurs éventuelles
+        if "comptes_synchronises" in stats:
+            tk.Label(stats_frame, text="Comptes synchronisés:").grid(row=3, column=0, sticky=tk.W, padx=5, pady=2)
+            tk.Label(stats_frame, text=str(stats["comptes_synchronises"])).grid(row=3, column=1, sticky=tk.W, padx=5, pady=2)
+            resultat.geometry(f"400x{260 + 20 * len(stats['erreurs'])}")
+            for erreur in stats["erreurs"]:
+                tk.Label(resultat, text=erreur, fg="red", wraplength=380, justify=tk.LEFT).pack(anchor=tk.W, padx=20)
+        
         tk.Button(resultat, text="Fermer", command=resultat.destroy, width=10).pack(pady=10)
     
     def afficher_gestion_categories(self):
@@ -912,6 +1335,18 @@ class IntegrationBancaireUI:
             
             tk.Button(boutons_frame, text="Supprimer", command=supprimer_mapping, 
                     bg="#FFC1B6", width=10).pack(side=tk.LEFT, padx=5)
+            
+            tk.Button(boutons_frame, text="Apprendre des transactions", command=entrainer_modele,
+                    width=24).pack(side=tk.RIGHT, padx=5)
+        
+        def entrainer_modele():
+            try:
+                exemples = self.synchro.entrainer_modele_categories()
+                messagebox.showinfo("Modèle de catégories",
+                                    f"Modèle entraîné sur {exemples['depenses']} dépenses et {exemples['revenus']} revenus.\n"
+                                    "Il est utilisé pour les libellés sans mapping.")
+            except Exception as e:
+                messagebox.showerror("Erreur", f"Erreur lors de l'entraînement du modèle: {str(e)}")
         
         # Créer le contenu des onglets
         creer_contenu_onglet(tab_depenses, "DEBIT")
@@ -925,7 +1360,7 @@ class IntegrationBancaireUI:
         try:
             # Charger l'historique des transactions importées
             try:
-                with open("transactions_importees.json", "r") as f:
+                with open(self.synchro.fichier_transactions_importees, "r") as f:
                     transactions_importees = json.load(f)
             except (FileNotFoundError, json.JSONDecodeError):
                 transactions_importees = []
@@ -944,7 +1379,7 @@ class IntegrationBancaireUI:
             # Option pour réinitialiser l'historique
             def reinitialiser():
                 if messagebox.askyesno("Confirmation", "Réinitialiser l'historique des importations ? \n\nCela pourrait causer des doublons lors des prochaines synchronisations."):
-                    with open("transactions_importees.json", "w") as f:
+                    with open(self.synchro.fichier_transactions_importees, "w") as f:
                         json.dump([], f)
                     messagebox.showinfo("Succès", "Historique réinitialisé.")
                     fenetre.destroy()
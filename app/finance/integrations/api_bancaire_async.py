@@ -0,0 +1,362 @@
+"""
+Client asynchrone des API bancaires.
+Ce module définit ConnexionAPIAsync, équivalent asyncio de ConnexionAPISingleton
+(comptes, transactions, tokens), la synchronisation globale asynchrone, un pont pour
+attendre des coroutines depuis Tkinter et une commande de synchronisation sans interface :
+
+    python -m app.finance.integrations.api_bancaire_async --jeton monabanq=JETON
+"""
+
+import argparse
+import asyncio
+import datetime
+import email.utils
+import threading
+import time
+from urllib.parse import urlparse
+
+try:
+    import httpx
+except ImportError:  # httpx est optionnel : les requêtes passent alors par des threads
+    httpx = None
+
+from app.finance.integrations.api_bancaire import ConnexionAPISingleton, APISyncException
+
+HTTPX_DISPONIBLE = httpx is not None
+
+class ConnexionAPIAsync:
+    """
+    Client asynchrone des API bancaires, partageant configurations et tokens avec ConnexionAPISingleton.
+    Les requêtes vers un même hôte sont limitées à `max_requetes_par_hote` simultanées.
+    Avec httpx, toutes les requêtes sont multiplexées sur le thread de la boucle asyncio ;
+    sans httpx, chacune passe par la session bloquante de la banque dans un thread.
+    """
+    MAX_REQUETES_PAR_HOTE = 4
+
+    def __init__(self, api=None, max_requetes_par_hote=None):
+        self.api = api or ConnexionAPISingleton()
+        self.api_configs = self.api.api_configs
+        self.tokens = self.api.tokens
+        self.max_requetes_par_hote = max_requetes_par_hote or self.MAX_REQUETES_PAR_HOTE
+        self._client = None
+        self._semaphores = {}  # Limite de requêtes simultanées, par hôte
+        self._verrous_tokens = {}  # Un seul rafraîchissement à la fois, par banque
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Ferme les connexions HTTP ouvertes"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def exchange_code_for_token(self, bank, code):
+        """Échange un code d'autorisation contre un token d'accès"""
+        config = self._config(bank)
+        if not config["client_id"] or not config["client_secret"]:
+            raise ValueError(f"Client ID ou Client Secret non configurés pour {bank}")
+
+        data = {
+            "grant_type": "authorization_code",
+            "code": code,
+            "redirect_uri": "http://localhost:8080/callback",
+            "client_id": config["client_id"],
+            "client_secret": config["client_secret"]
+        }
+        response = await self._requete(bank, "POST", config["token_url"], data=data)
+
+        if response.status_code != 200:
+            raise APISyncException(f"Erreur lors de l'échange du code: {response.text}")
+
+        token_data = response.json()
+        token_data["timestamp"] = time.time()
+        self.tokens[bank] = token_data
+        return token_data
+
+    async def refresh_token_if_needed(self, bank):
+        """Rafraîchit le token si nécessaire"""
+        if bank not in self.tokens:
+            raise ValueError(f"Aucun token disponible pour {bank}")
+
+        verrou = self._verrous_tokens.setdefault(bank, asyncio.Lock())
+        async with verrou:
+            token_data = self.tokens[bank]
+
+            # Vérifier si le token a expiré (avec une marge de 5 minutes)
+            if time.time() <= token_data["timestamp"] + token_data.get("expires_in", 3600) - 300:
+                return token_data
+
+            config = self._config(bank)
+            data = {
+                "grant_type": "refresh_token",
+                "refresh_token": token_data["refresh_token"],
+                "client_id": config["client_id"],
+                "client_secret": config["client_secret"]
+            }
+            response = await self._requete(bank, "POST", config["token_url"], data=data)
+
+            if response.status_code != 200:
+                raise APISyncException(f"Erreur lors du rafraîchissement du token: {response.text}")
+
+            new_token_data = response.json()
+            new_token_data["timestamp"] = time.time()
+            self.tokens[bank] = new_token_data
+            return new_token_data
+
+    async def get_accounts(self, bank):
+        """Récupère la liste des comptes bancaires"""
+        config = self._config(bank)
+        response = await self._requete(bank, "GET", f"{config['base_url']}{config['accounts_url']}",
+                                       headers=await self._entetes(bank))
+
+        if response.status_code != 200:
+            raise APISyncException(f"Erreur lors de la récupération des comptes: {response.text}")
+
+        return response.json()
+
+    async def get_transactions(self, bank, account_id, from_date=None, to_date=None):
+        """Récupère toutes les transactions d'un compte bancaire (toutes les pages)"""
+        transactions = []
+        async for page in self.iter_transactions(bank, account_id, from_date, to_date):
+            transactions.extend(page)
+        return {"transactions": transactions}
+
+    async def iter_transactions(self, bank, account_id, from_date=None, to_date=None):
+        """
+        Parcourt les transactions d'un compte bancaire page par page (générateur asynchrone).
+        Même pagination et mêmes paramètres que ConnexionAPISingleton.iter_transactions.
+        """
+        config = self._config(bank)
+
+        params = {}
+        if from_date:
+            params["dateFrom"] = from_date.strftime("%Y-%m-%d")
+        if to_date:
+            params["dateTo"] = to_date.strftime("%Y-%m-%d")
+
+        url = f"{config['base_url']}{config['transactions_url'].format(account_id=account_id)}"
+        pages_vues = set()
+        while True:
+            response = await self._requete(bank, "GET", url, params=params, headers=await self._entetes(bank))
+
+            if response.status_code != 200:
+                raise APISyncException(f"Erreur lors de la récupération des transactions: {response.text}")
+
+            data = response.json()
+            page = data.get("transactions", [])
+            if page:
+                yield page
+
+            suivante = ConnexionAPISingleton._page_suivante(response, data, url, params)
+            # Arrêt sur page vide ou si la banque renvoie une page déjà lue
+            if suivante is None or not page:
+                return
+            cle = (suivante[0], tuple(sorted(suivante[1].items())))
+            if cle in pages_vues:
+                return
+            pages_vues.add(cle)
+            url, params = suivante
+
+    def _config(self, bank):
+        """Retourne la configuration d'une banque"""
+        if bank not in self.api_configs:
+            raise ValueError(f"Banque non supportée: {bank}")
+        return self.api_configs[bank]
+
+    async def _entetes(self, bank):
+        """Retourne les en-têtes d'authentification d'une requête (token rafraîchi si besoin)"""
+        token_data = await self.refresh_token_if_needed(bank)
+        return {
+            "Authorization": f"Bearer {token_data['access_token']}",
+            "Content-Type": "application/json"
+        }
+
+    async def _requete(self, bank, methode, url, **kwargs):
+        """
+        Exécute une requête HTTP, en limitant les requêtes simultanées vers son hôte.
+        Mêmes nouvelles tentatives que les sessions de ConnexionAPISingleton : erreurs de
+        connexion, 429 et 5xx en GET seulement, attente exponentielle et en-tête Retry-After
+        respecté dans la limite de DELAI_MAX_RETRY_AFTER.
+        """
+        hote = urlparse(url).netloc
+        semaphore = self._semaphores.setdefault(hote, asyncio.Semaphore(self.max_requetes_par_hote))
+        async with semaphore:
+            if httpx is None:
+                session = self.api.get_session(bank)
+                return await asyncio.to_thread(session.request, methode, url,
+                                               timeout=self.api.DELAI_REQUETE, **kwargs)
+
+            if self._client is None:
+                self._client = httpx.AsyncClient(timeout=self.api.DELAI_REQUETE)
+
+            derniere_tentative = self.api.NOMBRE_TENTATIVES
+            for tentative in range(derniere_tentative + 1):
+                try:
+                    response = await self._client.request(methode, url, **kwargs)
+                except (httpx.ConnectError, httpx.ConnectTimeout):
+                    # La requête n'a pas été envoyée : elle peut être rejouée
+                    if tentative == derniere_tentative:
+                        raise
+                    await asyncio.sleep(self._attente(tentative))
+                    continue
+
+                if (response.status_code not in self.api.CODES_A_REESSAYER
+                        or methode not in self.api.METHODES_A_REESSAYER or tentative == derniere_tentative):
+                    return response
+                await asyncio.sleep(self._attente(tentative, response.headers.get("Retry-After")))
+
+    def _attente(self, tentative, retry_after=None):
+        """Retourne l'attente avant une nouvelle tentative, en secondes"""
+        attente = self.api.FACTEUR_ATTENTE * (2 ** tentative)
+        if retry_after:
+            try:
+                demandee = float(retry_after)
+            except ValueError:
+                # Retry-After peut aussi être une date HTTP
+                date = email.utils.parsedate_to_datetime(retry_after)
+                demandee = (date - datetime.datetime.now(date.tzinfo)).total_seconds()
+            attente = max(attente, min(demandee, self.api.DELAI_MAX_RETRY_AFTER))
+        return attente
+
+async def synchroniser_tout_async(synchro, client, start_date=None, end_date=None):
+    """
+    Équivalent asynchrone de SynchronisationBancaire.synchroniser_tout : tous les comptes
+    de toutes les banques authentifiées sont interrogés simultanément par `client`, et
+    les pages reçues sont intégrées par le thread de la boucle asyncio.
+    """
+    end_date = end_date or datetime.datetime.now()
+    stats = synchro._nouvelles_stats()
+    stats["comptes_synchronises"] = 0
+    stats["erreurs"] = []
+    banques = [bank for bank in client.api_configs if bank in client.tokens]
+
+    async def synchroniser_compte(bank, account_id):
+        debut = synchro._debut_synchronisation(bank, account_id, start_date)
+        date_max = ""
+        occurrences = {}  # Rangs des transactions sans référence, sur tout le compte
+        async for page in client.iter_transactions(bank, account_id, debut, end_date):
+            date_max = max([date_max] + [t.get("date", "") for t in page])
+            synchro._integrer_transactions(page, stats, occurrences)
+        stats["comptes_synchronises"] += 1
+        synchro._avancer_repere(bank, account_id, debut, date_max or None)
+
+    async def synchroniser_banque(bank):
+        comptes = (await client.get_accounts(bank)).get("accounts", [])
+        resultats = await asyncio.gather(*(synchroniser_compte(bank, account["id"]) for account in comptes),
+                                         return_exceptions=True)
+        for account, resultat in zip(comptes, resultats):
+            if isinstance(resultat, Exception):
+                stats["erreurs"].append(f"{bank} ({account['id']}): {resultat}")
+
+    with synchro.verrou:
+        synchro.charger_transactions_importees()
+        synchro.charger_reperes()
+        try:
+            resultats = await asyncio.gather(*(synchroniser_banque(bank) for bank in banques),
+                                             return_exceptions=True)
+            for bank, resultat in zip(banques, resultats):
+                if isinstance(resultat, Exception):
+                    stats["erreurs"].append(f"{bank}: {resultat}")
+        finally:
+            synchro.gestionnaire.synchroniser_disque()
+            synchro.sauvegarder_transactions_importees()
+            synchro.sauvegarder_reperes()
+
+    return stats
+
+class PontAsyncTk:
+    """
+    Exécute des coroutines dans une boucle asyncio dédiée (un seul thread) et transmet
+    leur résultat à Tkinter, sans bloquer la boucle principale de l'interface.
+    Le résultat est relevé par `widget.after`, depuis le thread de l'interface.
+    """
+    INTERVALLE_MS = 50
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.boucle = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.boucle.run_forever, daemon=True)
+        self._thread.start()
+
+    def executer(self, coroutine, rappel=None, rappel_erreur=None):
+        """Lance une coroutine ; `rappel(resultat)` ou `rappel_erreur(exception)` est appelé par Tkinter"""
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.boucle)
+        self._surveiller(future, rappel, rappel_erreur)
+        return future
+
+    def arreter(self):
+        """Arrête la boucle asyncio"""
+        self.boucle.call_soon_threadsafe(self.boucle.stop)
+
+    def _surveiller(self, future, rappel, rappel_erreur):
+        """Attend, sans bloquer Tkinter, la fin d'une coroutine"""
+        if not future.done():
+            self.widget.after(self.INTERVALLE_MS, self._surveiller, future, rappel, rappel_erreur)
+            return
+        try:
+            resultat = future.result()
+        except Exception as e:
+            if rappel_erreur is not None:
+                rappel_erreur(e)
+            else:
+                print(f"Erreur dans une tâche asynchrone: {e}")
+            return
+        if rappel is not None:
+            rappel(resultat)
+
+def main(argv=None):
+    """Synchronise tous les comptes sans interface graphique"""
+    parser = argparse.ArgumentParser(description="Synchronisation bancaire sans interface graphique.")
+    parser.add_argument("--jeton", action="append", default=[], metavar="BANQUE=JETON",
+                        help="Token d'accès d'une banque (option répétable)")
+    parser.add_argument("--depuis", help="Date de début AAAA-MM-JJ (par défaut : repère de chaque compte)")
+    parser.add_argument("--jusqua", help="Date de fin AAAA-MM-JJ (par défaut : aujourd'hui)")
+    parser.add_argument("--max-par-hote", type=int, help="Requêtes simultanées par hôte")
+    args = parser.parse_args(argv)
+
+    # Imports locaux : inutiles pour utiliser le client seul
+    from app.core.stockage_sqlite import ouvrir_stockage_configure
+    from app.finance.controllers.gestionnaire_financier import GestionnaireFinancier
+    from app.finance.integrations.api_bancaire import SynchronisationBancaire
+
+    api = ConnexionAPISingleton()
+    for option in args.jeton:
+        bank, _, jeton = option.partition("=")
+        if bank not in api.api_configs or not jeton:
+            parser.error(f"Token invalide: {option}")
+        api.tokens[bank] = {"access_token": jeton, "timestamp": time.time()}
+    if not api.tokens:
+        parser.error("Aucune banque authentifiée : utilisez --jeton BANQUE=JETON.")
+
+    debut = datetime.datetime.strptime(args.depuis, "%Y-%m-%d") if args.depuis else None
+    fin = datetime.datetime.strptime(args.jusqua, "%Y-%m-%d") if args.jusqua else None
+
+    stockage = ouvrir_stockage_configure()
+    gestionnaire = GestionnaireFinancier(stockage=stockage)
+    synchro = SynchronisationBancaire(gestionnaire)
+
+    async def synchroniser():
+        async with ConnexionAPIAsync(api, args.max_par_hote) as client:
+            return await synchroniser_tout_async(synchro, client, debut, fin)
+
+    try:
+        stats = asyncio.run(synchroniser())
+    finally:
+        gestionnaire.fermer()
+        if stockage is not None:
+            stockage.fermer()
+
+    print(f"Comptes synchronisés: {stats['comptes_synchronises']}")
+    print(f"Dépenses ajoutées: {stats['depenses_ajoutees']}")
+    print(f"Revenus ajoutés: {stats['revenus_ajoutes']}")
+    print(f"Transactions ignorées: {stats['transactions_ignorees']}")
+    for erreur in stats["erreurs"]:
+        print(f"Erreur: {erreur}")
+    return 1 if stats["erreurs"] else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
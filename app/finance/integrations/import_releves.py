@@ -0,0 +1,426 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Import de relevés bancaires (CSV, OFX et QIF).
+Ce module définit les lecteurs de relevés, qui parcourent un fichier au fil de l'eau
+sans le charger en mémoire, et la classe ImportateurReleves qui catégorise,
+dédoublonne et transmet les opérations au gestionnaire financier par lots.
+"""
+
+import codecs
+import csv
+import datetime
+import functools
+import hashlib
+import html
+import math
+import os
+import re
+import unicodedata
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional
+
+from app.finance.models.depense import Depense
+from app.finance.models.revenu import Revenu
+
+TAILLE_BLOC = 64 * 1024  # Octets lus à la fois dans les fichiers OFX
+
+# Noms de colonnes reconnus dans les CSV (sans accents ni majuscules)
+COLONNES_CSV = {
+    "date": ("date", "date operation", "date d'operation", "date de l'operation", "date comptable",
+             "date valeur", "booking date"),
+    "libelle": ("libelle", "libelle operation", "libelle de l'operation", "description", "label",
+                "intitule", "memo", "nom"),
+    "montant": ("montant", "amount", "montant (eur)", "montant eur", "somme"),
+    "debit": ("debit", "debit (eur)", "debit eur"),
+    "credit": ("credit", "credit (eur)", "credit eur"),
+    "id": ("id", "id_transaction", "reference", "ref", "fitid", "numero")
+}
+
+FORMATS_DATE = ("%Y-%m-%d", "%d/%m/%Y", "%d/%m/%y", "%d-%m-%Y", "%d.%m.%Y")
+
+# Sections QIF contenant des opérations (les autres : catégories, comptes, options...)
+SECTIONS_QIF = ("bank", "cash", "ccard", "oth a", "oth l")
+
+_BALISE_OFX = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+def _decoder(ligne: bytes) -> str:
+    """Décode une ligne de relevé : UTF-8, ou Windows-1252 pour les exports plus anciens."""
+    try:
+        return ligne.decode("utf-8")
+    except UnicodeDecodeError:
+        return ligne.decode("cp1252", errors="replace")
+
+def _lignes(fichier: BinaryIO) -> Iterator[str]:
+    """Parcourt les lignes décodées d'un fichier binaire, sans marque d'ordre des octets."""
+    premiere = True
+    for ligne in fichier:
+        texte = _decoder(ligne)
+        if premiere:
+            texte = texte.lstrip("\ufeff")
+            premiere = False
+        yield texte
+
+def _normaliser(nom: str) -> str:
+    """Retourne un nom de colonne sans accents, en minuscules et sans espaces superflus."""
+    nom = unicodedata.normalize("NFKD", nom).encode("ascii", "ignore").decode()
+    return " ".join(nom.lower().replace("’", "'").split())
+
+def convertir_montant(texte: str) -> float:
+    """
+    Convertit un montant de relevé en nombre (formats français et anglais).
+
+    Args:
+        texte (str): Montant, par exemple "-1 234,56", "1.234,56 €" ou "-1,234.56".
+
+    Returns:
+        float: Montant.
+
+    Raises:
+        ValueError: Si le texte n'est pas un montant fini ("nan" et "inf" sont refusés).
+    """
+    nettoye = re.sub(r"[\s\u00a0\u202f€$+]", "", texte)
+    if "," in nettoye and "." in nettoye:
+        # Le dernier séparateur est le séparateur décimal
+        milliers = "." if nettoye.rfind(",") > nettoye.rfind(".") else ","
+        nettoye = nettoye.replace(milliers, "")
+    montant = float(nettoye.replace(",", "."))
+    if not math.isfinite(montant):
+        raise ValueError(f"Montant invalide: {texte}")
+    return montant
+
+def identifiant_operation(date: datetime.date, montant: float, libelle: str, occurrence: int = 0) -> str:
+    """
+    Calcule l'identifiant d'une opération sans référence bancaire.
+    Le montant est formaté avec deux décimales pour qu'une même opération ait le même
+    identifiant quel que soit le format du relevé.
+
+    Args:
+        date (datetime.date): Date de l'opération.
+        montant (float): Montant signé (négatif pour un débit).
+        libelle (str): Libellé de l'opération.
+        occurrence (int, optional): Rang de l'opération parmi les opérations identiques
+            (même date, montant et libellé) d'un même relevé. Par défaut: 0.
+
+    Returns:
+        str: Empreinte MD5 hexadécimale.
+    """
+    cle = f"{date:%Y-%m-%d}_{montant:.2f}_{libelle}"
+    if occurrence:
+        cle = f"{cle}_{occurrence}"
+    return hashlib.md5(cle.encode()).hexdigest()
+
+@functools.lru_cache(maxsize=4096)
+def convertir_date(texte: str, formats: tuple = FORMATS_DATE) -> datetime.date:
+    """
+    Convertit une date de relevé (mise en cache : un relevé compte peu de dates distinctes).
+
+    Args:
+        texte (str): Date à convertir.
+        formats (tuple, optional): Formats essayés dans l'ordre. Par défaut: FORMATS_DATE.
+
+    Returns:
+        datetime.date: Date.
+
+    Raises:
+        ValueError: Si aucun format ne correspond.
+    """
+    texte = texte.strip()
+    for format_date in formats:
+        try:
+            return datetime.datetime.strptime(texte, format_date).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Format de date invalide: {texte}")
+
+def lire_csv(fichier: BinaryIO) -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    Lit un relevé CSV ligne par ligne.
+    Le séparateur (";", "," ou tabulation) est déduit de l'en-tête, et les colonnes sont
+    reconnues par leur nom (voir COLONNES_CSV), avec soit un montant signé, soit des
+    colonnes débit et crédit.
+
+    Args:
+        fichier (BinaryIO): Fichier ouvert en mode binaire.
+
+    Yields:
+        Optional[Dict[str, Any]]: Opération (date, montant signé, libellé, id), ou None
+            pour une ligne illisible.
+
+    Raises:
+        ValueError: Si l'en-tête ne contient pas les colonnes nécessaires.
+    """
+    lignes = _lignes(fichier)
+    entete = next(lignes, "")
+    separateur = max(";,\t", key=entete.count)
+    noms = [_normaliser(nom) for nom in next(csv.reader([entete], delimiter=separateur), [])]
+    colonnes = {}
+    for champ, synonymes in COLONNES_CSV.items():
+        for position, nom in enumerate(noms):
+            if nom in synonymes:
+                colonnes[champ] = position
+                break
+    if "date" not in colonnes or "libelle" not in colonnes or (
+            "montant" not in colonnes and "debit" not in colonnes and "credit" not in colonnes):
+        raise ValueError("Colonnes du relevé non reconnues (date, libellé et montant attendus)")
+
+    def valeur(champs, champ):
+        position = colonnes.get(champ)
+        return champs[position].strip() if position is not None and position < len(champs) else ""
+
+    for champs in csv.reader(lignes, delimiter=separateur):
+        if not any(champ.strip() for champ in champs):
+            continue
+        try:
+            if "montant" in colonnes:
+                montant = convertir_montant(valeur(champs, "montant"))
+            else:
+                debit = valeur(champs, "debit")
+                credit = valeur(champs, "credit")
+                montant = (convertir_montant(credit) if credit else 0.0) - (
+                    abs(convertir_montant(debit)) if debit else 0.0)
+            yield {
+                "date": convertir_date(valeur(champs, "date")),
+                "montant": montant,
+                "libelle": valeur(champs, "libelle"),
+                "id": valeur(champs, "id") or None
+            }
+        except ValueError:
+            yield None
+
+def lire_ofx(fichier: BinaryIO) -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    Lit un relevé OFX (1.x SGML ou 2.x XML) par blocs, opération par opération.
+    Les balises sont reconnues même lorsque tout le fichier tient sur une seule ligne.
+
+    Args:
+        fichier (BinaryIO): Fichier ouvert en mode binaire (positionnable).
+
+    Yields:
+        Optional[Dict[str, Any]]: Opération (date, montant signé, libellé, id), ou None
+            pour une opération illisible.
+    """
+    # L'en-tête (OFX 1.x) ou la déclaration XML (OFX 2.x) indique l'encodage
+    entete = fichier.read(4096).upper()
+    encodage = "cp1252" if b"1252" in entete or b"ISO-8859" in entete else "utf-8"
+    decodeur = codecs.getincrementaldecoder(encodage)(errors="replace")
+    fichier.seek(0)
+    bloc = fichier.read(TAILLE_BLOC)
+
+    reste = ""
+    operation = None
+    while True:
+        texte = reste + decodeur.decode(bloc, final=not bloc)
+        # La fin du bloc peut couper une balise ou sa valeur : elle est gardée pour le bloc suivant
+        coupure = texte.rfind("<") if bloc else len(texte)
+        if coupure < 0:
+            coupure = 0
+        reste = texte[coupure:]
+        for fermeture, nom, valeur in _BALISE_OFX.findall(texte[:coupure]):
+            nom = nom.upper()
+            if nom == "STMTTRN":
+                if fermeture and operation is not None:
+                    yield _operation_ofx(operation)
+                operation = None if fermeture else {}
+            elif operation is not None and not fermeture:
+                operation[nom] = html.unescape(valeur.strip())
+        if not bloc:
+            return
+        bloc = fichier.read(TAILLE_BLOC)
+
+def _operation_ofx(champs: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """Convertit les champs d'une balise STMTTRN, ou retourne None s'ils sont illisibles."""
+    try:
+        libelle = champs.get("NAME", "")
+        memo = champs.get("MEMO", "")
+        if memo and memo not in libelle:
+            libelle = f"{libelle} {memo}".strip()
+        return {
+            "date": datetime.datetime.strptime(champs["DTPOSTED"][:8], "%Y%m%d").date(),
+            "montant": convertir_montant(champs["TRNAMT"]),
+            "libelle": libelle,
+            "id": champs.get("FITID") or None
+        }
+    except (KeyError, ValueError):
+        return None
+
+def lire_qif(fichier: BinaryIO) -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    Lit un relevé QIF ligne par ligne.
+    Les dates sont lues jour en premier (exports français), y compris au format 1/02'25.
+
+    Args:
+        fichier (BinaryIO): Fichier ouvert en mode binaire.
+
+    Yields:
+        Optional[Dict[str, Any]]: Opération (date, montant signé, libellé, id), ou None
+            pour une opération illisible.
+    """
+    section_operations = True
+    champs = {}
+    for ligne in _lignes(fichier):
+        ligne = ligne.rstrip("\r\n")
+        if not ligne:
+            continue
+        code, valeur = ligne[0], ligne[1:].strip()
+        if code == "!":
+            entete = _normaliser(valeur)
+            if entete.startswith("type:"):
+                section_operations = entete[5:].strip() in SECTIONS_QIF
+            elif not entete.startswith("option"):
+                section_operations = False
+            champs = {}
+        elif code == "^":
+            if section_operations and champs:
+                yield _operation_qif(champs)
+            champs = {}
+        elif section_operations:
+            champs[code] = valeur
+    if section_operations and champs:
+        yield _operation_qif(champs)
+
+def _operation_qif(champs: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """Convertit les champs d'une opération QIF, ou retourne None s'ils sont illisibles."""
+    try:
+        date = champs["D"].replace("'", "/").replace(" ", "")
+        libelle = champs.get("P", "")
+        memo = champs.get("M", "")
+        if memo and memo not in libelle:
+            libelle = f"{libelle} {memo}".strip()
+        return {
+            "date": convertir_date(date),
+            "montant": convertir_montant(champs.get("T") or champs["U"]),
+            "libelle": libelle,
+            "id": None
+        }
+    except (KeyError, ValueError):
+        return None
+
+LECTEURS = {".csv": lire_csv, ".ofx": lire_ofx, ".qfx": lire_ofx, ".qif": lire_qif}
+
+class ImportateurReleves:
+    """
+    Importe des relevés bancaires dans un gestionnaire financier.
+
+    Le fichier est lu au fil de l'eau et traité par paquets de `taille_lot` opérations :
+    chaque paquet est dédoublonné (par id_transaction), catégorisé (une fois par libellé
+    distinct) puis transmis à GestionnaireFinancier.importer_lot. La mémoire utilisée
+    par la lecture ne dépend donc pas de la taille du fichier (hormis le décompte des
+    opérations sans référence, par date, montant et libellé).
+
+    Attributes:
+        gestionnaire (GestionnaireFinancier): Gestionnaire alimenté.
+        categoriser (Callable[[str, List[str]], List[str]]): Catégorise un lot de libellés
+            d'un type ("DEBIT" ou "CREDIT"), comme SynchronisationBancaire.guess_categories.
+        taille_lot (int): Nombre d'opérations par paquet.
+    """
+
+    def __init__(self, gestionnaire: Any,
+                 categoriser: Optional[Callable[[str, List[str]], List[str]]] = None,
+                 taille_lot: int = 5000):
+        """
+        Initialise l'importateur.
+
+        Args:
+            gestionnaire (GestionnaireFinancier): Gestionnaire à alimenter.
+            categoriser (Optional[Callable[[str, List[str]], List[str]]], optional): Catégorisation
+                d'un lot de libellés. Par défaut: GestionnaireFinancier.deviner_categorie.
+            taille_lot (int, optional): Nombre d'opérations par paquet. Par défaut: 5000.
+        """
+        self.gestionnaire = gestionnaire
+        self.categoriser = categoriser or self._deviner_categories
+        self.taille_lot = taille_lot
+
+    def importer(self, chemin: str, progression: Optional[Callable[[int, int, Dict[str, int]], None]] = None,
+                 annulation: Optional[Any] = None) -> Dict[str, int]:
+        """
+        Importe un relevé (format déduit de l'extension).
+
+        Args:
+            chemin (str): Chemin du relevé (.csv, .ofx, .qfx ou .qif).
+            progression (Optional[Callable[[int, int, Dict[str, int]], None]], optional): Appelée
+                après chaque paquet avec les octets lus, la taille du fichier et les statistiques.
+            annulation (Optional[threading.Event], optional): Arrête l'import après le paquet
+                en cours lorsqu'il est positionné.
+
+        Returns:
+            Dict[str, int]: Statistiques de l'import.
+
+        Raises:
+            ValueError: Si le format n'est pas pris en charge ou si le relevé est illisible.
+        """
+        lecteur = LECTEURS.get(os.path.splitext(chemin)[1].lower())
+        if lecteur is None:
+            raise ValueError(f"Format de relevé non pris en charge: {chemin}")
+
+        stats = {"depenses_ajoutees": 0, "revenus_ajoutes": 0, "transactions_ignorees": 0,
+                 "lignes_invalides": 0}
+        taille = os.path.getsize(chemin)
+        ids_connus = {element.id_transaction for liste in (self.gestionnaire.depenses, self.gestionnaire.revenus)
+                      for element in liste if element.id_transaction}
+        occurrences = {}  # Opérations sans référence déjà lues, par (date, montant, libellé)
+
+        with open(chemin, "rb") as fichier:
+            paquet = []
+            for operation in lecteur(fichier):
+                paquet.append(operation)
+                if len(paquet) < self.taille_lot:
+                    continue
+                self._importer_paquet(paquet, ids_connus, occurrences, stats)
+                paquet = []
+                if progression is not None:
+                    progression(fichier.tell(), taille, stats)
+                if annulation is not None and annulation.is_set():
+                    return stats
+            self._importer_paquet(paquet, ids_connus, occurrences, stats)
+        if progression is not None:
+            progression(taille, taille, stats)
+        return stats
+
+    def _importer_paquet(self, paquet: List[Optional[Dict[str, Any]]], ids_connus: set,
+                         occurrences: Dict[tuple, int], stats: Dict[str, int]) -> None:
+        """
+        Dédoublonne, catégorise et importe un paquet d'opérations.
+        Les opérations sans référence identiques d'un même relevé (deux cafés le même jour)
+        sont distinguées par leur rang dans le relevé, et non confondues.
+        """
+        operations = []
+        for operation in paquet:
+            if operation is None:
+                stats["lignes_invalides"] += 1
+                continue
+            id_transaction = operation["id"]
+            if not id_transaction:
+                cle = (operation["date"], operation["montant"], operation["libelle"])
+                occurrence = occurrences.get(cle, 0)
+                occurrences[cle] = occurrence + 1
+                id_transaction = identifiant_operation(*cle, occurrence)
+            if id_transaction in ids_connus:
+                stats["transactions_ignorees"] += 1
+                continue
+            ids_connus.add(id_transaction)
+            operations.append((id_transaction, operation))
+
+        categories = {}
+        for type_transaction, debit in (("DEBIT", True), ("CREDIT", False)):
+            libelles = list({o["libelle"]: None for _, o in operations if (o["montant"] < 0) == debit})
+            categories[type_transaction] = dict(zip(libelles, self.categoriser(type_transaction, libelles)))
+
+        lot = []
+        for id_transaction, operation in operations:
+            if operation["montant"] < 0:
+                categorie = categories["DEBIT"][operation["libelle"]]
+                lot.append(Depense(-operation["montant"], categorie, operation["date"],
+                                   notes=operation["libelle"], id_transaction=id_transaction))
+            else:
+                source = categories["CREDIT"][operation["libelle"]]
+                lot.append(Revenu(operation["montant"], source, operation["date"],
+                                  notes=operation["libelle"], id_transaction=id_transaction))
+        importes = self.gestionnaire.importer_lot(lot)
+        stats["depenses_ajoutees"] += importes["depenses"]
+        stats["revenus_ajoutes"] += importes["revenus"]
+
+    def _deviner_categories(self, type_transaction: str, libelles: List[str]) -> List[str]:
+        """Catégorise un lot de libellés avec les mappings du gestionnaire financier."""
+        type_ = "depense" if type_transaction == "DEBIT" else "revenu"
+        return [self.gestionnaire.deviner_categorie(libelle, type_) for libelle in libelles]
@@ -16,6 +16,8 @@ import json
 from app.finance.models.depense import Depense
 from app.finance.models.revenu import Revenu
 from app.core.config import CATEGORIES_JSON
+from app.ui.recherche_incrementale import RechercheIncrementale
+from app.ui.tableau_virtuel import TableauVirtuel
 
 class GestionFinancesApp:
     def __init__(self, parent_frame, gestionnaire):
@@ -527,9 +529,7 @@ class GestionFinancesApp:
                 notes=depense_modele.notes,
                 recurrence=depense_modele.recurrence
             )
-            self.gestionnaire.depenses.append(nouvelle_depense)
-        
-        self.gestionnaire.sauvegarder_depenses()
+            self.gestionnaire.ajouter_depense(nouvelle_depense)
         
         if dates_futures:
             messagebox.showinfo("Récurrence configurée", 
@@ -599,9 +599,7 @@ class GestionFinancesApp:
                 notes=revenu_modele.notes,
                 recurrence=revenu_modele.recurrence
             )
-            self.gestionnaire.revenus.append(nouveau_revenu)
-        
-        self.gestionnaire.sauvegarder_revenus()
+            self.gestionnaire.ajouter_revenu(nouveau_revenu)
         
         if dates_futures:
             messagebox.showinfo("Récurrence configurée", 
@@ -645,7 +643,12 @@ class GestionFinancesApp:
 
         # En-têtes de colonnes
         columns = ("Date", "Montant", "Catégorie", "Notes")
-        table = ttk.Treeview(tableau_frame, columns=columns, show="headings")
+        table = TableauVirtuel(tableau_frame, columns, lambda depense: (
+            depense.date.strftime("%d/%m/%Y"),
+            f"{depense.montant:.2f}€",
+            depense.categorie,
+            getattr(depense, 'notes', "")
+        ))
         
         for col in columns:
             table.heading(col, text=col)
@@ -656,19 +659,9 @@ class GestionFinancesApp:
         table.column("Montant", width=100)
         table.column("Catégorie", width=120)
         table.column("Notes", width=250)
-        
-        # Ajouter une barre de défilement
-        scrollbar = ttk.Scrollbar(tableau_frame, orient=tk.VERTICAL, command=table.yview)
-        table.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         # Fonction pour charger et filtrer les données
         def charger_donnees():
-            # Effacer les données actuelles
-            for i in table.get_children():
-                table.delete(i)
-            
             # Récupérer les filtres
             filtre_texte = entree_recherche.get().lower()
             filtre_categorie = combo_categorie.get()
@@ -690,39 +683,29 @@ class GestionFinancesApp:
             elif filtre_periode == "Cette année":
                 date_limite = datetime.date(aujourd_hui.year, 1, 1)
             
-            # Filtrer les dépenses
-            depenses_filtrees = []
-            for depense in self.gestionnaire.depenses:
-                # Filtre de texte
-                if filtre_texte and filtre_texte not in depense.categorie.lower():
-                    continue
-                
-                # Filtre de catégorie
-                if filtre_categorie != "Toutes" and depense.categorie != filtre_categorie:
-                    continue
-                
-                # Filtre de période
-                if date_limite and depense.date < date_limite:
-                    continue
-                
-                depenses_filtrees.append(depense)
+            # Dépenses de la période et de la catégorie, de la plus récente à la plus ancienne
+            def candidats():
+                return [depense for depense in reversed(self.gestionnaire.depenses_periode(date_limite))
+                        if filtre_categorie == "Toutes" or depense.categorie == filtre_categorie]
             
-            # Trier par date décroissante
-            depenses_filtrees.sort(key=lambda d: d.date, reverse=True)
+            # Filtre de texte (affine le résultat précédent quand la saisie se prolonge)
+            contexte = (filtre_categorie, date_limite, self.gestionnaire.modifications["depenses"])
+            depenses_filtrees = recherche.filtrer(filtre_texte, contexte, candidats,
+                                                   lambda depense, texte: texte in depense.categorie.lower())
             
-            # Ajouter les dépenses au tableau
-            for depense in depenses_filtrees:
-                date_str = depense.date.strftime("%d/%m/%Y")
-                montant_str = f"{depense.montant:.2f}€"
-                notes = getattr(depense, 'notes', "")
-                
-                table.insert("", "end", values=(date_str, montant_str, depense.categorie, notes))
+            # Afficher les dépenses (mises en forme à l'affichage des lignes)
+            table.afficher(depenses_filtrees)
+        
+        def actualiser():
+            recherche.invalider()
+            charger_donnees()
         
         # Charger les données initiales
+        recherche = RechercheIncrementale(fenetre, charger_donnees)
         charger_donnees()
         
-        # Lier les événements de filtrage
-        entree_recherche.bind("<KeyRelease>", lambda e: charger_donnees())
+        # Lier les événements de filtrage (la saisie est filtrée après une pause de frappe)
+        entree_recherche.bind("<KeyRelease>", recherche.planifier)
         combo_categorie.bind("<<ComboboxSelected>>", lambda e: charger_donnees())
         combo_periode.bind("<<ComboboxSelected>>", lambda e: charger_donnees())
         
@@ -730,7 +713,7 @@ class GestionFinancesApp:
         boutons_frame = tk.Frame(fenetre)
         boutons_frame.pack(pady=10)
         
-        tk.Button(boutons_frame, text="Actualiser", command=charger_donnees, 
+        tk.Button(boutons_frame, text="Actualiser", command=actualiser, 
                 bg="#ccccff").pack(side=tk.LEFT, padx=5)
         
         tk.Button(boutons_frame, text="Fermer", command=fenetre.destroy).pack(side=tk.LEFT, padx=5)
@@ -773,7 +756,12 @@ class GestionFinancesApp:
 
         # En-têtes de colonnes
         columns = ("Date", "Montant", "Source", "Notes")
-        table = ttk.Treeview(tableau_frame, columns=columns, show="headings")
+        table = TableauVirtuel(tableau_frame, columns, lambda revenu: (
+            revenu.date.strftime("%d/%m/%Y"),
+            f"{revenu.montant:.2f}€",
+            revenu.source,
+            getattr(revenu, 'notes', "")
+        ))
         
         for col in columns:
             table.heading(col, text=col)
@@ -784,19 +772,9 @@ class GestionFinancesApp:
         table.column("Montant", width=100)
         table.column("Source", width=120)
         table.column("Notes", width=250)
-        
-        # Ajouter une barre de défilement
-        scrollbar = ttk.Scrollbar(tableau_frame, orient=tk.VERTICAL, command=table.yview)
-        table.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         # Fonction pour charger et filtrer les données
         def charger_donnees():
-            # Effacer les données actuelles
-            for i in table.get_children():
-                table.delete(i)
-            
             # Récupérer les filtres
             filtre_texte = entree_recherche.get().lower()
             filtre_source = combo_source.get()
@@ -818,39 +796,29 @@ class GestionFinancesApp:
             elif filtre_periode == "Cette année":
                 date_limite = datetime.date(aujourd_hui.year, 1, 1)
             
-            # Filtrer les revenus
-            revenus_filtres = []
-            for revenu in self.gestionnaire.revenus:
-                # Filtre de texte
-                if filtre_texte and filtre_texte not in revenu.source.lower():
-                    continue
-                
-                # Filtre de source
-                if filtre_source != "Toutes" and revenu.source != filtre_source:
-                    continue
-                
-                # Filtre de période
-                if date_limite and revenu.date < date_limite:
-                    continue
-                
-                revenus_filtres.append(revenu)
+            # Revenus de la période et de la source, du plus récent au plus ancien
+            def candidats():
+                return [revenu for revenu in reversed(self.gestionnaire.revenus_periode(date_limite))
+                        if filtre_source == "Toutes" or revenu.source == filtre_source]
             
-            # Trier par date décroissante
-            revenus_filtres.sort(key=lambda r: r.date, reverse=True)
+            # Filtre de texte (affine le résultat précédent quand la saisie se prolonge)
+            contexte = (filtre_source, date_limite, self.gestionnaire.modifications["revenus"])
+            revenus_filtres = recherche.filtrer(filtre_texte, contexte, candidats,
+                                                lambda revenu, texte: texte in revenu.source.lower())
             
-            # Ajouter les revenus au tableau
-            for revenu in revenus_filtres:
-                date_str = revenu.date.strftime("%d/%m/%Y")
-                montant_str = f"{revenu.montant:.2f}€"
-                notes = getattr(revenu, 'notes', "")
-                
-                table.insert("", "end", values=(date_str, montant_str, revenu.source, notes))
+            # Afficher les revenus (mis en forme à l'affichage des lignes)
+            table.afficher(revenus_filtres)
+        
+        def actualiser():
+            recherche.invalider()
+            charger_donnees()
         
         # Charger les données initiales
+        recherche = RechercheIncrementale(fenetre, charger_donnees)
         charger_donnees()
         
-        # Lier les événements de filtrage
-        entree_recherche.bind("<KeyRelease>", lambda e: charger_donnees())
+        # Lier les événements de filtrage (la saisie est filtrée après une pause de frappe)
+        entree_recherche.bind("<KeyRelease>", recherche.planifier)
         combo_source.bind("<<ComboboxSelected>>", lambda e: charger_donnees())
         combo_periode.bind("<<ComboboxSelected>>", lambda e: charger_donnees())
         
@@ -858,7 +826,7 @@ class GestionFinancesApp:
         boutons_frame = tk.Frame(fenetre)
         boutons_frame.pack(pady=10)
         
-        tk.Button(boutons_frame, text="Actualiser", command=charger_donnees, 
+        tk.Button(boutons_frame, text="Actualiser", command=actualiser, 
                 bg="#ccffcc").pack(side=tk.LEFT, padx=5)
         
         tk.Button(boutons_frame, text="Fermer", command=fenetre.destroy).pack(side=tk.LEFT, padx=5)
@@ -18,6 +18,7 @@ try:
     from app.finance.controllers.gestionnaire_financier import GestionnaireFinancier
     from app.stock.controllers.gestionnaire_stock import GestionnaireStock
     from app.core.config import APP_CONFIG
+    from app.core.stockage_sqlite import ouvrir_stockage_configure
 except ImportError as e:
     print(f"Erreur d'importation: {e}")
     print("Assurez-vous que tous les modules sont correctement installés.")
@@ -46,8 +47,9 @@ def main():
         
         # Initialiser les gestionnaires
         print("Initialisation des gestionnaires...")
-        gestionnaire_financier = GestionnaireFinancier()
-        gestionnaire_stock = GestionnaireStock()
+        stockage = ouvrir_stockage_configure()
+        gestionnaire_financier = GestionnaireFinancier(stockage=stockage)
+        gestionnaire_stock = GestionnaireStock(stockage=stockage)
         print("Gestionnaires initialisés avec succès.")
         
         # Créer l'application avec les gestionnaires
@@ -56,6 +58,9 @@ def main():
         # Gérer la fermeture de la fenêtre
         def on_closing():
             if messagebox.askokcancel("Quitter", "Voulez-vous vraiment quitter l'application?"):
+                gestionnaire_financier.fermer()
+                if stockage is not None:
+                    stockage.fermer()
                 root.destroy()
         
         root.protocol("WM_DELETE_WINDOW", on_closing)
@@ -1,16 +1,48 @@
 import csv
 import datetime
+import io
 import os
 from app.stock.models.article import Article
 from app.stock.models.transaction import TransactionStock
+from app.stock.controllers.index_articles import IndexArticles
+from app.stock.controllers.totaux_stock import TotauxStock
+from app.stock.controllers.index_peremption import IndexPeremption
+from app.core.config import INSTANTANES_CSV, VERIFIER_TOTAUX_STOCK
+from app.core.snapshot import load_with_snapshot
+from app.core.utils import append_csv_rows, write_csv_atomic, repair_csv_tail
+
+CHAMPS_ARTICLES = ["id", "nom", "categorie", "quantite", "prix_unitaire", 
+                   "seuil_alerte", "date_peremption", "fournisseur", 
+                   "code_produit", "emplacement"]
+CHAMPS_TRANSACTIONS = ["id_article", "type_transaction", "quantite", "date", 
+                       "motif", "prix_unitaire", "utilisateur"]
+# Le journal reprend les champs d'une transaction, précédés de son numéro d'ordre
+# et suivis de la quantité de l'article après le mouvement
+CHAMPS_JOURNAL = ["numero"] + CHAMPS_TRANSACTIONS + ["quantite_article"]
 
 class GestionnaireStock:
-    def __init__(self, fichier_articles="Articles.csv", fichier_transactions="TransactionsStock.csv"):
+    def __init__(self, fichier_articles="Articles.csv", fichier_transactions="TransactionsStock.csv",
+                 fichier_journal=None, seuil_compaction=1000, instantanes=INSTANTANES_CSV, stockage=None,
+                 verifier_totaux=VERIFIER_TOTAUX_STOCK):
         self.fichier_articles = fichier_articles
         self.fichier_transactions = fichier_transactions
+        # Journal des mouvements en ajout seul, compacté périodiquement dans les CSV
+        self.fichier_journal = fichier_journal or os.path.splitext(fichier_transactions)[0] + "_journal.csv"
+        self.seuil_compaction = seuil_compaction
+        self.taille_journal = 0
+        self.instantanes = instantanes  # Charger les CSV via leurs instantanés binaires
+        self.stockage = stockage  # Base SQLite utilisée à la place des CSV et du journal
+        self.verifier_totaux = verifier_totaux  # Contrôler les totaux par un recalcul complet (débogage)
         self.articles = {}  # Dictionnaire d'articles indexé par ID
+        self._index_articles = None  # Index de recherche, construit à la première recherche
+        self._etats_stock = None  # Articles en alerte et en rupture, par ID, construits à la première consultation
+        self._totaux_stock = None  # Valeur du stock et totaux par catégorie, tenus à jour à chaque mouvement
+        self._index_peremption = None  # Articles périssables en stock, par date de péremption
         self.transactions = []
-        self.init_fichiers()
+        self._transactions_par_article = None  # Historique par article, construit à la première consultation
+        self.nb_transactions_persistees = 0  # Transactions déjà présentes dans le CSV
+        if self.stockage is None:
+            self.init_fichiers()
         self.charger_donnees()
     
     def init_fichiers(self):
@@ -18,102 +50,206 @@ class GestionnaireStock:
         if not os.path.exists(self.fichier_articles):
             with open(self.fichier_articles, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                writer.writerow(["id", "nom", "categorie", "quantite", "prix_unitaire", 
-                                "seuil_alerte", "date_peremption", "fournisseur", 
-                                "code_produit", "emplacement"])
+                writer.writerow(CHAMPS_ARTICLES)
         
         if not os.path.exists(self.fichier_transactions):
             with open(self.fichier_transactions, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                writer.writerow(["id_article", "type_transaction", "quantite", "date", 
-                                "motif", "prix_unitaire", "utilisateur"])
+                writer.writerow(CHAMPS_TRANSACTIONS)
     
     def charger_donnees(self):
-        """Charge les données depuis les fichiers CSV"""
-        # Charger les articles
-        try:
-            with open(self.fichier_articles, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Convertir les valeurs
-                    article_id = row["id"]
-                    quantite = int(row["quantite"])
-                    prix_unitaire = float(row["prix_unitaire"])
-                    seuil_alerte = int(row["seuil_alerte"])
-                    
-                    # Traiter les valeurs optionnelles
-                    date_peremption = None
-                    if row["date_peremption"]:
-                        try:
-                            date_peremption = datetime.datetime.strptime(
-                                row["date_peremption"], "%Y-%m-%d").date()
-                        except ValueError:
-                            pass
-                    
-                    # Créer l'article
-                    article = Article(
-                        id=article_id,
-                        nom=row["nom"],
-                        categorie=row["categorie"],
-                        quantite=quantite,
-                        prix_unitaire=prix_unitaire,
-                        seuil_alerte=seuil_alerte,
-                        date_peremption=date_peremption,
-                        fournisseur=row["fournisseur"],
-                        code_produit=row["code_produit"],
-                        emplacement=row["emplacement"]
-                    )
-                    self.articles[article_id] = article
-        except FileNotFoundError:
-            pass
+        """Charge les données depuis les fichiers CSV (ou leurs instantanés binaires, ou la base SQLite)"""
+        self._index_articles = None
+        self._etats_stock = None
+        self._totaux_stock = None
+        self._index_peremption = None
+        self._transactions_par_article = None
+        if self.stockage is not None:
+            self.articles = {ligne["id"]: Article.from_dict(ligne) for ligne in self.stockage.lire_articles()}
+            self.transactions = [TransactionStock.from_dict(ligne) for ligne in self.stockage.lire_transactions()]
+            self.nb_transactions_persistees = len(self.transactions)
+            return
         
-        # Charger les transactions
+        # Une compaction interrompue peut laisser une dernière transaction incomplète
+        repair_csv_tail(self.fichier_transactions, CHAMPS_TRANSACTIONS)
         try:
-            with open(self.fichier_transactions, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Convertir les valeurs
-                    id_article = row["id_article"]
-                    quantite = int(row["quantite"])
-                    prix_unitaire = float(row["prix_unitaire"]) if row["prix_unitaire"] else None
-                    
-                    # Convertir la date
-                    date = datetime.datetime.strptime(row["date"], "%Y-%m-%d %H:%M:%S")
-                    
-                    # Créer la transaction
-                    transaction = TransactionStock(
-                        id_article=id_article,
-                        type_transaction=row["type_transaction"],
-                        quantite=quantite,
-                        date=date,
-                        motif=row["motif"],
-                        prix_unitaire=prix_unitaire,
-                        utilisateur=row["utilisateur"]
-                    )
-                    self.transactions.append(transaction)
+            if self.instantanes:
+                self.articles = load_with_snapshot(self.fichier_articles, self.lire_articles)
+                self.transactions = load_with_snapshot(self.fichier_transactions, self.lire_transactions,
+                                                       self.prolonger_transactions)
+            else:
+                self.articles = self.lire_articles()
+                self.transactions = self.lire_transactions()
         except FileNotFoundError:
             pass
+        self.nb_transactions_persistees = len(self.transactions)
+        
+        # Rejouer les mouvements journalisés depuis la dernière compaction
+        self.rejouer_journal()
+    
+    def lire_articles(self):
+        """Lit les articles du fichier CSV et les retourne indexés par ID"""
+        articles = {}
+        with open(self.fichier_articles, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                # Convertir les valeurs
+                article_id = row["id"]
+                quantite = int(row["quantite"])
+                prix_unitaire = float(row["prix_unitaire"])
+                seuil_alerte = int(row["seuil_alerte"])
+                
+                # Traiter les valeurs optionnelles
+                date_peremption = None
+                if row["date_peremption"]:
+                    try:
+                        date_peremption = datetime.datetime.strptime(
+                            row["date_peremption"], "%Y-%m-%d").date()
+                    except ValueError:
+                        pass
+                
+                # Créer l'article
+                article = Article(
+                    id=article_id,
+                    nom=row["nom"],
+                    categorie=row["categorie"],
+                    quantite=quantite,
+                    prix_unitaire=prix_unitaire,
+                    seuil_alerte=seuil_alerte,
+                    date_peremption=date_peremption,
+                    fournisseur=row["fournisseur"],
+                    code_produit=row["code_produit"],
+                    emplacement=row["emplacement"]
+                )
+                articles[article_id] = article
+        return articles
+    
+    def lire_transactions(self, debut=0):
+        """Lit les transactions du fichier CSV, à partir de l'octet `debut` s'il est fourni"""
+        with open(self.fichier_transactions, 'rb') as f:
+            f.seek(debut)
+            texte = f.read().decode('utf-8')
+        # Une lecture en cours de fichier ne voit pas la ligne d'en-tête
+        reader = csv.DictReader(io.StringIO(texte, newline=''),
+                                fieldnames=CHAMPS_TRANSACTIONS if debut else None)
+        
+        transactions = []
+        for row in reader:
+            # Convertir les valeurs
+            id_article = row["id_article"]
+            quantite = int(row["quantite"])
+            prix_unitaire = float(row["prix_unitaire"]) if row["prix_unitaire"] else None
+            
+            # Convertir la date
+            date = datetime.datetime.strptime(row["date"], "%Y-%m-%d %H:%M:%S")
+            
+            # Créer la transaction
+            transaction = TransactionStock(
+                id_article=id_article,
+                type_transaction=row["type_transaction"],
+                quantite=quantite,
+                date=date,
+                motif=row["motif"],
+                prix_unitaire=prix_unitaire,
+                utilisateur=row["utilisateur"]
+            )
+            transactions.append(transaction)
+        return transactions
+    
+    def prolonger_transactions(self, transactions, debut):
+        """Complète les transactions d'un instantané avec celles ajoutées depuis au CSV"""
+        return transactions + self.lire_transactions(debut)
+    
+    def rejouer_journal(self):
+        """Applique les mouvements du journal par-dessus l'instantané chargé depuis les CSV"""
+        self.taille_journal = 0
+        if not os.path.exists(self.fichier_journal):
+            return
+        
+        # Une écriture interrompue peut laisser une dernière ligne incomplète
+        repair_csv_tail(self.fichier_journal, CHAMPS_JOURNAL)
+        
+        with open(self.fichier_journal, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                try:
+                    numero = int(row["numero"])
+                    quantite_article = int(row["quantite_article"])
+                    transaction = TransactionStock.from_dict(row)
+                except (KeyError, TypeError, ValueError) as e:
+                    print(f"Erreur lors de la lecture du journal de stock: {e}")
+                    continue
+                
+                # Une compaction interrompue a pu recopier ce mouvement dans le CSV
+                if numero >= self.nb_transactions_persistees:
+                    self.ajouter_transaction(transaction)
+                
+                # La quantité enregistrée est absolue : la rejouer est idempotent
+                if transaction.id_article in self.articles:
+                    self.articles[transaction.id_article].quantite = quantite_article
+                    self._suivre_article(self.articles[transaction.id_article])
+                
+                self.taille_journal += 1
+    
+    def journaliser_mouvement(self, transaction):
+        """Ajoute un mouvement à la fin du journal (une seule ligne écrite)"""
+        if self.stockage is not None:
+            # Mouvement et quantité de l'article enregistrés dans une même transaction SQL
+            self.stockage.enregistrer_mouvement(transaction.to_dict(),
+                                                self.articles[transaction.id_article].quantite)
+            self.nb_transactions_persistees = len(self.transactions)
+            return
+        
+        ligne = transaction.to_dict()
+        ligne["numero"] = len(self.transactions) - 1
+        ligne["quantite_article"] = self.articles[transaction.id_article].quantite
+        append_csv_rows(self.fichier_journal, CHAMPS_JOURNAL, [ligne])
+        self.taille_journal += 1
+        
+        if self.taille_journal >= self.seuil_compaction:
+            self.compacter_journal()
+    
+    def compacter_journal(self):
+        """Reporte les mouvements journalisés dans les CSV puis vide le journal"""
+        # Les transactions sont ajoutées à la fin du CSV, sans le réécrire
+        nouvelles_transactions = self.transactions[self.nb_transactions_persistees:]
+        if nouvelles_transactions:
+            # Ne pas prolonger une ligne laissée incomplète par une écriture interrompue
+            repair_csv_tail(self.fichier_transactions, CHAMPS_TRANSACTIONS)
+            append_csv_rows(self.fichier_transactions, CHAMPS_TRANSACTIONS,
+                            (t.to_dict() for t in nouvelles_transactions))
+            self.nb_transactions_persistees = len(self.transactions)
+        
+        self.sauvegarder_articles()
+        
+        if os.path.exists(self.fichier_journal):
+            os.remove(self.fichier_journal)
+        self.taille_journal = 0
     
     def sauvegarder_articles(self):
         """Sauvegarde les articles dans le fichier CSV"""
-        with open(self.fichier_articles, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = ["id", "nom", "categorie", "quantite", "prix_unitaire", 
-                         "seuil_alerte", "date_peremption", "fournisseur", 
-                         "code_produit", "emplacement"]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for article in self.articles.values():
-                writer.writerow(article.to_dict())
+        if self.stockage is not None:
+            self.stockage.remplacer_articles(article.to_dict() for article in self.articles.values())
+            return
+        write_csv_atomic(self.fichier_articles, CHAMPS_ARTICLES,
+                         (article.to_dict() for article in self.articles.values()))
     
     def sauvegarder_transactions(self):
         """Sauvegarde les transactions dans le fichier CSV"""
-        with open(self.fichier_transactions, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = ["id_article", "type_transaction", "quantite", "date", 
-                         "motif", "prix_unitaire", "utilisateur"]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for transaction in self.transactions:
-                writer.writerow(transaction.to_dict())
+        if self.stockage is not None:
+            self.stockage.remplacer_transactions(transaction.to_dict() for transaction in self.transactions)
+            self.nb_transactions_persistees = len(self.transactions)
+            return
+        write_csv_atomic(self.fichier_transactions, CHAMPS_TRANSACTIONS,
+                         (transaction.to_dict() for transaction in self.transactions))
+        self.nb_transactions_persistees = len(self.transactions)
+    
+    def enregistrer_article(self, article):
+        """Enregistre un article ajouté ou modifié (une seule ligne en base, sinon compaction des CSV)"""
+        if self.stockage is not None:
+            self.stockage.enregistrer_articles([article.to_dict()])
+        else:
+            self.compacter_journal()
     
     def ajouter_article(self, article):
         """Ajoute un nouvel article au stock"""
@@ -122,7 +258,10 @@ class GestionnaireStock:
             raise ValueError(f"L'article avec l'ID {article.id} existe déjà.")
         
         self.articles[article.id] = article
-        self.sauvegarder_articles()
+        if self._index_articles is not None:
+            self._index_articles.ajouter(article)
+        self._suivre_article(article)
+        self.enregistrer_article(article)
         return article
     
     def modifier_article(self, article):
@@ -131,7 +270,10 @@ class GestionnaireStock:
             raise ValueError(f"L'article avec l'ID {article.id} n'existe pas.")
         
         self.articles[article.id] = article
-        self.sauvegarder_articles()
+        if self._index_articles is not None:
+            self._index_articles.modifier(article)
+        self._suivre_article(article)
+        self.enregistrer_article(article)
         return article
     
     def supprimer_article(self, id_article):
@@ -140,7 +282,13 @@ class GestionnaireStock:
             raise ValueError(f"L'article avec l'ID {id_article} n'existe pas.")
         
         del self.articles[id_article]
-        self.sauvegarder_articles()
+        if self._index_articles is not None:
+            self._index_articles.supprimer(id_article)
+        self._oublier_article(id_article)
+        if self.stockage is not None:
+            self.stockage.supprimer_article(id_article)
+        else:
+            self.compacter_journal()
     
     def entrer_stock(self, id_article, quantite, motif=None, prix_unitaire=None, utilisateur=None):
         """Ajoute du stock à un article et enregistre la transaction"""
@@ -149,7 +297,7 @@ class GestionnaireStock:
         
         # Mise à jour de la quantité
         self.articles[id_article].quantite += quantite
-        self.sauvegarder_articles()
+        self._suivre_article(self.articles[id_article])
         
         # Enregistrement de la transaction
         transaction = TransactionStock(
@@ -160,8 +308,8 @@ class GestionnaireStock:
             prix_unitaire=prix_unitaire,
             utilisateur=utilisateur
         )
-        self.transactions.append(transaction)
-        self.sauvegarder_transactions()
+        self.ajouter_transaction(transaction)
+        self.journaliser_mouvement(transaction)
         
         return transaction
     
@@ -178,7 +326,7 @@ class GestionnaireStock:
         
         # Mise à jour de la quantité
         article.quantite -= quantite
-        self.sauvegarder_articles()
+        self._suivre_article(article)
         
         # Enregistrement de la transaction
         transaction = TransactionStock(
@@ -189,8 +337,8 @@ class GestionnaireStock:
             prix_unitaire=prix_unitaire,
             utilisateur=utilisateur
         )
-        self.transactions.append(transaction)
-        self.sauvegarder_transactions()
+        self.ajouter_transaction(transaction)
+        self.journaliser_mouvement(transaction)
         
         return transaction
     
@@ -205,7 +353,7 @@ class GestionnaireStock:
         
         # Mise à jour de la quantité
         article.quantite = nouvelle_quantite
-        self.sauvegarder_articles()
+        self._suivre_article(article)
         
         # Enregistrement de la transaction
         transaction = TransactionStock(
@@ -215,39 +363,139 @@ class GestionnaireStock:
             motif=motif,
             utilisateur=utilisateur
         )
-        self.transactions.append(transaction)
-        self.sauvegarder_transactions()
+        self.ajouter_transaction(transaction)
+        self.journaliser_mouvement(transaction)
         
         return transaction
     
+    def _suivre_article(self, article):
+        """Actualise l'état d'alerte, les totaux et la péremption d'un article ajouté, modifié ou ayant fait l'objet d'un mouvement"""
+        self.actualiser_etat_article(article)
+        if self._totaux_stock is not None:
+            self._totaux_stock.actualiser(article)
+        if self._index_peremption is not None:
+            self._index_peremption.actualiser(article)
+    
+    def _oublier_article(self, id_article):
+        """Retire un article supprimé des états d'alerte, des totaux et de l'index de péremption"""
+        if self._etats_stock is not None:
+            for articles in self._etats_stock:
+                articles.pop(id_article, None)
+        if self._totaux_stock is not None:
+            self._totaux_stock.retirer(id_article)
+        if self._index_peremption is not None:
+            self._index_peremption.retirer(id_article)
+    
+    def etats_stock(self):
+        """Retourne les dictionnaires (par ID) des articles en alerte et des articles en rupture"""
+        if self._etats_stock is None:
+            alerte, rupture = {}, {}
+            for article in self.articles.values():
+                if article.est_en_rupture():
+                    rupture[article.id] = article
+                elif article.est_en_alerte():
+                    alerte[article.id] = article
+            self._etats_stock = (alerte, rupture)
+        return self._etats_stock
+    
+    def actualiser_etat_article(self, article):
+        """Classe un article en alerte, en rupture ou ni l'un ni l'autre après un changement de quantité ou de seuil"""
+        if self._etats_stock is None:
+            return
+        alerte, rupture = self._etats_stock
+        if article.est_en_rupture():
+            alerte.pop(article.id, None)
+            rupture[article.id] = article
+        elif article.est_en_alerte():
+            rupture.pop(article.id, None)
+            alerte[article.id] = article
+        else:
+            alerte.pop(article.id, None)
+            rupture.pop(article.id, None)
+    
+    def compter_articles_en_alerte(self):
+        """Retourne le nombre d'articles dont le stock est inférieur au seuil d'alerte"""
+        return len(self.etats_stock()[0])
+    
+    def compter_articles_en_rupture(self):
+        """Retourne le nombre d'articles en rupture de stock"""
+        return len(self.etats_stock()[1])
+    
     def obtenir_articles_en_alerte(self):
         """Retourne la liste des articles dont le stock est inférieur au seuil d'alerte"""
-        return [article for article in self.articles.values() if article.est_en_alerte()]
+        return list(self.etats_stock()[0].values())
     
     def obtenir_articles_en_rupture(self):
         """Retourne la liste des articles en rupture de stock"""
-        return [article for article in self.articles.values() if article.est_en_rupture()]
+        return list(self.etats_stock()[1].values())
+    
+    def index_articles(self):
+        """Retourne l'index de recherche des articles (construit au premier appel, puis tenu à jour)"""
+        if self._index_articles is None:
+            self._index_articles = IndexArticles(self.articles.values())
+        return self._index_articles
     
     def rechercher_articles(self, terme_recherche, categorie=None):
         """Recherche des articles par nom, catégorie ou code produit"""
-        resultats = []
-        terme_recherche = terme_recherche.lower()
-        
-        for article in self.articles.values():
-            if terme_recherche in article.nom.lower() or \
-               (article.code_produit and terme_recherche in article.code_produit.lower()):
-                if categorie is None or article.categorie == categorie:
-                    resultats.append(article)
-        
-        return resultats
+        return [self.articles[id_article]
+                for id_article in self.index_articles().rechercher(terme_recherche, categorie)]
+    
+    def obtenir_articles_par_code(self, code_produit):
+        """Retourne les articles ayant exactement ce code produit (sans tenir compte de la casse)"""
+        return [self.articles[id_article] for id_article in self.index_articles().par_code(code_produit)]
+    
+    def ajouter_transaction(self, transaction):
+        """Ajoute une transaction à l'historique et à l'historique de son article"""
+        self.transactions.append(transaction)
+        if self._transactions_par_article is not None:
+            self._transactions_par_article.setdefault(transaction.id_article, []).append(transaction)
+    
+    def transactions_par_article(self):
+        """Retourne l'index des transactions par ID d'article, chacune des listes triée par date"""
+        if self._transactions_par_article is None:
+            index = {}
+            for transaction in self.transactions:
+                index.setdefault(transaction.id_article, []).append(transaction)
+            for historique in index.values():
+                historique.sort(key=lambda t: t.date)
+            self._transactions_par_article = index
+        return self._transactions_par_article
+    
+    def index_peremption(self):
+        """Retourne l'index des articles en stock par date de péremption (construit au premier appel, puis tenu à jour)"""
+        if self._index_peremption is None:
+            self._index_peremption = IndexPeremption(self.articles.values())
+        return self._index_peremption
+    
+    def obtenir_articles_perimes(self, aujourd_hui=None):
+        """Retourne les articles en stock dont la date de péremption est passée"""
+        return [self.articles[id_article] for id_article in self.index_peremption().perimes(aujourd_hui)]
+    
+    def obtenir_articles_perimant_dans(self, jours, aujourd_hui=None):
+        """Retourne les articles en stock (non périmés) qui périment dans les `jours` prochains jours"""
+        return [self.articles[id_article] for id_article in self.index_peremption().perimant_dans(jours, aujourd_hui)]
+    
+    def obtenir_prochains_articles_a_perimer(self, nombre, aujourd_hui=None):
+        """Retourne les `nombre` prochains articles en stock à périmer, dans l'ordre de sortie FEFO"""
+        return [self.articles[id_article] for id_article in self.index_peremption().prochains(nombre, aujourd_hui)]
     
     def obtenir_transactions_par_article(self, id_article):
         """Retourne l'historique des transactions pour un article donné"""
-        return [t for t in self.transactions if t.id_article == id_article]
+        if self.stockage is not None:
+            return [TransactionStock.from_dict(ligne) for ligne in self.stockage.lire_transactions(id_article)]
+        return list(self.transactions_par_article().get(id_article, ()))
+    
+    def totaux_stock(self):
+        """Retourne les totaux du stock (construits à la première consultation, puis tenus à jour)"""
+        if self._totaux_stock is None:
+            self._totaux_stock = TotauxStock(self.articles.values())
+        elif self.verifier_totaux:
+            self._totaux_stock.verifier(self.articles.values())
+        return self._totaux_stock
     
     def obtenir_valeur_totale_stock(self):
-        """Calcule la valeur totale de tous les articles en stock"""
-        return sum(article.valeur_stock() for article in self.articles.values())
+        """Retourne la valeur totale de tous les articles en stock"""
+        return self.totaux_stock().valeur_totale
     
     def generer_rapport_stock(self):
         """Génère un rapport sur l'état actuel du stock"""
@@ -255,20 +503,10 @@ class GestionnaireStock:
             "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "nombre_articles": len(self.articles),
             "valeur_totale": self.obtenir_valeur_totale_stock(),
-            "articles_en_alerte": len(self.obtenir_articles_en_alerte()),
-            "articles_en_rupture": len(self.obtenir_articles_en_rupture()),
-            "categories": {}
+            "articles_en_alerte": self.compter_articles_en_alerte(),
+            "articles_en_rupture": self.compter_articles_en_rupture(),
+            "categories": {categorie: dict(totaux)
+                           for categorie, totaux in self.totaux_stock().par_categorie.items()}
         }
         
-        # Grouper par catégorie
-        for article in self.articles.values():
-            if article.categorie not in rapport["categories"]:
-                rapport["categories"][article.categorie] = {
-                    "nombre": 0,
-                    "valeur": 0
-                }
-            
-            rapport["categories"][article.categorie]["nombre"] += 1
-            rapport["categories"][article.categorie]["valeur"] += article.valeur_stock()
-        
         return rapport
\ No newline at end of file
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Index de recherche des articles en stock.
+Ce module définit la classe IndexArticles, qui associe les codes produit et les catégories
+aux identifiants des articles, et regroupe les noms et codes en minuscules dans un texte
+unique où les sous-chaînes sont recherchées sans parcourir les articles un à un.
+"""
+
+import bisect
+import itertools
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+SEPARATEUR_CHAMPS = "\x1f"  # Entre le nom et le code d'un article
+SEPARATEUR_LIGNES = "\x1e"  # Après chaque article
+
+class IndexArticles:
+    """
+    Index des articles par code produit, par catégorie et par sous-chaîne du nom ou du code.
+
+    Le texte de recherche contient une ligne "nom<US>code<RS>" par article, en minuscules.
+    Une recherche y parcourt les occurrences du terme avec str.find (en C), puis retrouve
+    l'article de chaque occurrence par dichotomie sur les débuts de lignes. Les lignes
+    ajoutées sont accumulées et concaténées au texte à la recherche suivante ; les lignes
+    des articles supprimés ou modifiés sont abandonnées, et le texte est reconstruit
+    lorsqu'elles en représentent plus de la moitié.
+
+    Les résultats suivent l'ordre d'insertion des articles, comme le dictionnaire du gestionnaire.
+
+    Attributes:
+        _cles (Dict[str, Tuple[str, str, str]]): Nom et code en minuscules, et catégorie, par ID.
+        _rangs (Dict[str, int]): Ordre d'insertion de chaque article.
+        _par_code (Dict[str, Set[str]]): IDs par code produit (en minuscules).
+        _par_categorie (Dict[str, Set[str]]): IDs par catégorie.
+        _texte (str): Texte de recherche.
+        _debuts (List[int]): Position de chaque ligne dans le texte (lignes en attente comprises).
+        _ids_lignes (List[Optional[str]]): ID de chaque ligne (None pour une ligne abandonnée).
+        _en_attente (List[str]): Lignes pas encore concaténées au texte.
+    """
+
+    def __init__(self, articles: Iterable[Any] = ()):
+        """
+        Initialise l'index.
+
+        Args:
+            articles (Iterable[Article], optional): Articles à indexer. Par défaut: aucun.
+        """
+        self.reconstruire(articles)
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'articles indexés."""
+        return len(self._cles)
+
+    def reconstruire(self, articles: Iterable[Any]) -> None:
+        """
+        Reconstruit entièrement l'index à partir d'une collection d'articles.
+
+        Args:
+            articles (Iterable[Article]): Articles à indexer.
+        """
+        self._cles = cles = {}
+        self._par_code = par_code = {}
+        self._par_categorie = par_categorie = {}
+        for article in articles:
+            code = (article.code_produit or "").lower()
+            cles[article.id] = (article.nom.lower(), code, article.categorie)
+            if code:
+                ids = par_code.get(code)
+                if ids is None:
+                    par_code[code] = {article.id}
+                else:
+                    ids.add(article.id)
+            ids = par_categorie.get(article.categorie)
+            if ids is None:
+                par_categorie[article.categorie] = {article.id}
+            else:
+                ids.add(article.id)
+
+        self._rangs = {id_article: rang for rang, id_article in enumerate(cles)}
+        self._prochain_rang = len(cles)
+        self._construire_texte()
+
+    def ajouter(self, article: Any) -> None:
+        """
+        Indexe un nouvel article.
+
+        Args:
+            article (Article): Article à indexer.
+        """
+        nom = article.nom.lower()
+        code = (article.code_produit or "").lower()
+        self._cles[article.id] = (nom, code, article.categorie)
+        self._rangs[article.id] = self._prochain_rang
+        self._prochain_rang += 1
+
+        if code:
+            self._par_code.setdefault(code, set()).add(article.id)
+        self._par_categorie.setdefault(article.categorie, set()).add(article.id)
+        self._ajouter_ligne(article.id, nom, code)
+
+    def modifier(self, article: Any) -> None:
+        """
+        Met à jour l'index d'un article dont le nom, le code ou la catégorie a pu changer.
+        L'article garde sa place dans l'ordre des résultats.
+
+        Args:
+            article (Article): Article modifié.
+        """
+        cles = (article.nom.lower(), (article.code_produit or "").lower(), article.categorie)
+        if self._cles.get(article.id) == cles:
+            return
+        rang = self._rangs.get(article.id)
+        self.supprimer(article.id)
+        self.ajouter(article)
+        if rang is not None:
+            self._rangs[article.id] = rang
+
+    def supprimer(self, id_article: str) -> None:
+        """
+        Retire un article de l'index.
+
+        Args:
+            id_article (str): ID de l'article.
+        """
+        cles = self._cles.pop(id_article, None)
+        if cles is None:
+            return
+        del self._rangs[id_article]
+        nom, code, categorie = cles
+
+        if code:
+            self._retirer(self._par_code, code, id_article)
+        self._retirer(self._par_categorie, categorie, id_article)
+        self._ids_lignes[self._ligne_de.pop(id_article)] = None
+        self._lignes_abandonnees += 1
+
+    def par_code(self, code_produit: str) -> List[str]:
+        """
+        Retourne les IDs des articles ayant exactement un code produit (sans tenir compte de la casse).
+
+        Args:
+            code_produit (str): Code produit.
+
+        Returns:
+            List[str]: IDs des articles, dans l'ordre d'insertion.
+        """
+        return self._ordonner(self._par_code.get(code_produit.lower(), ()))
+
+    def rechercher(self, terme: str, categorie: Optional[str] = None) -> List[str]:
+        """
+        Recherche les articles dont le nom ou le code produit contient un terme.
+
+        Args:
+            terme (str): Terme recherché (sans tenir compte de la casse ; vide pour tous les articles).
+            categorie (Optional[str], optional): Catégorie des articles. Par défaut: toutes.
+
+        Returns:
+            List[str]: IDs des articles trouvés, dans l'ordre d'insertion.
+        """
+        terme = terme.lower()
+        if categorie is not None:
+            # Liste de la catégorie, filtrée sur les clés déjà en minuscules
+            cles = self._cles
+            ids = self._par_categorie.get(categorie, ())
+            if terme:
+                ids = [id_article for id_article in ids
+                       if terme in cles[id_article][0] or terme in cles[id_article][1]]
+            return self._ordonner(ids)
+        if not terme:
+            return self._ordonner(self._cles)
+        if SEPARATEUR_CHAMPS in terme or SEPARATEUR_LIGNES in terme:
+            return []
+
+        texte = self._texte_a_jour()
+        debuts = self._debuts
+        ids_lignes = self._ids_lignes
+        ids = []
+        position = texte.find(terme)
+        while position != -1:
+            # Une seule correspondance par ligne : la recherche reprend à la ligne suivante
+            ligne = bisect.bisect_right(debuts, position) - 1
+            if ids_lignes[ligne] is not None:
+                ids.append(ids_lignes[ligne])
+            if ligne + 1 == len(debuts):
+                break
+            position = texte.find(terme, debuts[ligne + 1])
+        return self._ordonner(ids)
+
+    def _ajouter_ligne(self, id_article: str, nom: str, code: str) -> None:
+        """Ajoute la ligne d'un article au texte de recherche (en attente de concaténation)."""
+        ligne = f"{nom}{SEPARATEUR_CHAMPS}{code}{SEPARATEUR_LIGNES}"
+        self._ligne_de[id_article] = len(self._ids_lignes)
+        self._ids_lignes.append(id_article)
+        self._debuts.append(self._fin)
+        self._fin += len(ligne)
+        self._en_attente.append(ligne)
+
+    def _construire_texte(self) -> None:
+        """Construit le texte de recherche à partir des clés des articles, dans l'ordre d'insertion."""
+        self._ids_lignes = list(self._cles)
+        self._ligne_de = {id_article: ligne for ligne, id_article in enumerate(self._ids_lignes)}
+        self._en_attente = [f"{nom}{SEPARATEUR_CHAMPS}{code}{SEPARATEUR_LIGNES}"
+                            for nom, code, categorie in self._cles.values()]
+        self._debuts = list(itertools.accumulate((len(ligne) for ligne in self._en_attente), initial=0))
+        self._fin = self._debuts.pop()  # Longueur du texte, lignes en attente comprises
+        self._texte = ""
+        self._lignes_abandonnees = 0
+
+    def _texte_a_jour(self) -> str:
+        """Retourne le texte de recherche, après reconstruction ou concaténation des lignes en attente."""
+        if self._lignes_abandonnees * 2 > len(self._ids_lignes):
+            self._construire_texte()
+        if self._en_attente:
+            self._texte += "".join(self._en_attente)
+            self._en_attente = []
+        return self._texte
+
+    def _ordonner(self, ids: Iterable[str]) -> List[str]:
+        """Trie des IDs selon l'ordre d'insertion des articles."""
+        return sorted(ids, key=self._rangs.__getitem__)
+
+    @staticmethod
+    def _retirer(index: Dict[str, Set[str]], cle: str, id_article: str) -> None:
+        """Retire un ID d'une liste de l'index, et la liste si elle devient vide."""
+        ids = index.get(cle)
+        if ids is not None:
+            ids.discard(id_article)
+            if not ids:
+                del index[cle]
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Index des dates de péremption des articles en stock.
+Ce module définit la classe IndexPeremption qui maintient les articles périssables
+en stock triés par date de péremption, pour lister les articles périmés, ceux qui
+périment dans les prochains jours et les prochains à périmer (sortie FEFO).
+"""
+
+import bisect
+import datetime
+from typing import Any, Iterable, List, Optional, Tuple
+
+class IndexPeremption:
+    """
+    Articles en stock ayant une date de péremption, triés par date puis par ID.
+
+    Seuls les articles dont la quantité est positive sont indexés : un article épuisé
+    n'a pas à être sorti. Chaque requête se résout par une recherche dichotomique
+    suivie d'une tranche, en O(log n + k) pour k articles retournés.
+
+    Attributes:
+        _entrees (List[Tuple[datetime.date, str]]): Couples (date de péremption, ID), triés.
+        _cles (Dict[str, Tuple[datetime.date, str]]): Entrée indexée de chaque article.
+    """
+
+    def __init__(self, articles: Iterable[Any] = ()):
+        """
+        Initialise l'index.
+
+        Args:
+            articles (Iterable[Article], optional): Articles à indexer. Par défaut: aucun.
+        """
+        self.reconstruire(articles)
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'articles indexés."""
+        return len(self._entrees)
+
+    def reconstruire(self, articles: Iterable[Any]) -> None:
+        """
+        Reconstruit entièrement l'index à partir d'une collection d'articles.
+
+        Args:
+            articles (Iterable[Article]): Articles à indexer.
+        """
+        self._cles = {}
+        for article in articles:
+            cle = self._cle(article)
+            if cle is not None:
+                self._cles[article.id] = cle
+        self._entrees = sorted(self._cles.values())
+
+    def actualiser(self, article: Any) -> None:
+        """
+        Indexe un article ajouté, ou le replace après un changement de date ou de quantité.
+
+        Args:
+            article (Article): Article ajouté ou modifié.
+        """
+        cle = self._cle(article)
+        ancienne = self._cles.get(article.id)
+        if cle == ancienne:
+            return
+        if ancienne is not None:
+            self.retirer(article.id)
+        if cle is not None:
+            bisect.insort(self._entrees, cle)
+            self._cles[article.id] = cle
+
+    def retirer(self, id_article: str) -> None:
+        """
+        Retire un article de l'index.
+
+        Args:
+            id_article (str): ID de l'article.
+        """
+        cle = self._cles.pop(id_article, None)
+        if cle is not None:
+            del self._entrees[bisect.bisect_left(self._entrees, cle)]
+
+    def perimes(self, aujourd_hui: Optional[datetime.date] = None) -> List[str]:
+        """
+        Retourne les articles dont la date de péremption est passée.
+
+        Args:
+            aujourd_hui (Optional[datetime.date], optional): Date du jour. Par défaut: aujourd'hui.
+
+        Returns:
+            List[str]: IDs des articles, du plus anciennement périmé au plus récent.
+        """
+        fin = bisect.bisect_left(self._entrees, (aujourd_hui or datetime.date.today(),))
+        return [id_article for date, id_article in self._entrees[:fin]]
+
+    def perimant_dans(self, jours: int, aujourd_hui: Optional[datetime.date] = None) -> List[str]:
+        """
+        Retourne les articles non périmés dont la date de péremption tombe dans les prochains jours.
+
+        Args:
+            jours (int): Nombre de jours (0 pour les articles périmant aujourd'hui).
+            aujourd_hui (Optional[datetime.date], optional): Date du jour. Par défaut: aujourd'hui.
+
+        Returns:
+            List[str]: IDs des articles, par date de péremption croissante.
+        """
+        aujourd_hui = aujourd_hui or datetime.date.today()
+        limite = aujourd_hui + datetime.timedelta(days=jours + 1)
+        debut = bisect.bisect_left(self._entrees, (aujourd_hui,))
+        fin = bisect.bisect_left(self._entrees, (limite,), debut)
+        return [id_article for date, id_article in self._entrees[debut:fin]]
+
+    def prochains(self, nombre: int, aujourd_hui: Optional[datetime.date] = None) -> List[str]:
+        """
+        Retourne les prochains articles à périmer (ordre de sortie FEFO), hors articles périmés.
+
+        Args:
+            nombre (int): Nombre maximal d'articles.
+            aujourd_hui (Optional[datetime.date], optional): Date du jour. Par défaut: aujourd'hui.
+
+        Returns:
+            List[str]: IDs des articles, par date de péremption croissante.
+        """
+        debut = bisect.bisect_left(self._entrees, (aujourd_hui or datetime.date.today(),))
+        return [id_article for date, id_article in self._entrees[debut:debut + nombre]]
+
+    @staticmethod
+    def _cle(article: Any) -> Optional[Tuple[datetime.date, str]]:
+        """Retourne l'entrée d'un article dans l'index, ou None s'il n'a pas à y figurer."""
+        if article.date_peremption is None or article.quantite <= 0:
+            return None
+        return (article.date_peremption, article.id)
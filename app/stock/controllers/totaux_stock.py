@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Totaux du stock maintenus de façon incrémentale.
+Ce module définit la classe TotauxStock qui conserve la valeur totale du stock et le
+nombre d'articles et la valeur par catégorie, mis à jour par différence à chaque
+mouvement ou modification d'un article.
+"""
+
+import math
+from typing import Any, Dict, Iterable, Tuple
+
+class TotauxStock:
+    """
+    Valeur totale et totaux par catégorie d'une collection d'articles.
+
+    La contribution (catégorie, valeur) comptée pour chaque article est conservée : un
+    article modifié sur place est actualisé en retirant son ancienne contribution et en
+    ajoutant la nouvelle, sans parcourir les autres articles.
+
+    Attributes:
+        valeur_totale (float): Somme des valeurs en stock.
+        par_categorie (Dict[str, Dict[str, float]]): Nombre d'articles ("nombre") et valeur
+            ("valeur") par catégorie.
+        _contributions (Dict[str, Tuple[str, float]]): Catégorie et valeur comptées, par ID d'article.
+    """
+
+    def __init__(self, articles: Iterable[Any] = ()):
+        """
+        Initialise les totaux.
+
+        Args:
+            articles (Iterable[Article], optional): Articles à totaliser. Par défaut: aucun.
+        """
+        self.reconstruire(articles)
+
+    def reconstruire(self, articles: Iterable[Any]) -> None:
+        """
+        Recalcule entièrement les totaux à partir d'une collection d'articles.
+
+        Args:
+            articles (Iterable[Article]): Articles à totaliser.
+        """
+        self.valeur_totale = 0.0
+        self.par_categorie = {}
+        self._contributions = {}
+        for article in articles:
+            self.actualiser(article)
+
+    def actualiser(self, article: Any) -> None:
+        """
+        Compte un article ajouté, ou remplace sa contribution après un changement de
+        quantité, de prix ou de catégorie.
+
+        Args:
+            article (Article): Article ajouté ou modifié.
+        """
+        contribution = (article.categorie, article.valeur_stock())
+        ancienne = self._contributions.get(article.id)
+        if ancienne == contribution:
+            return
+        if ancienne is not None:
+            self._appliquer(ancienne, -1)
+        self._appliquer(contribution, 1)
+        self._contributions[article.id] = contribution
+
+    def retirer(self, id_article: str) -> None:
+        """
+        Retire la contribution d'un article supprimé.
+
+        Args:
+            id_article (str): ID de l'article.
+        """
+        ancienne = self._contributions.pop(id_article, None)
+        if ancienne is not None:
+            self._appliquer(ancienne, -1)
+
+    def verifier(self, articles: Iterable[Any]) -> None:
+        """
+        Compare les totaux à un recalcul complet (contrôle de cohérence).
+
+        Args:
+            articles (Iterable[Article]): Articles dont les totaux doivent être le reflet.
+
+        Raises:
+            ValueError: Si les totaux diffèrent du recalcul.
+        """
+        attendu = TotauxStock(articles)
+        ecarts = [categorie for categorie in set(self.par_categorie) | set(attendu.par_categorie)
+                  if not self._egaux(self.par_categorie.get(categorie), attendu.par_categorie.get(categorie))]
+        if ecarts or not math.isclose(self.valeur_totale, attendu.valeur_totale, rel_tol=1e-9, abs_tol=1e-6):
+            raise ValueError(f"Totaux du stock incohérents : valeur {self.valeur_totale} au lieu de "
+                             f"{attendu.valeur_totale}, catégories en écart : {sorted(ecarts)}")
+
+    def _appliquer(self, contribution: Tuple[str, float], sens: int) -> None:
+        """Applique une contribution (sens = 1 pour un ajout, -1 pour un retrait)."""
+        categorie, valeur = contribution
+        self.valeur_totale += sens * valeur
+        totaux = self.par_categorie.setdefault(categorie, {"nombre": 0, "valeur": 0.0})
+        totaux["nombre"] += sens
+        totaux["valeur"] += sens * valeur
+        if totaux["nombre"] <= 0:
+            del self.par_categorie[categorie]
+
+    @staticmethod
+    def _egaux(totaux: Dict[str, float], attendus: Dict[str, float]) -> bool:
+        """Compare les totaux de deux catégories, à l'arrondi près."""
+        if totaux is None or attendus is None:
+            return totaux is attendus
+        return (totaux["nombre"] == attendus["nombre"]
+                and math.isclose(totaux["valeur"], attendus["valeur"], rel_tol=1e-9, abs_tol=1e-6))
@@ -10,6 +10,7 @@ from tkinter import ttk
 import datetime
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from app.ui.tableau_virtuel import TableauVirtuel
 
 class RapportUI:
     def __init__(self, app, parent_frame, gestionnaire):
@@ -249,6 +250,11 @@ class RapportUI:
             tk.Label(tab_analyse, text="Données insuffisantes pour l'analyse", 
                     font=("Arial", 12)).pack(pady=50)
         
+        # Onglet 6: Péremptions (liste de sortie FEFO)
+        tab_peremption = tk.Frame(notebook)
+        notebook.add(tab_peremption, text="Péremptions")
+        self.afficher_peremptions(tab_peremption)
+        
         # Bouton pour exporter les rapports (à implémenter ultérieurement)
         btn_exporter = tk.Button(fenetre, text="Exporter les rapports", width=20)
         btn_exporter.pack(pady=10)
@@ -256,6 +262,62 @@ class RapportUI:
         # Bouton pour fermer
         tk.Button(fenetre, text="Fermer", command=fenetre.destroy, width=10).pack(pady=5)
     
+    def afficher_peremptions(self, parent):
+        """Affiche les articles périmés puis ceux qui périment dans les prochains jours, dans l'ordre FEFO"""
+        tk.Label(parent, text="Articles périmés et à sortir en priorité", font=("Arial", 12, "bold")).pack(pady=10)
+        
+        # Horizon de la liste
+        horizon_frame = tk.Frame(parent)
+        horizon_frame.pack(fill=tk.X, padx=10)
+        tk.Label(horizon_frame, text="Périmant dans les").pack(side=tk.LEFT)
+        spin_jours = tk.Spinbox(horizon_frame, from_=0, to=365, width=5)
+        spin_jours.delete(0, tk.END)
+        spin_jours.insert(0, "7")
+        spin_jours.pack(side=tk.LEFT, padx=5)
+        tk.Label(horizon_frame, text="prochains jours").pack(side=tk.LEFT)
+        label_total = tk.Label(horizon_frame, text="")
+        label_total.pack(side=tk.RIGHT)
+        
+        table_frame = tk.Frame(parent)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        aujourd_hui = datetime.date.today()
+        
+        def valeurs(article):
+            jours = (article.date_peremption - aujourd_hui).days
+            echeance = "Périmé" if jours < 0 else ("Aujourd'hui" if jours == 0 else f"J-{jours}")
+            return (
+                article.id,
+                article.nom,
+                article.categorie,
+                article.quantite,
+                article.date_peremption.strftime("%Y-%m-%d"),
+                echeance,
+                article.emplacement or ""
+            )
+        
+        columns = ("ID", "Nom", "Catégorie", "Quantité", "Péremption", "Échéance", "Emplacement")
+        table = TableauVirtuel(table_frame, columns, valeurs)
+        for col in columns:
+            table.heading(col, text=col)
+            table.column(col, width=100)
+        table.column("ID", width=70)
+        table.column("Nom", width=150)
+        
+        def charger(event=None):
+            try:
+                jours = max(0, int(spin_jours.get()))
+            except ValueError:
+                return
+            perimes = self.gestionnaire.obtenir_articles_perimes(aujourd_hui)
+            a_sortir = self.gestionnaire.obtenir_articles_perimant_dans(jours, aujourd_hui)
+            label_total.config(text=f"Périmés: {len(perimes)} - À sortir: {len(a_sortir)}")
+            table.afficher(perimes + a_sortir)
+        
+        spin_jours.config(command=charger)
+        spin_jours.bind("<Return>", charger)
+        charger()
+    
     def exporter_rapport(self):
         """
         Export un rapport au format PDF ou Excel (à implémenter ultérieurement)
@@ -11,6 +11,24 @@ from app.stock.controllers.gestionnaire_stock import GestionnaireStock
 from app.stock.views.article_ui import ArticleUI
 from app.stock.views.transaction_ui import TransactionUI
 from app.stock.views.rapport_ui import RapportUI
+from app.ui.tableau_virtuel import TableauVirtuel
+
+COLONNES_ARTICLES = ("ID", "Nom", "Catégorie", "Quantité", "Prix unitaire", "Valeur", "Alerte", "Emplacement")
+
+def valeurs_article(article):
+    """Retourne les valeurs affichées d'un article dans le tableau des articles"""
+    etat_alerte = "⚠️" if article.est_en_alerte() else ""
+    etat_alerte = "❌" if article.est_en_rupture() else etat_alerte
+    return (
+        article.id,
+        article.nom,
+        article.categorie,
+        article.quantite,
+        f"{article.prix_unitaire:.2f}€",
+        f"{article.valeur_stock():.2f}€",
+        etat_alerte,
+        article.emplacement or ""
+    )
 
 class GestionStockApp:
     def __init__(self, parent_frame, gestionnaire_stock=None):
@@ -88,9 +106,9 @@ class GestionStockApp:
         table_frame = tk.Frame(self.parent_frame)
         table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        # Création du tableau avec Treeview
-        columns = ("ID", "Nom", "Catégorie", "Quantité", "Prix unitaire", "Valeur", "Alerte", "Emplacement")
-        self.table = ttk.Treeview(table_frame, columns=columns, show="headings")
+        # Création du tableau (seules les lignes visibles sont créées)
+        columns = COLONNES_ARTICLES
+        self.table = TableauVirtuel(table_frame, columns, valeurs_article)
         
         # Définir les en-têtes
         for col in columns:
@@ -105,12 +123,6 @@ class GestionStockApp:
         self.table.column("Valeur", width=100)
         self.table.column("Alerte", width=80)
         
-        # Ajouter une barre de défilement
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.table.yview)
-        self.table.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
         # Configurer le double-clic pour modifier
         self.table.bind("<Double-1>", self.article_ui.modifier_article)
         
@@ -148,33 +160,14 @@ class GestionStockApp:
     
     def charger_articles(self):
         """Charge les articles dans le tableau"""
-        # Effacer le tableau
-        for item in self.table.get_children():
-            self.table.delete(item)
-        
-        # Ajouter les articles
-        for article in self.gestionnaire.articles.values():
-            valeur = article.valeur_stock()
-            etat_alerte = "⚠️" if article.est_en_alerte() else ""
-            etat_alerte = "❌" if article.est_en_rupture() else etat_alerte
-            
-            self.table.insert("", "end", values=(
-                article.id,
-                article.nom,
-                article.categorie,
-                article.quantite,
-                f"{article.prix_unitaire:.2f}€",
-                f"{valeur:.2f}€",
-                etat_alerte,
-                article.emplacement or ""
-            ))
+        self.table.afficher(list(self.gestionnaire.articles.values()), conserver_position=True)
     
     def mettre_a_jour_statistiques(self):
         """Met à jour les indicateurs statistiques"""
         nb_articles = len(self.gestionnaire.articles)
         valeur_totale = self.gestionnaire.obtenir_valeur_totale_stock()
-        articles_rupture = len(self.gestionnaire.obtenir_articles_en_rupture())
-        articles_alerte = len(self.gestionnaire.obtenir_articles_en_alerte())
+        articles_rupture = self.gestionnaire.compter_articles_en_rupture()
+        articles_alerte = self.gestionnaire.compter_articles_en_alerte()
         
         self.label_total_articles.config(text=f"Articles: {nb_articles}")
         self.label_valeur_stock.config(text=f"Valeur: {valeur_totale:.2f}€")
@@ -187,31 +180,11 @@ class GestionStockApp:
         categorie_selection = self.combo_categorie.get()
         categorie = None if categorie_selection == "Toutes" else categorie_selection
         
-        # Effacer le tableau
-        for item in self.table.get_children():
-            self.table.delete(item)
-        
         # Filtrer les articles
-        articles_filtres = []
-        if terme:
+        if terme or categorie is not None:
             articles_filtres = self.gestionnaire.rechercher_articles(terme, categorie)
         else:
-            articles_filtres = [a for a in self.gestionnaire.articles.values() 
-                               if categorie is None or a.categorie == categorie]
-        
-        # Ajouter les articles filtrés
-        for article in articles_filtres:
-            valeur = article.valeur_stock()
-            etat_alerte = "⚠️" if article.est_en_alerte() else ""
-            etat_alerte = "❌" if article.est_en_rupture() else etat_alerte
-            
-            self.table.insert("", "end", values=(
-                article.id,
-                article.nom,
-                article.categorie,
-                article.quantite,
-                f"{article.prix_unitaire:.2f}€",
-                f"{valeur:.2f}€",
-                etat_alerte,
-                article.emplacement or ""
-            ))
\ No newline at end of file
+            articles_filtres = list(self.gestionnaire.articles.values())
+        
+        # Afficher les articles filtrés
+        self.table.afficher(articles_filtres)
\ No newline at end of file
@@ -1,6 +1,28 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 from app.stock.models.transaction import TransactionStock
+from app.ui.tableau_virtuel import TableauVirtuel
+
+TYPES_TRANSACTION = {
+    TransactionStock.TYPE_ENTREE: "Entrée",
+    TransactionStock.TYPE_SORTIE: "Sortie",
+    TransactionStock.TYPE_AJUSTEMENT: "Ajustement"
+}
+
+def valeurs_transaction(transaction):
+    """Retourne les valeurs affichées d'une transaction dans l'historique"""
+    type_trans = TYPES_TRANSACTION.get(transaction.type_transaction, transaction.type_transaction)
+    date_str = transaction.date.strftime("%Y-%m-%d %H:%M:%S")
+    quantite_str = f"+{transaction.quantite}" if transaction.type_transaction == TransactionStock.TYPE_ENTREE else str(transaction.quantite)
+    prix_str = f"{transaction.prix_unitaire:.2f}€" if transaction.prix_unitaire is not None else "-"
+    return (
+        type_trans,
+        date_str,
+        quantite_str,
+        prix_str,
+        transaction.motif or "-",
+        transaction.utilisateur or "-"
+    )
 
 class TransactionUI:
     def __init__(self, app, parent_frame, gestionnaire):
@@ -400,7 +422,7 @@ class TransactionUI:
         table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         columns = ("Type", "Date", "Quantité", "Prix unitaire", "Motif", "Utilisateur")
-        table = ttk.Treeview(table_frame, columns=columns, show="headings")
+        table = TableauVirtuel(table_frame, columns, valeurs_transaction)
         
         for col in columns:
             table.heading(col, text=col)
@@ -412,33 +434,8 @@ class TransactionUI:
         table.column("Quantité", width=70)
         table.column("Motif", width=150)
         
-        # Ajouter les transactions (ordre chronologique inverse)
-        for transaction in sorted(transactions, key=lambda t: t.date, reverse=True):
-            # Formater les valeurs
-            type_trans = {
-                TransactionStock.TYPE_ENTREE: "Entrée",
-                TransactionStock.TYPE_SORTIE: "Sortie",
-                TransactionStock.TYPE_AJUSTEMENT: "Ajustement"
-            }.get(transaction.type_transaction, transaction.type_transaction)
-            
-            date_str = transaction.date.strftime("%Y-%m-%d %H:%M:%S")
-            quantite_str = f"+{transaction.quantite}" if transaction.type_transaction == TransactionStock.TYPE_ENTREE else str(transaction.quantite)
-            prix_str = f"{transaction.prix_unitaire:.2f}€" if transaction.prix_unitaire is not None else "-"
-            
-            table.insert("", "end", values=(
-                type_trans,
-                date_str,
-                quantite_str,
-                prix_str,
-                transaction.motif or "-",
-                transaction.utilisateur or "-"
-            ))
-        
-        # Ajouter une barre de défilement
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=table.yview)
-        table.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # Afficher les transactions (ordre chronologique inverse)
+        table.afficher(sorted(transactions, key=lambda t: t.date, reverse=True))
         
         # Bouton fermer
         tk.Button(fenetre, text="Fermer", command=fenetre.destroy, width=10).pack(pady=10)
@@ -482,8 +479,15 @@ class TransactionUI:
         table_frame = tk.Frame(fenetre)
         table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
+        def valeurs(transaction):
+            # Récupérer le nom de l'article
+            nom_article = "Inconnu"
+            if transaction.id_article in self.gestionnaire.articles:
+                nom_article = self.gestionnaire.articles[transaction.id_article].nom
+            return (f"{transaction.id_article} - {nom_article}",) + valeurs_transaction(transaction)
+        
         columns = ("Article", "Type", "Date", "Quantité", "Prix unitaire", "Motif", "Utilisateur")
-        table = ttk.Treeview(table_frame, columns=columns, show="headings")
+        table = TableauVirtuel(table_frame, columns, valeurs)
         
         for col in columns:
             table.heading(col, text=col)
@@ -498,17 +502,17 @@ class TransactionUI:
         
         # Fonction pour charger les transactions selon les filtres
         def charger_transactions():
-            # Effacer le tableau
-            for item in table.get_children():
-                table.delete(item)
-            
             # Récupérer les filtres
             type_filtre = combo_type.get()
             article_filtre = combo_article.get()
             
-            # Appliquer les filtres
+            # Appliquer les filtres (l'historique d'un article est lu dans l'index par article)
             transactions_filtrees = transactions
             
+            if article_filtre != "Tous":
+                id_article = article_filtre.split(" - ")[0]
+                transactions_filtrees = self.gestionnaire.obtenir_transactions_par_article(id_article)
+            
             if type_filtre != "Tous":
                 type_map = {"Entrée": TransactionStock.TYPE_ENTREE, 
                            "Sortie": TransactionStock.TYPE_SORTIE, 
@@ -516,49 +520,13 @@ class TransactionUI:
                 transactions_filtrees = [t for t in transactions_filtrees 
                                         if t.type_transaction == type_map.get(type_filtre)]
             
-            if article_filtre != "Tous":
-                id_article = article_filtre.split(" - ")[0]
-                transactions_filtrees = [t for t in transactions_filtrees 
-                                        if t.id_article == id_article]
-            
-            # Ajouter les transactions (ordre chronologique inverse)
-            for transaction in sorted(transactions_filtrees, key=lambda t: t.date, reverse=True):
-                # Formater les valeurs
-                type_trans = {
-                    TransactionStock.TYPE_ENTREE: "Entrée",
-                    TransactionStock.TYPE_SORTIE: "Sortie",
-                    TransactionStock.TYPE_AJUSTEMENT: "Ajustement"
-                }.get(transaction.type_transaction, transaction.type_transaction)
-                
-                # Récupérer le nom de l'article
-                nom_article = "Inconnu"
-                if transaction.id_article in self.gestionnaire.articles:
-                    nom_article = self.gestionnaire.articles[transaction.id_article].nom
-                
-                date_str = transaction.date.strftime("%Y-%m-%d %H:%M:%S")
-                quantite_str = f"+{transaction.quantite}" if transaction.type_transaction == TransactionStock.TYPE_ENTREE else str(transaction.quantite)
-                prix_str = f"{transaction.prix_unitaire:.2f}€" if transaction.prix_unitaire is not None else "-"
-                
-                table.insert("", "end", values=(
-                    f"{transaction.id_article} - {nom_article}",
-                    type_trans,
-                    date_str,
-                    quantite_str,
-                    prix_str,
-                    transaction.motif or "-",
-                    transaction.utilisateur or "-"
-                ))
+            # Afficher les transactions (ordre chronologique inverse), mises en forme à l'affichage
+            table.afficher(sorted(transactions_filtrees, key=lambda t: t.date, reverse=True))
         
         # Lier les filtres à la fonction de chargement
         combo_type.bind("<<ComboboxSelected>>", lambda e: charger_transactions())
         combo_article.bind("<<ComboboxSelected>>", lambda e: charger_transactions())
         
-        # Ajouter une barre de défilement
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=table.yview)
-        table.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
         # Charger les transactions initiales
         charger_transactions()
         
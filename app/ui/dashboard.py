@@ -7,16 +7,20 @@ Interface utilisateur principale (tableau de bord) pour l'application.
 
 import sys
 import datetime
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 
 from app.core.config import APP_CONFIG
 from app.finance.controllers.gestionnaire_financier import GestionnaireFinancier
 from app.stock.controllers.gestionnaire_stock import GestionnaireStock
 from app.finance.views.finance_app import GestionFinancesApp
+from app.finance.integrations.import_releves import ImportateurReleves
 from app.stock.views.article_ui import ArticleUI
 from app.stock.views.transaction_ui import TransactionUI
 from app.stock.views.rapport_ui import RapportUI
+from app.stock.views.stock_app import COLONNES_ARTICLES, valeurs_article
+from app.ui.tableau_virtuel import TableauVirtuel
 
 
 class ApplicationPrincipale:
@@ -141,9 +145,9 @@ class ApplicationPrincipale:
         table_frame = tk.Frame(self.stock_frame)
         table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        # Création du tableau avec Treeview
-        columns = ("ID", "Nom", "Catégorie", "Quantité", "Prix unitaire", "Valeur", "Alerte", "Emplacement")
-        self.table = ttk.Treeview(table_frame, columns=columns, show="headings")
+        # Création du tableau (seules les lignes visibles sont créées)
+        columns = COLONNES_ARTICLES
+        self.table = TableauVirtuel(table_frame, columns, valeurs_article)
         
         # Définir les en-têtes
         for col in columns:
@@ -158,12 +162,6 @@ class ApplicationPrincipale:
         self.table.column("Valeur", width=100)
         self.table.column("Alerte", width=80)
         
-        # Ajouter une barre de défilement
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.table.yview)
-        self.table.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
         # Configurer le double-clic pour modifier
         self.table.bind("<Double-1>", self.article_ui.modifier_article)
         
@@ -250,11 +248,8 @@ class ApplicationPrincipale:
             
             # Calculer les dépenses et revenus du mois courant
             mois_courant = datetime.datetime.now().strftime("%Y-%m")
-            depenses_mensuelles = self.gestionnaire_financier.depenses_mensuelles()
-            revenus_mensuels = self.gestionnaire_financier.revenus_mensuels()
-            
-            depenses_mois = depenses_mensuelles.get(mois_courant, 0)
-            revenus_mois = revenus_mensuels.get(mois_courant, 0)
+            depenses_mois = self.gestionnaire_financier.depenses_du_mois(mois_courant)
+            revenus_mois = self.gestionnaire_financier.revenus_du_mois(mois_courant)
             
             self.lbl_depenses.config(text=f"Dépenses du mois: {depenses_mois:.2f}€")
             self.lbl_revenus.config(text=f"Revenus du mois: {revenus_mois:.2f}€")
@@ -262,7 +257,7 @@ class ApplicationPrincipale:
             # Données de stock
             nb_articles = len(self.gestionnaire_stock.articles)
             valeur_stock = self.gestionnaire_stock.obtenir_valeur_totale_stock()
-            nb_alertes = len(self.gestionnaire_stock.obtenir_articles_en_alerte())
+            nb_alertes = self.gestionnaire_stock.compter_articles_en_alerte()
             
             self.lbl_articles.config(text=f"Articles en stock: {nb_articles}")
             self.lbl_valeur.config(text=f"Valeur totale: {valeur_stock:.2f}€")
@@ -355,8 +350,67 @@ class ApplicationPrincipale:
         messagebox.showinfo("Export", "Fonctionnalité d'export à implémenter")
     
     def import_data(self):
-        """Importe des données dans l'application."""
-        messagebox.showinfo("Import", "Fonctionnalité d'import à implémenter")
+        """Importe un relevé bancaire (CSV, OFX ou QIF) en arrière-plan, avec une barre de progression."""
+        chemin = filedialog.askopenfilename(
+            title="Importer un relevé bancaire",
+            filetypes=[("Relevés bancaires", "*.csv *.ofx *.qfx *.qif"), ("Tous les fichiers", "*.*")])
+        if not chemin:
+            return
+        
+        fenetre = tk.Toplevel(self.root)
+        fenetre.title("Import du relevé")
+        fenetre.geometry("400x150")
+        fenetre.resizable(False, False)
+        fenetre.transient(self.root)
+        fenetre.grab_set()
+        
+        lbl_etat = tk.Label(fenetre, text="Lecture du relevé...")
+        lbl_etat.pack(pady=10)
+        barre = ttk.Progressbar(fenetre, length=350, mode="determinate", maximum=100)
+        barre.pack(pady=5)
+        annulation = threading.Event()
+        tk.Button(fenetre, text="Arrêter", command=annulation.set, width=10).pack(pady=10)
+        fenetre.protocol("WM_DELETE_WINDOW", annulation.set)
+        
+        # Le thread d'import ne touche pas à Tkinter : l'interface relève son état périodiquement
+        etat = {"progression": 0.0, "stats": None, "resultat": None, "erreur": None}
+        
+        def progression(lus, taille, stats):
+            etat["progression"] = 100.0 * lus / taille if taille else 100.0
+            etat["stats"] = dict(stats)
+        
+        def importer():
+            try:
+                importateur = ImportateurReleves(self.gestionnaire_financier)
+                etat["resultat"] = importateur.importer(chemin, progression, annulation)
+            except Exception as e:
+                etat["erreur"] = e
+        
+        def suivre():
+            barre["value"] = etat["progression"]
+            if etat["stats"]:
+                ajoutees = etat["stats"]["depenses_ajoutees"] + etat["stats"]["revenus_ajoutes"]
+                lbl_etat.config(text=f"{ajoutees} opérations importées...")
+            if thread.is_alive():
+                fenetre.after(100, suivre)
+                return
+            fenetre.destroy()
+            if etat["erreur"] is not None:
+                messagebox.showerror("Import", f"Erreur lors de l'import du relevé: {etat['erreur']}")
+                return
+            stats = etat["resultat"]
+            messagebox.showinfo("Import", 
+                               f"{'Import arrêté' if annulation.is_set() else 'Import terminé'}.\n\n"
+                               f"Dépenses ajoutées: {stats['depenses_ajoutees']}\n"
+                               f"Revenus ajoutés: {stats['revenus_ajoutes']}\n"
+                               f"Doublons ignorés: {stats['transactions_ignorees']}\n"
+                               f"Lignes illisibles: {stats['lignes_invalides']}")
+            self.actualiser_tableau_de_bord()
+            self.finances_app.mettre_a_jour_solde()
+        
+        thread = threading.Thread(target=importer)
+        thread.start()
+        fenetre.after(100, suivre)
     
     def show_documentation(self):
         """Affiche la documentation de l'application."""
@@ -379,6 +433,9 @@ class ApplicationPrincipale:
     def quitter(self):
         """Quitte l'application avec confirmation."""
         if messagebox.askokcancel("Quitter", "Voulez-vous vraiment quitter l'application?"):
+            self.gestionnaire_financier.fermer()
+            if self.gestionnaire_financier.stockage is not None:
+                self.gestionnaire_financier.stockage.fermer()
             self.root.destroy()
             sys.exit(0)
             
@@ -404,26 +461,7 @@ class ApplicationPrincipale:
         if not hasattr(self, 'table'):
             return
             
-        # Effacer le tableau
-        for item in self.table.get_children():
-            self.table.delete(item)
-        
-        # Ajouter les articles
-        for article in self.gestionnaire_stock.articles.values():
-            valeur = article.valeur_stock()
-            etat_alerte = "⚠️" if article.est_en_alerte() else ""
-            etat_alerte = "❌" if article.est_en_rupture() else etat_alerte
-            
-            self.table.insert("", "end", values=(
-                article.id,
-                article.nom,
-                article.categorie,
-                article.quantite,
-                f"{article.prix_unitaire:.2f}€",
-                f"{valeur:.2f}€",
-                etat_alerte,
-                article.emplacement or ""
-            ))
+        self.table.afficher(list(self.gestionnaire_stock.articles.values()), conserver_position=True)
     
     def mettre_a_jour_statistiques(self):
         """Met à jour les indicateurs statistiques."""
@@ -432,8 +470,8 @@ class ApplicationPrincipale:
             
         nb_articles = len(self.gestionnaire_stock.articles)
         valeur_totale = self.gestionnaire_stock.obtenir_valeur_totale_stock()
-        articles_rupture = len(self.gestionnaire_stock.obtenir_articles_en_rupture())
-        articles_alerte = len(self.gestionnaire_stock.obtenir_articles_en_alerte())
+        articles_rupture = self.gestionnaire_stock.compter_articles_en_rupture()
+        articles_alerte = self.gestionnaire_stock.compter_articles_en_alerte()
         
         self.label_total_articles.config(text=f"Articles: {nb_articles}")
         self.label_valeur_stock.config(text=f"Valeur: {valeur_totale:.2f}€")
@@ -449,34 +487,14 @@ class ApplicationPrincipale:
         categorie_selection = self.combo_categorie.get()
         categorie = None if categorie_selection == "Toutes" else categorie_selection
         
-        # Effacer le tableau
-        for item in self.table.get_children():
-            self.table.delete(item)
-        
         # Filtrer les articles
-        articles_filtres = []
-        if terme:
+        if terme or categorie is not None:
             articles_filtres = self.gestionnaire_stock.rechercher_articles(terme, categorie)
         else:
-            articles_filtres = [a for a in self.gestionnaire_stock.articles.values() 
-                               if categorie is None or a.categorie == categorie]
-        
-        # Ajouter les articles filtrés
-        for article in articles_filtres:
-            valeur = article.valeur_stock()
-            etat_alerte = "⚠️" if article.est_en_alerte() else ""
-            etat_alerte = "❌" if article.est_en_rupture() else etat_alerte
-            
-            self.table.insert("", "end", values=(
-                article.id,
-                article.nom,
-                article.categorie,
-                article.quantite,
-                f"{article.prix_unitaire:.2f}€",
-                f"{valeur:.2f}€",
-                etat_alerte,
-                article.emplacement or ""
-            ))
+            articles_filtres = list(self.gestionnaire_stock.articles.values())
+        
+        # Afficher les articles filtrés
+        self.table.afficher(articles_filtres)
 
 
 def main():
@@ -491,9 +509,11 @@ def main():
         # Initialiser les gestionnaires
         from app.finance.controllers.gestionnaire_financier import GestionnaireFinancier
         from app.stock.controllers.gestionnaire_stock import GestionnaireStock
+        from app.core.stockage_sqlite import ouvrir_stockage_configure
         
-        gestionnaire_financier = GestionnaireFinancier()
-        gestionnaire_stock = GestionnaireStock()
+        stockage = ouvrir_stockage_configure()
+        gestionnaire_financier = GestionnaireFinancier(stockage=stockage)
+        gestionnaire_stock = GestionnaireStock(stockage=stockage)
         
         # Créer l'application
         app = ApplicationPrincipale(root, gestionnaire_financier, gestionnaire_stock)
@@ -501,6 +521,9 @@ def main():
         # Gérer la fermeture
         def on_closing():
             if messagebox.askokcancel("Quitter", "Voulez-vous vraiment quitter l'application?"):
+                gestionnaire_financier.fermer()
+                if stockage is not None:
+                    stockage.fermer()
                 root.destroy()
         
         root.protocol("WM_DELETE_WINDOW", on_closing)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Recherche au fil de la saisie.
+Ce module définit la classe RechercheIncrementale, qui diffère le filtrage d'une liste
+jusqu'à une pause de la saisie et réutilise le résultat précédent lorsque la recherche
+est affinée.
+"""
+
+
+class RechercheIncrementale:
+    """
+    Filtrage différé et incrémental d'une liste selon un texte saisi.
+
+    `planifier()` (lié à <KeyRelease>) ne relance le chargement qu'après `delai_ms`
+    millisecondes sans frappe. `filtrer()` ne parcourt que le résultat précédent lorsque
+    le nouveau texte contient l'ancien et que les autres filtres (le contexte) n'ont pas
+    changé : un élément qui ne contenait pas l'ancien texte ne peut pas contenir le nouveau.
+    """
+    DELAI_MS = 200
+
+    def __init__(self, widget, charger, delai_ms=None):
+        """
+        Initialise la recherche.
+
+        Args:
+            widget (tk.Widget): Widget servant à planifier le chargement (after).
+            charger (callable): Fonction de chargement, sans argument.
+            delai_ms (int, optional): Pause de saisie avant chargement. Par défaut: DELAI_MS.
+        """
+        self.widget = widget
+        self.charger = charger
+        self.delai_ms = self.DELAI_MS if delai_ms is None else delai_ms
+        self._planifie = None
+        self._texte = None
+        self._contexte = None
+        self._resultats = []
+
+    def planifier(self, event=None):
+        """Relance le chargement après une pause de la saisie."""
+        if self._planifie is not None:
+            self.widget.after_cancel(self._planifie)
+        self._planifie = self.widget.after(self.delai_ms, self._executer)
+
+    def invalider(self):
+        """Oublie le résultat précédent (données modifiées) : le prochain filtrage repart de zéro."""
+        self._texte = None
+        self._resultats = []
+
+    def filtrer(self, texte, contexte, candidats, correspond):
+        """
+        Filtre les éléments selon un texte, en partant si possible du résultat précédent.
+
+        Args:
+            texte (str): Texte recherché (déjà normalisé, par exemple en minuscules).
+            contexte (object): Valeur des autres filtres ; un changement impose un filtrage complet.
+            candidats (callable): Retourne les éléments à filtrer lors d'un filtrage complet.
+            correspond (callable): correspond(element, texte) indique si un élément est retenu.
+
+        Returns:
+            list: Éléments retenus, dans l'ordre des candidats.
+        """
+        if self._texte is not None and contexte == self._contexte and self._texte in texte:
+            if texte == self._texte:
+                return self._resultats
+            source = self._resultats
+        else:
+            source = candidats()
+
+        if texte:
+            resultats = [element for element in source if correspond(element, texte)]
+        else:
+            resultats = list(source)
+        self._texte, self._contexte, self._resultats = texte, contexte, resultats
+        return resultats
+
+    def _executer(self):
+        """Exécute le chargement planifié, si la fenêtre existe encore."""
+        self._planifie = None
+        if self.widget.winfo_exists():
+            self.charger()
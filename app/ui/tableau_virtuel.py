@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tableau virtualisé pour l'affichage de longues listes.
+Ce module définit la classe TableauVirtuel, un Treeview qui ne crée que les lignes
+visibles et les remplit à la demande lors du défilement.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+
+class TableauVirtuel:
+    """
+    Tableau (ttk.Treeview) affichant une séquence d'éléments de taille quelconque.
+
+    Seules les lignes visibles existent dans le Treeview : le défilement (barre, molette,
+    clavier) les remplit avec les éléments correspondants, mis en forme à la demande.
+    Les valeurs des lignes voisines de la zone visible sont gardées en cache pour un
+    défilement fluide.
+
+    Les méthodes non définies ici (heading, column, bind, identify_row, item...) sont
+    celles du Treeview ; `selection()` retourne les lignes sélectionnées visibles, et
+    `element(item)` l'élément affiché sur une ligne.
+    """
+    MARGE_CACHE = 50  # Lignes dont la mise en forme est conservée, de part et d'autre de la zone visible
+    PAS_MOLETTE = 3  # Lignes défilées par cran de molette
+
+    def __init__(self, parent, columns, formater, **options):
+        """
+        Crée le tableau et sa barre de défilement dans `parent`.
+
+        Args:
+            parent (tk.Widget): Conteneur du tableau (le tableau et la barre y sont placés avec pack).
+            columns (tuple): Noms des colonnes.
+            formater (callable): Retourne le tuple des valeurs affichées pour un élément.
+            **options: Options supplémentaires du Treeview.
+        """
+        self.formater = formater
+        self.arbre = ttk.Treeview(parent, columns=columns, show="headings", **options)
+        self.barre = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self._defiler)
+        self.barre.pack(side=tk.RIGHT, fill=tk.Y)
+        self.arbre.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.elements = []
+        self.debut = 0  # Position du premier élément affiché
+        self._lignes = []  # Lignes du Treeview, réutilisées d'un affichage à l'autre
+        self._capacite = int(self.arbre.cget("height")) + 1
+        self._cache = {}  # Valeurs mises en forme, par position d'élément
+        self._selectionnes = set()  # Positions des éléments sélectionnés, visibles ou non
+        self._selection_affichee = ()
+
+        self.arbre.bind("<Configure>", self._redimensionner)
+        self.arbre.bind("<<TreeviewSelect>>", self._memoriser_selection, add="+")
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.arbre.bind(sequence, self._molette)
+        for touche, pas in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "page-"), ("<Next>", "page+"),
+                            ("<Home>", "debut"), ("<End>", "fin")):
+            self.arbre.bind(touche, lambda event, pas=pas: self._clavier(pas))
+
+    def __getattr__(self, nom):
+        """Délègue au Treeview les méthodes non définies par le tableau."""
+        if nom == "arbre":
+            raise AttributeError(nom)
+        return getattr(self.arbre, nom)
+
+    def __len__(self):
+        """Retourne le nombre d'éléments affichés (visibles ou non)."""
+        return len(self.elements)
+
+    def afficher(self, elements, conserver_position=False):
+        """
+        Remplace les éléments affichés.
+
+        Args:
+            elements (Sequence): Éléments à afficher (liste ou séquence indexable).
+            conserver_position (bool, optional): Garder la position de défilement (actualisation).
+                Par défaut: False (retour en haut du tableau).
+        """
+        self.elements = elements
+        self._cache = {}
+        self._selectionnes = set()
+        if not conserver_position:
+            self.debut = 0
+        self._rafraichir()
+
+    def actualiser(self):
+        """Met à jour les lignes visibles (éléments modifiés sur place)."""
+        self._cache = {}
+        self._rafraichir()
+
+    def selection(self):
+        """Retourne les lignes sélectionnées parmi les lignes visibles."""
+        return self.arbre.selection()
+
+    def element(self, item):
+        """
+        Retourne l'élément affiché sur une ligne du Treeview.
+
+        Args:
+            item (str): Identifiant de ligne (par exemple issu de `selection()`).
+
+        Returns:
+            object: Élément affiché, ou None si la ligne est vide.
+        """
+        if item not in self._lignes:
+            return None
+        position = self.debut + self._lignes.index(item)
+        return self.elements[position] if position < len(self.elements) else None
+
+    def elements_selectionnes(self):
+        """Retourne les éléments sélectionnés, y compris ceux qui ne sont plus visibles."""
+        return [self.elements[position] for position in sorted(self._selectionnes)
+                if position < len(self.elements)]
+
+    def voir(self, position):
+        """
+        Fait défiler le tableau pour rendre visible l'élément d'une position.
+
+        Args:
+            position (int): Position de l'élément.
+        """
+        if position < self.debut:
+            self._aller_a(position)
+        elif position >= self.debut + self._lignes_pleines():
+            self._aller_a(position - self._lignes_pleines() + 1)
+
+    def _lignes_pleines(self):
+        """Retourne le nombre de lignes entièrement visibles."""
+        return max(1, self._capacite - 1)
+
+    def _valeurs(self, position):
+        """Retourne (en cache) les valeurs mises en forme de l'élément d'une position."""
+        valeurs = self._cache.get(position)
+        if valeurs is None:
+            valeurs = self._cache[position] = self.formater(self.elements[position])
+        return valeurs
+
+    def _rafraichir(self):
+        """Remplit les lignes visibles et met à jour la barre de défilement."""
+        total = len(self.elements)
+        self.debut = max(0, min(self.debut, total - self._lignes_pleines()))
+        nombre = max(0, min(self._capacite, total - self.debut))
+
+        while len(self._lignes) < nombre:
+            self._lignes.append(self.arbre.insert("", "end", values=()))
+        selection = []
+        for k, ligne in enumerate(self._lignes):
+            position = self.debut + k
+            if k < nombre:
+                self.arbre.move(ligne, "", k)
+                self.arbre.item(ligne, values=self._valeurs(position))
+                if position in self._selectionnes:
+                    selection.append(ligne)
+            else:
+                self.arbre.detach(ligne)
+
+        self._selection_affichee = tuple(selection)
+        self.arbre.selection_set(selection)
+        self.arbre.yview_moveto(0)
+
+        # Cache limité aux abords de la zone visible
+        if len(self._cache) > self._capacite + 4 * self.MARGE_CACHE:
+            bas, haut = self.debut - self.MARGE_CACHE, self.debut + self._capacite + self.MARGE_CACHE
+            self._cache = {p: v for p, v in self._cache.items() if bas <= p < haut}
+
+        if total:
+            self.barre.set(self.debut / total, min(1.0, (self.debut + self._lignes_pleines()) / total))
+        else:
+            self.barre.set(0.0, 1.0)
+
+    def _aller_a(self, debut):
+        """Fait défiler le tableau jusqu'à une position."""
+        debut = max(0, min(int(debut), len(self.elements) - self._lignes_pleines()))
+        if debut != self.debut:
+            self.debut = debut
+            self._rafraichir()
+
+    def _defiler(self, action, valeur, unite=None):
+        """Commande de la barre de défilement (moveto ou scroll)."""
+        if action == "moveto":
+            self._aller_a(float(valeur) * len(self.elements))
+        elif unite == "pages":
+            self._aller_a(self.debut + int(valeur) * self._lignes_pleines())
+        else:
+            self._aller_a(self.debut + int(valeur))
+
+    def _molette(self, event):
+        """Défilement à la molette (Windows et macOS : delta ; X11 : boutons 4 et 5)."""
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self._aller_a(self.debut - self.PAS_MOLETTE)
+        else:
+            self._aller_a(self.debut + self.PAS_MOLETTE)
+        return "break"
+
+    def _clavier(self, pas):
+        """Déplace la sélection au clavier en faisant défiler le tableau si nécessaire."""
+        if not self.elements:
+            return "break"
+        courant = min(self._selectionnes) if self._selectionnes else self.debut - 1
+        if pas == "debut":
+            cible = 0
+        elif pas == "fin":
+            cible = len(self.elements) - 1
+        elif pas == "page-":
+            cible = courant - self._lignes_pleines()
+        elif pas == "page+":
+            cible = courant + self._lignes_pleines()
+        else:
+            cible = courant + pas
+        cible = max(0, min(cible, len(self.elements) - 1))
+        self._selectionnes = {cible}
+        self.voir(cible)
+        self._rafraichir()
+        self.arbre.event_generate("<<TreeviewSelect>>")
+        return "break"
+
+    def _memoriser_selection(self, event):
+        """Mémorise la sélection faite à la souris, par position d'élément."""
+        selection = self.arbre.selection()
+        if selection == self._selection_affichee:
+            return
+        self._selection_affichee = selection
+        self._selectionnes = {self.debut + self._lignes.index(ligne) for ligne in selection if ligne in self._lignes}
+
+    def _redimensionner(self, event):
+        """Adapte le nombre de lignes créées à la hauteur du tableau."""
+        hauteur_ligne = 20
+        haut_premiere = 25
+        if self._lignes and self.arbre.bbox(self._lignes[0]):
+            x, haut_premiere, largeur, hauteur_ligne = self.arbre.bbox(self._lignes[0])
+        capacite = max(1, (event.height - haut_premiere) // max(1, hauteur_ligne) + 1)
+        if capacite != self._capacite:
+            self._capacite = capacite
+            self._rafraichir()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Comparaison des temps de chargement du fichier des dépenses.
+Génère un fichier de test (1 000 000 de lignes par défaut) puis mesure le chargement
+ligne par ligne (csv.DictReader + Depense.from_dict) et le chargement par colonnes.
+
+Utilisation : python tests/benchmark_chargement.py [nombre_de_lignes]
+"""
+
+import csv
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Ajouter le répertoire parent au chemin de recherche des modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.finance.controllers.chargeur_csv import charger_colonnes, creer_elements
+from app.finance.models.depense import Depense
+
+CATEGORIES = ["alimentation", "transport", "logement", "loisirs", "sante", "divers"]
+
+def generer_fichier(chemin, nombre_lignes):
+    """Génère un fichier de dépenses aléatoires."""
+    aleatoire = random.Random(42)
+    debut = datetime.date(2015, 1, 1)
+    with open(chemin, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["montant", "categorie", "date", "notes", "recurrence", "id_transaction"])
+        for _ in range(nombre_lignes):
+            date = debut + datetime.timedelta(days=aleatoire.randrange(3650))
+            writer.writerow([f"{aleatoire.uniform(1, 500):.2f}", aleatoire.choice(CATEGORIES),
+                             date.isoformat(), "", "", ""])
+
+def charger_ligne_par_ligne(chemin):
+    """Chargement historique : une validation et un strptime par ligne."""
+    with open(chemin, newline="", encoding="utf-8") as f:
+        return [Depense.from_dict(row) for row in csv.DictReader(f)]
+
+def charger_par_colonnes(chemin):
+    """Chargement par colonnes puis construction des objets."""
+    colonnes, _ = charger_colonnes(chemin, "categorie")
+    return creer_elements(Depense, "categorie", colonnes)
+
+def mesurer(nom, fonction, chemin):
+    """Mesure la durée d'un chargement."""
+    debut = time.perf_counter()
+    resultat = fonction(chemin)
+    duree = time.perf_counter() - debut
+    print(f"{nom:<28} {duree:8.2f} s  ({len(resultat)} lignes)")
+    return duree
+
+def main():
+    """Point d'entrée du banc d'essai."""
+    nombre_lignes = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as repertoire:
+        chemin = os.path.join(repertoire, "Depenses.csv")
+        generer_fichier(chemin, nombre_lignes)
+
+        reference = mesurer("Ligne par ligne", charger_ligne_par_ligne, chemin)
+        colonnes = mesurer("Par colonnes (objets)", charger_par_colonnes, chemin)
+        mesurer("Par colonnes (sans objets)", lambda c: charger_colonnes(c, "categorie")[0]["montant"], chemin)
+        print(f"Gain: x{reference / colonnes:.1f}")
+
+if __name__ == "__main__":
+    main()
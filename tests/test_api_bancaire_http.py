@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests des échanges HTTP avec les API bancaires, sur un serveur local.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("keyring")
+
+from app.finance.integrations.api_bancaire import ConnexionAPISingleton
+from app.finance.integrations.api_bancaire_async import ConnexionAPIAsync
+
+
+class ServeurBancaire(BaseHTTPRequestHandler):
+    """API bancaire locale ; les réponses à servir sont placées dans `server.reponses`."""
+
+    protocol_version = "HTTP/1.1"  # Connexions conservées entre les requêtes
+
+    def do_GET(self):
+        with self.server.verrou:
+            self.server.requetes.append((self.path, self.client_address[1]))
+            code, entetes, corps = self.server.reponses.pop(0) if self.server.reponses else (200, {}, {})
+            self.server.en_cours += 1
+            self.server.max_en_cours = max(self.server.max_en_cours, self.server.en_cours)
+        time.sleep(self.server.delai)
+        with self.server.verrou:
+            self.server.en_cours -= 1
+        contenu = json.dumps(corps).encode()
+        self.send_response(code)
+        for nom, valeur in entetes.items():
+            self.send_header(nom, valeur)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(contenu)))
+        self.end_headers()
+        self.wfile.write(contenu)
+
+    do_POST = do_GET
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Connexion à une banque de test servie localement."""
+    serveur = ThreadingHTTPServer(("127.0.0.1", 0), ServeurBancaire)
+    serveur.requetes = []
+    serveur.reponses = []
+    serveur.verrou = threading.Lock()
+    serveur.delai = 0
+    serveur.en_cours = serveur.max_en_cours = 0
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+
+    api = ConnexionAPISingleton()
+    monkeypatch.setitem(api.api_configs, "test", {
+        "base_url": f"http://127.0.0.1:{serveur.server_port}",
+        "client_id": "id", "client_secret": "secret",
+        "accounts_url": "/accounts",
+        "transactions_url": "/accounts/{account_id}/transactions"
+    })
+    monkeypatch.setitem(api.tokens, "test", {"access_token": "jeton", "timestamp": time.time()})
+    monkeypatch.setitem(api.verrous_tokens, "test", threading.Lock())
+    monkeypatch.setattr(ConnexionAPISingleton, "FACTEUR_ATTENTE", 0.01)
+    api.serveur = serveur
+    yield api
+    api.close_sessions()
+    serveur.shutdown()
+    serveur.server_close()
+
+
+def test_nouvelle_tentative_et_connexion_conservee(api):
+    """Une réponse 429 est retentée après Retry-After, sur la même connexion."""
+    api.serveur.reponses = [(429, {"Retry-After": "0"}, {}), (200, {}, {"accounts": [{"id": "C1"}]})]
+
+    assert api.get_accounts("test") == {"accounts": [{"id": "C1"}]}
+    assert api.get_accounts("test") == {}
+    ports = {port for _, port in api.serveur.requetes}
+    assert len(api.serveur.requetes) == 3
+    assert len(ports) == 1
+
+
+def test_transactions_paginees(api):
+    """Les pages sont suivies (lien, curseur ou numéro) et demandées une à une."""
+    api.serveur.reponses = [
+        (200, {}, {"transactions": [{"id": "T1"}], "links": {"next": "/accounts/C1/transactions?page=2"}}),
+        (200, {}, {"transactions": [{"id": "T2"}]}),
+        (200, {}, {"transactions": [{"id": "T3"}], "next_cursor": "abc"}),
+        (200, {}, {"transactions": [{"id": "T4"}], "next_cursor": None}),
+        (200, {}, {"transactions": [{"id": "T5"}], "pagination": {"page": 1, "total_pages": 2}}),
+        (200, {}, {"transactions": [{"id": "T6"}], "pagination": {"page": 2, "total_pages": 2}}),
+    ]
+
+    pages = api.iter_transactions("test", "C1")
+    assert next(pages) == [{"id": "T1"}]
+    assert len(api.serveur.requetes) == 1
+    assert list(pages) == [[{"id": "T2"}]]
+    assert api.get_transactions("test", "C2") == {"transactions": [{"id": "T3"}, {"id": "T4"}]}
+    assert len(api.get_transactions("test", "C3")["transactions"]) == 2
+    assert [chemin for chemin, _ in api.serveur.requetes] == [
+        "/accounts/C1/transactions", "/accounts/C1/transactions?page=2",
+        "/accounts/C2/transactions", "/accounts/C2/transactions?cursor=abc",
+        "/accounts/C3/transactions", "/accounts/C3/transactions?page=2"]
+
+
+def test_client_asynchrone(api):
+    """Le client asynchrone retente, suit les pages et limite les requêtes simultanées par hôte."""
+    api.serveur.reponses = [
+        (503, {"Retry-After": "0"}, {}),
+        (200, {}, {"transactions": [{"id": "T1"}], "next_cursor": "abc"}),
+        (200, {}, {"transactions": [{"id": "T2"}]}),
+    ]
+
+    async def scenario():
+        async with ConnexionAPIAsync(api, max_requetes_par_hote=2) as client:
+            transactions = await client.get_transactions("test", "C1")
+            api.serveur.delai = 0.05
+            comptes = await asyncio.gather(*(client.get_accounts("test") for _ in range(6)))
+            return transactions, comptes
+
+    transactions, comptes = asyncio.run(scenario())
+    assert transactions == {"transactions": [{"id": "T1"}, {"id": "T2"}]}
+    assert comptes == [{}] * 6
+    assert len(api.serveur.requetes) == 9
+    assert api.serveur.max_en_cours == 2
+
+
+def test_nouvelles_tentatives_limitees(api, monkeypatch):
+    """Un POST en erreur 5xx n'est pas rejoué, et l'attente imposée par Retry-After est plafonnée."""
+    monkeypatch.setattr(ConnexionAPISingleton, "DELAI_MAX_RETRY_AFTER", 0.01)
+    url = f"{api.api_configs['test']['base_url']}/accounts"
+    api.serveur.reponses = [(503, {}, {}), (429, {"Retry-After": "3600"}, {}), (200, {}, {})]
+
+    assert api.get_session("test").post(url).status_code == 503
+    debut = time.monotonic()
+    assert api.get_session("test").get(url).status_code == 200
+    assert time.monotonic() - debut < 5
+    assert len(api.serveur.requetes) == 3
+
+    api.serveur.reponses = [(503, {}, {}), (429, {"Retry-After": "3600"}, {}), (200, {}, {})]
+
+    async def scenario():
+        async with ConnexionAPIAsync(api) as client:
+            return ((await client._requete("test", "POST", url)).status_code,
+                    (await client._requete("test", "GET", url)).status_code)
+
+    assert asyncio.run(scenario()) == (503, 200)
+    assert len(api.serveur.requetes) == 6
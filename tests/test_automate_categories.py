@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests de l'automate de reconnaissance des catégories.
+"""
+
+import random
+
+from app.finance.controllers.automate_categories import AutomateCategories
+
+
+def deviner_sequentiellement(correspondances, texte):
+    """Parcours séquentiel des mots-clés, comportement de référence."""
+    for mot_cle, categorie in correspondances.items():
+        if mot_cle in texte:
+            return categorie
+    return None
+
+
+def test_priorite_a_l_ordre_des_mots_cles():
+    """Le premier mot-clé du dictionnaire présent dans le texte l'emporte, même chevauchant."""
+    automate = AutomateCategories({"SNCF CONNECT": "transport", "CARREFOUR": "alimentation",
+                                   "CARREFOUR CITY": "alimentation_proximite", "NECT": "abonnements"})
+
+    assert automate.rechercher("CB CARREFOUR CITY PARIS") == "alimentation"
+    assert automate.rechercher("PRLV SNCF CONNECT") == "transport"
+    assert automate.rechercher("CONNECTE") == "abonnements"
+    assert automate.rechercher("VIREMENT") is None
+
+    generateur = random.Random(0)
+    mots_cles = {"".join(generateur.choice("ABC") for _ in range(generateur.randint(1, 4))): str(i)
+                 for i in range(40)}
+    automate = AutomateCategories(mots_cles)
+    for _ in range(500):
+        texte = "".join(generateur.choice("ABCD") for _ in range(generateur.randint(0, 12)))
+        assert automate.rechercher(texte) == deviner_sequentiellement(mots_cles, texte)
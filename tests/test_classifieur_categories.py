@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests du classifieur de catégories appris sur les libellés.
+"""
+
+import random
+import time
+
+from app.finance.controllers import classifieur_categories
+from app.finance.controllers.classifieur_categories import (ClassifieurCategories, charger_modeles,
+                                                            sauvegarder_modeles)
+
+
+def exemples(nombre, generateur):
+    """Libellés bancaires fictifs et leurs catégories."""
+    enseignes = {"alimentation": ["CARREFOUR", "LIDL", "MONOPRIX"], "transport": ["SNCF", "TOTALENERGIES", "RATP"],
+                 "abonnements": ["NETFLIX", "SPOTIFY", "FREE MOBILE"]}
+    resultat = []
+    for _ in range(nombre):
+        categorie = generateur.choice(sorted(enseignes))
+        libelle = f"CB {generateur.choice(enseignes[categorie])} {generateur.randint(1, 28):02d}/01 CARTE 4974"
+        resultat.append((libelle, categorie))
+    return resultat
+
+
+def test_prediction_par_lot_et_persistance(tmp_path, monkeypatch):
+    """Les prédictions par lot (NumPy ou Python pur) survivent à la sauvegarde du modèle."""
+    generateur = random.Random(1)
+    classifieur = ClassifieurCategories()
+    classifieur.entrainer(exemples(300, generateur))
+    tests = exemples(1000, generateur)
+    libelles = [libelle for libelle, _ in tests]
+
+    predictions = classifieur.predire(libelles)
+    assert predictions == [categorie for _, categorie in tests]
+    assert classifieur.predire(["VIREMENT 2025", ""]) == [None, None]
+
+    sauvegarder_modeles({"depenses": classifieur}, str(tmp_path / "modele.json"))
+    recharge = charger_modeles(str(tmp_path / "modele.json"))["depenses"]
+    debut = time.perf_counter()
+    assert recharge.predire(libelles) == predictions
+    assert time.perf_counter() - debut < 1.0
+
+    monkeypatch.setattr(classifieur_categories, "np", None)
+    assert ClassifieurCategories.depuis_dict(recharge.vers_dict()).predire(libelles) == predictions
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests du gestionnaire financier (persistance et calculs).
+"""
+
+import datetime
+import os
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from app.finance.controllers.gestionnaire_financier import GestionnaireFinancier
+from app.finance.models.depense import Depense
+from app.finance.models.revenu import Revenu
+
+
+def creer_gestionnaire(tmp_path, **kwargs):
+    """Crée un gestionnaire financier travaillant dans un répertoire temporaire."""
+    return GestionnaireFinancier(
+        fichier_depenses=str(tmp_path / "Depenses.csv"),
+        fichier_revenus=str(tmp_path / "Revenus.csv"),
+        **kwargs
+    )
+
+
+def test_ajout_en_fin_de_fichier(tmp_path):
+    """Ajouter une dépense n'écrit que la nouvelle ligne."""
+    gestionnaire = creer_gestionnaire(tmp_path)
+    gestionnaire.ajouter_depense(Depense(12.5, "alimentation", datetime.date(2025, 1, 3)))
+    taille = os.path.getsize(gestionnaire.fichier_depenses)
+
+    gestionnaire.ajouter_depense(Depense(40.0, "transport", datetime.date(2025, 1, 4)))
+    gestionnaire.ajouter_revenu(Revenu(1500.0, "salaire", datetime.date(2025, 1, 1)))
+    gestionnaire.fermer()
+
+    with open(gestionnaire.fichier_depenses, encoding="utf-8") as f:
+        contenu = f.read()
+    assert contenu.count("\n") == 3
+    assert os.path.getsize(gestionnaire.fichier_depenses) > taille
+
+    recharge = creer_gestionnaire(tmp_path)
+    assert [d.montant for d in recharge.depenses] == [12.5, 40.0]
+    assert [r.source for r in recharge.revenus] == ["salaire"]
+
+
+def test_modification_et_suppression(tmp_path):
+    """Modifier ou supprimer une dépense réécrit le fichier."""
+    gestionnaire = creer_gestionnaire(tmp_path)
+    depense = Depense(10.0, "divers", datetime.date(2025, 2, 1))
+    autre = Depense(20.0, "loisirs", datetime.date(2025, 2, 2))
+    gestionnaire.ajouter_depense(depense)
+    gestionnaire.ajouter_depense(autre)
+
+    gestionnaire.modifier_depense(depense, Depense(15.0, "divers", datetime.date(2025, 2, 1)))
+    gestionnaire.supprimer_depense(autre)
+    with pytest.raises(ValueError):
+        gestionnaire.supprimer_depense(autre)
+
+    recharge = creer_gestionnaire(tmp_path)
+    assert [d.montant for d in recharge.depenses] == [15.0]
+
+
+def test_ligne_tronquee_ignoree(tmp_path):
+    """Une dernière ligne interrompue est supprimée au chargement, même avec toutes ses colonnes."""
+    gestionnaire = creer_gestionnaire(tmp_path)
+    gestionnaire.ajouter_depense(Depense(10.0, "divers", datetime.date(2025, 2, 1)))
+    gestionnaire.fermer()
+
+    for ligne in ("99.0,divers,2025-", "99.0,divers,2025-02-03,,,a1b2"):
+        with open(gestionnaire.fichier_depenses, "a", encoding="utf-8") as f:
+            f.write(ligne)
+
+        recharge = creer_gestionnaire(tmp_path)
+        assert [d.montant for d in recharge.depenses] == [10.0]
+        recharge.fermer()
+
+
+def test_solde_et_filtre_par_periode(tmp_path):
+    """Les calculs par période s'appuient sur l'index par date."""
+    gestionnaire = creer_gestionnaire(tmp_path)
+    gestionnaire.ajouter_revenu(Revenu(1000.0, "salaire", datetime.date(2025, 3, 1)))
+    gestionnaire.ajouter_depense(Depense(30.0, "transport", datetime.date(2025, 3, 10)))
+    gestionnaire.ajouter_depense(Depense(20.0, "loisirs", datetime.date(2025, 1, 5)))
+    depense = Depense(50.0, "alimentation", datetime.date(2025, 3, 20))
+    gestionnaire.ajouter_depense(depense)
+
+    mars = (datetime.date(2025, 3, 1), datetime.date(2025, 3, 31))
+    assert gestionnaire.calculer_solde_periode(*mars) == pytest.approx(920.0)
+    assert [d.montant for d in gestionnaire.depenses_periode(*mars)] == [30.0, 50.0]
+
+    gestionnaire.modifier_depense(depense, Depense(50.0, "alimentation", datetime.date(2025, 4, 2)))
+    assert gestionnaire.calculer_solde_periode(*mars) == pytest.approx(970.0)
+
+    # Chaque modification est comptée ; une modification interrompue par une erreur
+    # est réindexée à la requête suivante
+    modifications = gestionnaire.modifications["depenses"]
+    with pytest.raises(RuntimeError):
+        with gestionnaire._modification("depenses"):
+            gestionnaire.depenses.append(Depense(5.0, "divers", datetime.date(2025, 3, 15)))
+            raise RuntimeError("interruption")
+    assert gestionnaire.modifications["depenses"] == modifications + 1
+    assert gestionnaire.calculer_solde_periode(*mars) == pytest.approx(965.0)
+    assert len(gestionnaire.depenses_periode(datetime.date(2025, 2, 1))) == 3
+
+
+def test_agregats_mis_a_jour_par_difference(tmp_path):
+    """Les totaux mensuels et par catégorie suivent les ajouts, modifications et suppressions."""
+    gestionnaire = creer_gestionnaire(tmp_path)
+    gestionnaire.ajouter_revenu(Revenu(1200.0, "salaire", datetime.date(2025, 5, 2)))
+    courses = Depense(80.0, "alimentation", datetime.date(2025, 5, 3))
+    transport = Depense(25.0, "transport", datetime.date(2025, 6, 1))
+    gestionnaire.ajouter_depense(courses)
+    gestionnaire.ajouter_depense(transport)
+
+    assert gestionnaire.depenses_mensuelles() == {"2025-05": 80.0, "2025-06": 25.0}
+    assert gestionnaire.calculer_solde() == pytest.approx(1095.0)
+
+    gestionnaire.modifier_depense(courses, Depense(60.0, "loisirs", datetime.date(2025, 6, 4)))
+    assert gestionnaire.depenses_mensuelles() == {"2025-06": pytest.approx(85.0)}
+    assert gestionnaire.total_depenses_par_categorie() == {"transport": 25.0, "loisirs": 60.0}
+
+    gestionnaire.supprimer_depense(transport)
+    assert gestionnaire.depenses_du_mois("2025-06") == pytest.approx(60.0)
+    assert gestionnaire.revenus_du_mois("2025-05") == 1200.0
+    assert gestionnaire.total_revenus_par_source() == {"salaire": 1200.0}
+
+
+def test_stockage_colonnaire_equivalent(tmp_path):
+    """Le stockage colonnaire donne les mêmes résultats que les listes."""
+    pytest.importorskip("numpy")
+    gestionnaire = creer_gestionnaire(tmp_path)
+    gestionnaire.ajouter_revenu(Revenu(900.0, "salaire", datetime.date(2025, 7, 1)))
+    gestionnaire.ajouter_depense(Depense(40.0, "transport", datetime.date(2025, 7, 3)))
+    gestionnaire.ajouter_depense(Depense(15.0, "loisirs", datetime.date(2025, 8, 9)))
+    gestionnaire.fermer()
+
+    colonnaire = creer_gestionnaire(tmp_path, stockage_colonnaire=True)
+    depense = colonnaire.depenses[1]
+    colonnaire.modifier_depense(depense, Depense(20.0, "loisirs", datetime.date(2025, 8, 9)))
+    colonnaire.ajouter_depense(Depense(5.0, "transport", datetime.date(2025, 7, 20)))
+
+    juillet = (datetime.date(2025, 7, 1), datetime.date(2025, 7, 31))
+    assert colonnaire.calculer_solde() == pytest.approx(835.0)
+    assert colonnaire.calculer_solde_periode(*juillet) == pytest.approx(855.0)
+    assert colonnaire.depenses_mensuelles() == {"2025-07": 45.0, "2025-08": 20.0}
+    assert colonnaire.total_depenses_par_categorie() == {"transport": 45.0, "loisirs": 20.0}
+    assert [d.montant for d in colonnaire.depenses_periode(*juillet)] == [40.0, 5.0]
+
+    recharge = creer_gestionnaire(tmp_path)
+    assert recharge.depenses_mensuelles() == colonnaire.depenses_mensuelles()
+
+
+def test_lignes_invalides_resumees(tmp_path, capsys):
+    """Les lignes invalides sont écartées et signalées en un seul message."""
+    fichier = tmp_path / "Depenses.csv"
+    fichier.write_text(
+        "montant,categorie,date,notes,recurrence,id_transaction\r\n"
+        "12.5,alimentation,2025-01-03,,,\r\n"
+        "abc,divers,2025-01-04,,,\r\n"
+        "8,transport,2025-13-01,,,\r\n"
+        "3,loisirs,2025-1-9,cinéma,Mensuelle,T1\r\n",
+        encoding="utf-8"
+    )
+
+    gestionnaire = creer_gestionnaire(tmp_path)
+    sortie = capsys.readouterr().out
+
+    assert [d.montant for d in gestionnaire.depenses] == [12.5, 3.0]
+    assert gestionnaire.depenses[0].recurrence == "Aucune"
+    assert gestionnaire.depenses[1].date == datetime.date(2025, 1, 9)
+    assert gestionnaire.depenses[1].id_transaction == "T1"
+    assert sortie.count("invalide(s)") == 1
+    assert "ligne 3" in sortie and "ligne 4" in sortie
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests du gestionnaire de stock (persistance et index).
+"""
+
+import datetime
+import os
+
+import pytest
+
+from app.stock.controllers.gestionnaire_stock import GestionnaireStock
+from app.stock.models.article import Article
+
+
+def creer_gestionnaire(tmp_path, **kwargs):
+    """Crée un gestionnaire de stock travaillant dans un répertoire temporaire."""
+    return GestionnaireStock(
+        fichier_articles=str(tmp_path / "Articles.csv"),
+        fichier_transactions=str(tmp_path / "TransactionsStock.csv"),
+        **kwargs
+    )
+
+
+def test_mouvements_journalises_sans_reecriture(tmp_path):
+    """Les mouvements sont ajoutés au journal sans réécrire les CSV."""
+    gestionnaire = creer_gestionnaire(tmp_path)
+    gestionnaire.ajouter_article(Article("A1", "Vis", "Quincaillerie", quantite=10))
+
+    taille_articles = os.path.getsize(gestionnaire.fichier_articles)
+    taille_transactions = os.path.getsize(gestionnaire.fichier_transactions)
+
+    gestionnaire.entrer_stock("A1", 5)
+    gestionnaire.sortir_stock("A1", 3)
+    gestionnaire.ajuster_stock("A1", 20)
+
+    assert os.path.getsize(gestionnaire.fichier_articles) == taille_articles
+    assert os.path.getsize(gestionnaire.fichier_transactions) == taille_transactions
+    assert gestionnaire.taille_journal == 3
+
+
+def test_rejeu_du_journal_au_chargement(tmp_path):
+    """Le journal est rejoué par-dessus l'instantané CSV au chargement."""
+    gestionnaire = creer_gestionnaire(tmp_path)
+    gestionnaire.ajouter_article(Article("A1", "Vis", "Quincaillerie", quantite=10))
+    gestionnaire.entrer_stock("A1", 5)
+    gestionnaire.sortir_stock("A1", 3)
+
+    recharge = creer_gestionnaire(tmp_path)
+    assert recharge.articles["A1"].quantite == 12
+    assert len(recharge.transactions) == 2
+    assert recharge.taille_journal == 2
+
+
+def test_compaction_periodique(tmp_path):
+    """Le journal est reporté dans les CSV une fois le seuil atteint."""
+    gestionnaire = creer_gestionnaire(tmp_path, seuil_compaction=3)
+    gestionnaire.ajouter_article(Article("A1", "Vis", "Quincaillerie", quantite=0))
+    for _ in range(3):
+        gestionnaire.entrer_stock("A1", 1)
+
+    assert gestionnaire.taille_journal == 0
+    assert not os.path.exists(gestionnaire.fichier_journal)
+
+    recharge = creer_gestionnaire(tmp_path)
+    assert recharge.articles["A1"].quantite == 3
+    assert len(recharge.transactions) == 3
+
+
+def test_compaction_interrompue_sans_doublon(tmp_path):
+    """Un journal non vidé après compaction ne duplique pas les transactions."""
+    gestionnaire = creer_gestionnaire(tmp_path)
+    gestionnaire.ajouter_article(Article("A1", "Vis", "Quincaillerie", quantite=0))
+    gestionnaire.entrer_stock("A1", 4)
+
+    # Simuler une compaction interrompue avant la suppression du journal
+    with open(gestionnaire.fichier_journal, "rb") as f:
+        contenu_journal = f.read()
+    gestionnaire.compacter_journal()
+    with open(gestionnaire.fichier_journal, "wb") as f:
+        f.write(contenu_journal)
+
+    recharge = creer_gestionnaire(tmp_path)
+    assert recharge.articles["A1"].quantite == 4
+    assert len(recharge.transactions) == 1
+
+
+def test_ligne_incomplete_du_journal_ignoree(tmp_path):
+    """Une dernière ligne interrompue du journal est écartée, même si toutes ses colonnes sont là."""
+    gestionnaire = creer_gestionnaire(tmp_path)
+    gestionnaire.ajouter_article(Article("A1", "Vis", "Quincaillerie", quantite=0))
+    gestionnaire.entrer_stock("A1", 2)
+
+    # La quantité de l'article (dernière colonne) a été coupée : 12 au lieu de 120
+    with open(gestionnaire.fichier_journal, "a", encoding="utf-8") as f:
+        f.write("1,A1,entree,118,2025-01-02 10:00:00,,,,12")
+
+    recharge = creer_gestionnaire(tmp_path)
+    assert recharge.articles["A1"].quantite == 2
+    assert len(recharge.transactions) == 1
+
+    # La compaction n'écrit pas à la suite d'une transaction laissée incomplète
+    with open(recharge.fichier_transactions, "a", encoding="utf-8") as f:
+        f.write("A1,sortie,5,2025-01-02 11:00:00")
+    recharge.entrer_stock("A1", 1)
+    recharge.compacter_journal()
+    assert len(creer_gestionnaire(tmp_path).transactions) == 2
+
+
+def test_recherche_indexee(tmp_path):
+    """La recherche suit les ajouts, modifications et suppressions d'articles."""
+    gestionnaire = creer_gestionnaire(tmp_path)
+    gestionnaire.ajouter_article(Article("A1", "Vis à bois", "Quincaillerie", code_produit="VB-100"))
+    gestionnaire.ajouter_article(Article("A2", "Boulon", "Quincaillerie", code_produit="BL-200"))
+    gestionnaire.ajouter_article(Article("A3", "Bois de chêne", "Bois"))
+
+    def ids(terme, categorie=None):
+        return [a.id for a in gestionnaire.rechercher_articles(terme, categorie)]
+
+    assert ids("BOIS") == ["A1", "A3"]
+    assert ids("bois", "Bois") == ["A3"]
+    assert ids("l-2") == ["A2"]
+    assert ids("o") == ["A1", "A2", "A3"]
+    assert ids("", "Quincaillerie") == ["A1", "A2"]
+    assert [a.id for a in gestionnaire.obtenir_articles_par_code("vb-100")] == ["A1"]
+
+    # Modification sur place (comme dans le formulaire) puis suppression
+    article = gestionnaire.articles["A1"]
+    article.nom = "Clou"
+    article.categorie = "Fixations"
+    gestionnaire.modifier_article(article)
+    gestionnaire.supprimer_article("A3")
+    gestionnaire.ajouter_article(Article("A4", "Boîte à clous", "Fixations"))
+
+    assert ids("bois") == []
+    assert ids("clou") == ["A1", "A4"]
+    assert ids("", "Quincaillerie") == ["A2"]
+    assert ids("", "Fixations") == ["A1", "A4"]
+
+
+def test_historique_par_article(tmp_path):
+    """L'historique d'un article suit les mouvements, avant et après rechargement."""
+    gestionnaire = creer_gestionnaire(tmp_path)
+    gestionnaire.ajouter_article(Article("A1", "Vis", "Quincaillerie", quantite=10))
+    gestionnaire.ajouter_article(Article("A2", "Boulon", "Quincaillerie", quantite=10))
+    gestionnaire.entrer_stock("A1", 5)
+    assert [t.quantite for t in gestionnaire.obtenir_transactions_par_article("A1")] == [5]
+
+    gestionnaire.sortir_stock("A2", 2)
+    gestionnaire.sortir_stock("A1", 3)
+    assert [t.quantite for t in gestionnaire.obtenir_transactions_par_article("A1")] == [5, 3]
+    assert [t.quantite for t in gestionnaire.obtenir_transactions_par_article("A2")] == [2]
+    assert gestionnaire.obtenir_transactions_par_article("A3") == []
+
+    recharge = creer_gestionnaire(tmp_path)
+    assert [t.quantite for t in recharge.obtenir_transactions_par_article("A1")] == [5, 3]
+
+
+def test_articles_en_alerte_et_en_rupture(tmp_path):
+    """Les articles en alerte et en rupture suivent les mouvements, les modifications et le rechargement."""
+    gestionnaire = creer_gestionnaire(tmp_path)
+    gestionnaire.ajouter_article(Article("A1", "Vis", "Quincaillerie", quantite=10, seuil_alerte=5))
+    gestionnaire.ajouter_article(Article("A2", "Boulon", "Quincaillerie", quantite=3, seuil_alerte=5))
+    assert [a.id for a in gestionnaire.obtenir_articles_en_alerte()] == ["A2"]
+    assert gestionnaire.compter_articles_en_rupture() == 0
+
+    gestionnaire.sortir_stock("A1", 6)
+    gestionnaire.sortir_stock("A2", 3)
+    assert [a.id for a in gestionnaire.obtenir_articles_en_alerte()] == ["A1"]
+    assert [a.id for a in gestionnaire.obtenir_articles_en_rupture()] == ["A2"]
+
+    # Seuil abaissé dans le formulaire, puis réassort et suppression
+    article = gestionnaire.articles["A1"]
+    article.seuil_alerte = 2
+    gestionnaire.modifier_article(article)
+    gestionnaire.entrer_stock("A2", 1)
+    assert [a.id for a in gestionnaire.obtenir_articles_en_alerte()] == ["A2"]
+    assert gestionnaire.compter_articles_en_rupture() == 0
+
+    gestionnaire.ajuster_stock("A1", 0)
+    gestionnaire.supprimer_article("A2")
+    assert gestionnaire.compter_articles_en_alerte() == 0
+    assert [a.id for a in gestionnaire.obtenir_articles_en_rupture()] == ["A1"]
+
+    rapport = creer_gestionnaire(tmp_path).generer_rapport_stock()
+    assert (rapport["articles_en_alerte"], rapport["articles_en_rupture"]) == (0, 1)
+
+
+def test_totaux_du_stock_incrementaux(tmp_path):
+    """Valeur et totaux par catégorie suivent chaque mutation (contrôlés par recalcul complet)."""
+    gestionnaire = creer_gestionnaire(tmp_path, verifier_totaux=True)
+    gestionnaire.ajouter_article(Article("A1", "Vis", "Quincaillerie", quantite=10, prix_unitaire=0.5))
+    assert gestionnaire.obtenir_valeur_totale_stock() == pytest.approx(5.0)
+
+    gestionnaire.ajouter_article(Article("A2", "Planche", "Bois", quantite=4, prix_unitaire=12.0))
+    gestionnaire.entrer_stock("A1", 10)
+    gestionnaire.sortir_stock("A2", 1)
+    article = gestionnaire.articles["A1"]
+    article.prix_unitaire = 0.25
+    article.categorie = "Fixations"
+    gestionnaire.modifier_article(article)
+    gestionnaire.ajouter_article(Article("A3", "Tasseau", "Bois", quantite=2, prix_unitaire=3.0))
+    gestionnaire.ajuster_stock("A3", 5)
+
+    rapport = gestionnaire.generer_rapport_stock()
+    assert rapport["valeur_totale"] == pytest.approx(5.0 + 36.0 + 15.0)
+    assert rapport["categories"] == {
+        "Fixations": {"nombre": 1, "valeur": pytest.approx(5.0)},
+        "Bois": {"nombre": 2, "valeur": pytest.approx(51.0)},
+    }
+
+    gestionnaire.supprimer_article("A1")
+    assert set(gestionnaire.generer_rapport_stock()["categories"]) == {"Bois"}
+    assert creer_gestionnaire(tmp_path).obtenir_valeur_totale_stock() == pytest.approx(51.0)
+
+    # Une quantité modifiée hors du gestionnaire est détectée par le contrôle
+    gestionnaire.articles["A2"].quantite = 100
+    with pytest.raises(ValueError):
+        gestionnaire.obtenir_valeur_totale_stock()
+
+
+def test_index_de_peremption(tmp_path):
+    """Articles périmés, périmant bientôt et ordre FEFO, suivis au fil des mouvements."""
+    aujourd_hui = datetime.date(2024, 6, 10)
+    gestionnaire = creer_gestionnaire(tmp_path)
+    for id_article, jours in (("A1", -2), ("A2", 0), ("A3", 5), ("A4", 3), ("A5", 30)):
+        gestionnaire.ajouter_article(Article(id_article, "Yaourt", "Frais", quantite=4,
+                                             date_peremption=aujourd_hui + datetime.timedelta(days=jours)))
+    gestionnaire.ajouter_article(Article("A6", "Sel", "Épicerie", quantite=4))
+
+    def ids(articles):
+        return [a.id for a in articles]
+
+    assert ids(gestionnaire.obtenir_articles_perimes(aujourd_hui)) == ["A1"]
+    assert ids(gestionnaire.obtenir_articles_perimant_dans(5, aujourd_hui)) == ["A2", "A4", "A3"]
+    assert ids(gestionnaire.obtenir_prochains_articles_a_perimer(2, aujourd_hui)) == ["A2", "A4"]
+
+    # Un article épuisé sort de l'index ; une date modifiée le replace
+    gestionnaire.sortir_stock("A2", 4)
+    article = gestionnaire.articles["A5"]
+    article.date_peremption = aujourd_hui + datetime.timedelta(days=1)
+    gestionnaire.modifier_article(article)
+    gestionnaire.supprimer_article("A1")
+    assert ids(gestionnaire.obtenir_articles_perimes(aujourd_hui)) == []
+    assert ids(gestionnaire.obtenir_prochains_articles_a_perimer(10, aujourd_hui)) == ["A5", "A4", "A3"]
+    gestionnaire.entrer_stock("A2", 1)
+    assert ids(gestionnaire.obtenir_articles_perimant_dans(1, aujourd_hui)) == ["A2", "A5"]
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests de l'import de relevés bancaires CSV, OFX et QIF.
+"""
+
+import datetime
+import hashlib
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from app.finance.controllers.gestionnaire_financier import GestionnaireFinancier
+from app.finance.integrations import import_releves
+from app.finance.integrations.import_releves import ImportateurReleves, convertir_montant
+
+OFX = """OFXHEADER:100
+DATA:OFXSGML
+CHARSET:1252
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250102120000[+1:CET]<TRNAMT>-12.30<FITID>F1<NAME>CARREFOUR<MEMO>Caf\xe9</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20250103<TRNAMT>1500.00<FITID>F2<NAME>SALAIRE &amp; PRIMES</STMTTRN>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>inconnue<TRNAMT>-1<FITID>F3<NAME>X</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>"""
+
+QIF = """!Account
+NCompte courant
+^
+!Type:Bank
+D02/01/2025
+T-12,30
+PCARREFOUR
+^
+D3/01'25
+T1.500,00
+PSALAIRE
+^
+"""
+
+
+@pytest.fixture
+def gestionnaire(tmp_path):
+    """Gestionnaire financier travaillant dans un répertoire temporaire."""
+    return GestionnaireFinancier(str(tmp_path / "Depenses.csv"), str(tmp_path / "Revenus.csv"), instantanes=False)
+
+
+def importateur(gestionnaire):
+    """Importateur catégorisant tous les libellés de la même façon, par petits paquets."""
+    return ImportateurReleves(gestionnaire, lambda type_, libelles: [type_.lower()] * len(libelles), taille_lot=2)
+
+
+def test_montants_francais_et_anglais():
+    """Les séparateurs de milliers et décimaux usuels sont reconnus."""
+    assert convertir_montant("-1 234,56 €") == -1234.56
+    assert convertir_montant("1.234,56") == 1234.56
+    assert convertir_montant("-1,234.56") == -1234.56
+    for texte in ("nan", "inf", "-Infinity"):
+        with pytest.raises(ValueError):
+            convertir_montant(texte)
+
+
+def test_formats_et_dedoublonnage(gestionnaire, tmp_path, monkeypatch):
+    """CSV, OFX (lu par blocs coupant les balises) et QIF donnent les mêmes opérations, importées une fois."""
+    monkeypatch.setattr(import_releves, "TAILLE_BLOC", 7)
+    (tmp_path / "releve.csv").write_text(
+        "﻿Date opération;Libellé;Débit;Crédit\n02/01/2025;CARREFOUR;12,30;\n"
+        "03/01/2025;SALAIRE;;1 500,00\n31/02/2025;ILLISIBLE;1;\n", encoding="utf-8")
+    (tmp_path / "releve.ofx").write_bytes(OFX.replace("\n<STMTTRN>", "<STMTTRN>").encode("cp1252"))
+    (tmp_path / "releve.qif").write_text(QIF, encoding="utf-8")
+    progressions = []
+
+    stats = importateur(gestionnaire).importer(str(tmp_path / "releve.csv"),
+                                               lambda lus, taille, _: progressions.append((lus, taille)))
+    assert stats == {"depenses_ajoutees": 1, "revenus_ajoutes": 1, "transactions_ignorees": 0, "lignes_invalides": 1}
+    assert progressions[-1][0] == progressions[-1][1]
+
+    stats = importateur(gestionnaire).importer(str(tmp_path / "releve.ofx"))
+    assert stats == {"depenses_ajoutees": 1, "revenus_ajoutes": 1, "transactions_ignorees": 0, "lignes_invalides": 1}
+    assert [(d.montant, d.categorie, d.notes) for d in gestionnaire.depenses[1:]] == [(12.3, "debit", "CARREFOUR Café")]
+    assert gestionnaire.revenus[1].notes == "SALAIRE & PRIMES"
+
+    # Sans identifiant, le QIF est dédoublonné par date, montant et libellé (comme le CSV)
+    stats = importateur(gestionnaire).importer(str(tmp_path / "releve.qif"))
+    assert stats["transactions_ignorees"] == 2
+    assert gestionnaire.revenus[0].date == datetime.date(2025, 1, 3)
+    assert gestionnaire.calculer_solde() == pytest.approx(2 * (1500 - 12.3))
+
+
+def test_operations_identiques_sans_reference(gestionnaire, tmp_path):
+    """Deux opérations identiques d'un relevé sont importées toutes deux, une seule fois, avec
+    des identifiants distincts par rang ; un montant non fini est une ligne invalide."""
+    (tmp_path / "releve.csv").write_text(
+        "Date;Libellé;Montant\n02/01/2025;CAFE;-2,50\n02/01/2025;CAFE;-2,50\n"
+        "02/01/2025;CAFE;nan\n03/01/2025;CAFE;inf\n", encoding="utf-8")
+
+    stats = importateur(gestionnaire).importer(str(tmp_path / "releve.csv"))
+    assert stats == {"depenses_ajoutees": 2, "revenus_ajoutes": 0, "transactions_ignorees": 0, "lignes_invalides": 2}
+    stats = importateur(gestionnaire).importer(str(tmp_path / "releve.csv"))
+    assert stats["transactions_ignorees"] == 2
+    assert [d.id_transaction for d in gestionnaire.depenses] == [
+        import_releves.identifiant_operation(datetime.date(2025, 1, 2), -2.5, "CAFE"),
+        import_releves.identifiant_operation(datetime.date(2025, 1, 2), -2.5, "CAFE", 1)]
+    assert gestionnaire.depenses[0].id_transaction == hashlib.md5(b"2025-01-02_-2.50_CAFE").hexdigest()
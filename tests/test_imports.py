@@ -91,12 +91,13 @@ def test_gestionnaires():
         from app.finance.controllers.gestionnaire_financier import GestionnaireFinancier
         from app.stock.controllers.gestionnaire_stock import GestionnaireStock
         
+        # Sans instantanés : la vérification ne laisse pas de fichiers .cache à côté des CSV
         print("Initialisation du gestionnaire financier...")
-        gf = GestionnaireFinancier()
+        gf = GestionnaireFinancier(instantanes=False)
         print("✓ Gestionnaire financier initialisé")
         
         print("Initialisation du gestionnaire de stock...")
-        gs = GestionnaireStock()
+        gs = GestionnaireStock(instantanes=False)
         print("✓ Gestionnaire de stock initialisé")
         
         # Test de base
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests du filtrage incrémental de la recherche au fil de la saisie.
+"""
+
+from app.ui.recherche_incrementale import RechercheIncrementale
+
+
+def test_filtrage_incremental():
+    """Affiner la saisie ne reparcourt que le résultat précédent ; un autre contexte repart de zéro."""
+    elements = ["alimentation", "loisirs", "logement", "transport", "location"]
+    appels = []
+
+    def candidats():
+        appels.append(1)
+        return list(elements)
+
+    def correspond(element, texte):
+        return texte in element
+
+    recherche = RechercheIncrementale(None, None)
+    assert recherche.filtrer("lo", "Toutes", candidats, correspond) == ["loisirs", "logement", "location"]
+    assert recherche.filtrer("loc", "Toutes", candidats, correspond) == ["location"]
+    assert recherche.filtrer("loca", "Toutes", candidats, correspond) == ["location"]
+    assert len(appels) == 1
+
+    # Texte raccourci ou contexte modifié : filtrage complet
+    assert recherche.filtrer("l", "Toutes", candidats, correspond) == ["alimentation", "loisirs", "logement", "location"]
+    assert recherche.filtrer("l", "Ce mois", candidats, correspond) == ["alimentation", "loisirs", "logement", "location"]
+    assert len(appels) == 3
+
+    recherche.invalider()
+    assert recherche.filtrer("", "Ce mois", candidats, correspond) == elements
+    assert len(appels) == 4
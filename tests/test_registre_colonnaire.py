@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests du registre colonnaire des dépenses et revenus.
+"""
+
+import datetime
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.finance.controllers.registre_colonnaire import RegistreColonnaire
+from app.finance.models.depense import Depense
+
+
+def test_interface_de_liste():
+    """Le registre se comporte comme une liste de dépenses."""
+    registre = RegistreColonnaire(Depense, "categorie")
+    for jour in range(1, 101):
+        registre.append(Depense(float(jour), "divers" if jour % 2 else "loisirs",
+                                datetime.date(2025, 1 + jour % 3, jour % 28 + 1)))
+
+    assert len(registre) == 100
+    assert registre[-1].montant == 100.0
+    assert registre[0].categorie == "divers"
+
+    del registre[0]
+    registre.insert(0, Depense(7.0, "transport", datetime.date(2025, 2, 1)))
+    registre[1] = Depense(3.0, "transport", datetime.date(2025, 2, 2))
+    assert [d.montant for d in registre[:3]] == [7.0, 3.0, 3.0]
+    assert registre[1].date == datetime.date(2025, 2, 2)
+
+
+def test_objets_retenus_seulement_s_ils_sont_utilises():
+    """Un objet utilisé ailleurs est renvoyé tel quel, même décalé ; les autres ne sont pas conservés."""
+    registre = RegistreColonnaire(Depense, "categorie", [
+        Depense(float(jour), "divers", datetime.date(2025, 1, jour)) for jour in range(1, 11)])
+    assert sum(d.montant for d in registre) == 55.0
+
+    depense = registre[5]
+    del registre[0]
+    registre.insert(0, Depense(1.0, "divers", datetime.date(2025, 1, 1)))
+    del registre[0]
+    assert registre[4] is depense
+    assert list(registre._objets.values()) == [depense]
+
+
+def test_reductions_vectorisees():
+    """Totaux et périodes sont calculés sur les colonnes."""
+    registre = RegistreColonnaire(Depense, "categorie", [
+        Depense(10.0, "alimentation", datetime.date(2025, 1, 15)),
+        Depense(5.0, "transport", datetime.date(2025, 2, 1)),
+        Depense(2.5, "alimentation", datetime.date(2025, 2, 20), notes="marché"),
+    ])
+
+    assert registre.total == 17.5
+    assert registre.par_mois == {"2025-01": 10.0, "2025-02": 7.5}
+    assert registre.par_cle == {"alimentation": 12.5, "transport": 5.0}
+    assert registre.somme(datetime.date(2025, 2, 1), datetime.date(2025, 2, 28)) == 7.5
+    assert [d.notes for d in registre.elements(datetime.date(2025, 2, 2))] == ["marché"]
+
+    del registre[1]
+    assert registre.par_cle == {"alimentation": 12.5}
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests des instantanés binaires des fichiers CSV.
+"""
+
+import os
+import pickle
+from array import array
+
+from app.core.snapshot import load_with_snapshot, snapshot_path
+
+
+def charger(chemin, appels):
+    """Charge un CSV de nombres via son instantané en comptant les analyses effectuées."""
+    def analyser():
+        appels.append("complet")
+        with open(chemin, encoding="utf-8") as f:
+            return pickle.PickleBuffer(array("d", map(float, f.read().split())))
+
+    def prolonger(donnees, debut):
+        appels.append(debut)
+        with open(chemin, "rb") as f:
+            f.seek(debut)
+            suite = map(float, f.read().decode("utf-8").split())
+        return pickle.PickleBuffer(array("d", list(memoryview(donnees).cast("B").cast("d")) + list(suite)))
+
+    donnees = load_with_snapshot(str(chemin), analyser, prolonger)
+    return memoryview(donnees).cast("B").cast("d").tolist()
+
+
+def test_instantane_reutilise_puis_invalide(tmp_path):
+    """L'instantané évite l'analyse tant que le CSV est inchangé."""
+    chemin = tmp_path / "Valeurs.csv"
+    chemin.write_text("1\n2\n", encoding="utf-8")
+    appels = []
+
+    assert charger(chemin, appels) == [1.0, 2.0]
+    assert os.path.exists(snapshot_path(str(chemin)))
+    assert charger(chemin, appels) == [1.0, 2.0]
+    assert appels == ["complet"]
+
+    # Ajout en fin de fichier : seule la fin est analysée
+    with open(chemin, "a", encoding="utf-8") as f:
+        f.write("3\n")
+    assert charger(chemin, appels) == [1.0, 2.0, 3.0]
+    assert appels == ["complet", 4]
+
+    # Modification du contenu existant : analyse complète
+    chemin.write_text("7\n8\n9\n", encoding="utf-8")
+    assert charger(chemin, appels) == [7.0, 8.0, 9.0]
+    assert appels == ["complet", 4, "complet"]
+
+
+def test_csv_modifie_pendant_l_analyse(tmp_path):
+    """Un CSV modifié pendant son analyse n'est pas couvert par un instantané."""
+    chemin = tmp_path / "Valeurs.csv"
+    chemin.write_text("1\n2\n", encoding="utf-8")
+
+    def analyser():
+        with open(chemin, "a", encoding="utf-8") as f:
+            f.write("3\n")
+        return pickle.PickleBuffer(array("d", [1.0, 2.0]))
+
+    load_with_snapshot(str(chemin), analyser)
+    assert not os.path.exists(snapshot_path(str(chemin)))
+    appels = []
+    assert charger(chemin, appels) == [1.0, 2.0, 3.0]
+    assert appels == ["complet"]
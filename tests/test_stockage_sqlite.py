@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests du stockage SQLite des gestionnaires financier et de stock.
+"""
+
+import datetime
+import sqlite3
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from app.core.stockage_sqlite import StockageSQLite, migrer_csv
+from app.finance.controllers import gestionnaire_financier
+from app.finance.controllers.gestionnaire_financier import GestionnaireFinancier
+from app.finance.models.depense import Depense
+from app.finance.models.revenu import Revenu
+from app.stock.controllers.gestionnaire_stock import GestionnaireStock
+from app.stock.models.article import Article
+
+
+@pytest.fixture
+def stockage(tmp_path):
+    """Base SQLite temporaire."""
+    stockage = StockageSQLite(str(tmp_path / "gestion.sqlite3"))
+    yield stockage
+    stockage.fermer()
+
+
+def creer_financier(tmp_path, stockage=None):
+    """Crée un gestionnaire financier travaillant dans un répertoire temporaire."""
+    return GestionnaireFinancier(str(tmp_path / "Depenses.csv"), str(tmp_path / "Revenus.csv"),
+                                 instantanes=False, stockage=stockage)
+
+
+def creer_stock(tmp_path, stockage=None):
+    """Crée un gestionnaire de stock travaillant dans un répertoire temporaire."""
+    return GestionnaireStock(str(tmp_path / "Articles.csv"), str(tmp_path / "TransactionsStock.csv"),
+                             instantanes=False, stockage=stockage)
+
+
+def test_finances_en_base(tmp_path, stockage):
+    """Ajouts, modifications et calculs passent par la base et survivent au rechargement."""
+    gestionnaire = creer_financier(tmp_path, stockage)
+    courses = Depense(30.0, "alimentation", datetime.date(2025, 1, 10))
+    gestionnaire.ajouter_depense(courses)
+    gestionnaire.ajouter_depense(Depense(30.0, "alimentation", datetime.date(2025, 1, 10)))
+    gestionnaire.ajouter_depense(Depense(50.0, "transport", datetime.date(2025, 2, 3)))
+    gestionnaire.ajouter_revenu(Revenu(1000.0, "salaire", datetime.date(2025, 1, 1)))
+    gestionnaire.modifier_depense(courses, Depense(20.0, "loisirs", datetime.date(2025, 3, 1)))
+
+    assert not (tmp_path / "Depenses.csv").exists()
+    assert gestionnaire.total_depenses_par_categorie() == {"alimentation": 30.0, "transport": 50.0,
+                                                           "loisirs": 20.0}
+    assert gestionnaire.depenses_mensuelles() == {"2025-01": 30.0, "2025-02": 50.0, "2025-03": 20.0}
+    periode = gestionnaire.depenses_periode(datetime.date(2025, 2, 1))
+    assert [d.categorie for d in periode] == ["transport", "loisirs"]
+    assert periode[1] is gestionnaire.depenses[0]
+
+    gestionnaire.supprimer_depense(periode[0])
+    recharge = creer_financier(tmp_path, stockage)
+    assert [(d.montant, d.categorie) for d in recharge.depenses] == [(20.0, "loisirs"), (30.0, "alimentation")]
+    assert recharge.calculer_solde() == 950.0
+
+    # Sauvegarde complète : lignes mises à jour en place, identifiants conservés
+    recharge.depenses[1].notes = "marché"
+    recharge.sauvegarder_depenses()
+    assert [d.notes for d in creer_financier(tmp_path, stockage).depenses] == ["", "marché"]
+    recharge.supprimer_depense(recharge.depenses[0])
+    assert [d.notes for d in creer_financier(tmp_path, stockage).depenses] == ["marché"]
+
+
+def test_echec_d_ecriture_en_base(tmp_path, stockage, monkeypatch):
+    """Une écriture refusée par la base laisse la liste inchangée et les identifiants alignés."""
+    gestionnaire = creer_financier(tmp_path, stockage)
+    premiere = Depense(10.0, "alimentation", datetime.date(2025, 1, 1))
+    seconde = Depense(20.0, "transport", datetime.date(2025, 1, 2))
+    gestionnaire.ajouter_depense(premiere)
+    gestionnaire.ajouter_depense(seconde)
+
+    def refuser(*args):
+        raise sqlite3.OperationalError("database is locked")
+
+    for methode in ("inserer_ligne", "remplacer", "supprimer"):
+        monkeypatch.setattr(stockage, methode, refuser)
+    gestionnaire.ajouter_depense(Depense(5.0, "divers", datetime.date(2025, 1, 3)))
+    gestionnaire.modifier_depense(premiere, Depense(99.0, "divers", datetime.date(2025, 1, 1)))
+    gestionnaire.supprimer_depense(premiere)
+    assert gestionnaire.depenses == [premiere, seconde]
+    assert gestionnaire.total_depenses_par_categorie() == {"alimentation": 10.0, "transport": 20.0}
+    monkeypatch.undo()
+
+    gestionnaire.supprimer_depense(premiere)
+    gestionnaire.modifier_depense(seconde, Depense(25.0, "transport", datetime.date(2025, 1, 2)))
+    recharge = creer_financier(tmp_path, stockage)
+    assert [d.montant for d in recharge.depenses] == [25.0]
+
+
+def test_stock_en_base(tmp_path, stockage):
+    """Les mouvements mettent à jour la quantité en base, sans journal CSV."""
+    gestionnaire = creer_stock(tmp_path, stockage)
+    gestionnaire.ajouter_article(Article("A1", "Vis", "Quincaillerie", quantite=10, prix_unitaire=0.5))
+    gestionnaire.ajouter_article(Article("A2", "Colle", "Bricolage", quantite=2, prix_unitaire=4.0))
+    gestionnaire.entrer_stock("A1", 5, prix_unitaire=0.4)
+    gestionnaire.sortir_stock("A1", 3)
+
+    assert not (tmp_path / "TransactionsStock_journal.csv").exists()
+    recharge = creer_stock(tmp_path, stockage)
+    assert recharge.articles["A1"].quantite == 12
+    assert [t.quantite for t in recharge.obtenir_transactions_par_article("A1")] == [5, 3]
+    assert recharge.obtenir_valeur_totale_stock() == pytest.approx(14.0)
+    assert recharge.generer_rapport_stock()["categories"]["Bricolage"] == {"nombre": 1, "valeur": 8.0}
+
+
+def test_migration_unique_depuis_csv(tmp_path, stockage):
+    """Les CSV (journal de stock compris) sont copiés dans une base vide, une seule fois."""
+    financier = creer_financier(tmp_path)
+    financier.ajouter_depense(Depense(12.0, "alimentation", datetime.date(2025, 1, 3), notes="marché"))
+    financier.ajouter_revenu(Revenu(900.0, "salaire", datetime.date(2025, 1, 1), id_transaction="T1"))
+    financier.fermer()
+    stock = creer_stock(tmp_path)
+    stock.ajouter_article(Article("A1", "Vis", "Quincaillerie", quantite=1))
+    stock.entrer_stock("A1", 4)
+
+    fichiers = [str(tmp_path / nom) for nom in ("Depenses.csv", "Revenus.csv",
+                                                "Articles.csv", "TransactionsStock.csv")]
+    assert migrer_csv(stockage, *fichiers)
+    assert not migrer_csv(stockage, *fichiers)
+
+    financier = creer_financier(tmp_path, stockage)
+    assert financier.depenses[0].notes == "marché"
+    assert financier.revenus[0].id_transaction == "T1"
+    stock = creer_stock(tmp_path, stockage)
+    assert stock.articles["A1"].quantite == 5
+    assert len(stock.transactions) == 1
+
+
+def test_migration_depuis_les_fichiers_de_l_application(tmp_path, stockage, monkeypatch):
+    """Sans chemin explicite, le stock est migré depuis les fichiers où l'application l'écrit."""
+    monkeypatch.chdir(tmp_path)
+    stock = GestionnaireStock(instantanes=False)
+    stock.ajouter_article(Article("A1", "Vis", "Quincaillerie", quantite=1))
+    stock.entrer_stock("A1", 4)
+
+    assert migrer_csv(stockage, str(tmp_path / "Depenses.csv"), str(tmp_path / "Revenus.csv"))
+
+    stock = GestionnaireStock(stockage=stockage, instantanes=False)
+    assert stock.articles["A1"].quantite == 5
+    assert len(stock.transactions) == 1
+
+
+def test_migration_notee_dans_la_base(tmp_path, stockage, capsys):
+    """Des CSV vides ne sont migrés qu'une fois : la base reste vide sans nouvelle migration."""
+    fichiers = [str(tmp_path / nom) for nom in ("Depenses.csv", "Revenus.csv",
+                                                "Articles.csv", "TransactionsStock.csv")]
+    assert migrer_csv(stockage, *fichiers)
+    assert stockage.est_vide()
+    capsys.readouterr()
+    assert not migrer_csv(stockage, *fichiers)
+    assert "Migration" not in capsys.readouterr().out
+
+@pytest.mark.parametrize("en_base", [False, True])
+def test_import_par_lot(tmp_path, stockage, en_base):
+    """Un lot est validé en entier, écrit en une fois et pris en compte par les calculs."""
+    gestionnaire = creer_financier(tmp_path, stockage if en_base else None)
+    gestionnaire.ajouter_depense(Depense(10.0, "alimentation", datetime.date(2025, 1, 15)))
+    assert gestionnaire.total_depenses_par_categorie() == {"alimentation": 10.0}
+
+    for montant in (-1.0, float("inf")):
+        with pytest.raises(ValueError):
+            gestionnaire.importer_lot([Depense(5.0, "transport", datetime.date(2025, 1, 2)),
+                                       Depense(montant, "transport", datetime.date(2025, 1, 3))])
+    assert len(gestionnaire.depenses) == 1
+
+    lot = [Depense(5.0, "transport", datetime.date(2025, 1, 2)),
+           Revenu(1000.0, "salaire", datetime.date(2025, 1, 1)),
+           Depense(7.5, "alimentation", datetime.date(2025, 2, 1))]
+    assert gestionnaire.importer_lot(lot) == {"depenses": 2, "revenus": 1}
+    assert gestionnaire.total_depenses_par_categorie() == {"alimentation": 17.5, "transport": 5.0}
+    assert [d.montant for d in gestionnaire.depenses_periode(datetime.date(2025, 1, 1))] == [5.0, 10.0, 7.5]
+
+    gestionnaire.fermer()
+    recharge = creer_financier(tmp_path, stockage if en_base else None)
+    assert sorted(d.montant for d in recharge.depenses) == [5.0, 7.5, 10.0]
+    assert recharge.calculer_solde() == 977.5
+
+
+@pytest.mark.parametrize("en_base", [False, True])
+def test_import_par_lot_tout_ou_rien(tmp_path, stockage, en_base, monkeypatch):
+    """Si les revenus d'un lot ne peuvent pas être écrits, ses dépenses ne le sont pas non plus."""
+    gestionnaire = creer_financier(tmp_path, stockage if en_base else None)
+    gestionnaire.ajouter_depense(Depense(10.0, "alimentation", datetime.date(2025, 1, 15)))
+    gestionnaire.fermer()
+
+    if en_base:
+        inserer_lot = stockage.inserer_lot
+
+        def inserer_avec_echec(table, lignes):
+            if table == "revenus":
+                raise OSError("disque plein")
+            return inserer_lot(table, lignes)
+
+        monkeypatch.setattr(stockage, "inserer_lot", inserer_avec_echec)
+    else:
+        ajouter_bloc = gestionnaire_financier.append_csv_block
+
+        def ajouter_avec_echec(fichier, champs, lignes):
+            if fichier == gestionnaire.fichier_revenus:
+                raise OSError("disque plein")
+            return ajouter_bloc(fichier, champs, lignes)
+
+        monkeypatch.setattr(gestionnaire_financier, "append_csv_block", ajouter_avec_echec)
+
+    with pytest.raises(OSError):
+        gestionnaire.importer_lot([Depense(5.0, "transport", datetime.date(2025, 1, 2)),
+                                   Revenu(1000.0, "salaire", datetime.date(2025, 1, 1))])
+    assert len(gestionnaire.depenses) == 1
+    monkeypatch.undo()
+    gestionnaire.fermer()
+    recharge = creer_financier(tmp_path, stockage if en_base else None)
+    assert [d.montant for d in recharge.depenses] == [10.0]
+    assert recharge.revenus == []
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests de la synchronisation bancaire (dédoublonnage, synchronisation globale, repères).
+"""
+
+import datetime
+import hashlib
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("matplotlib")
+pytest.importorskip("keyring")
+
+from app.finance.controllers.gestionnaire_financier import GestionnaireFinancier
+from app.finance.integrations.api_bancaire import SynchronisationBancaire
+
+
+class ApiFictive:
+    """API bancaire retournant toujours les mêmes transactions."""
+
+    def __init__(self, transactions):
+        self.transactions = transactions
+        self.api_configs = {}
+        self.debuts = []
+
+    def iter_transactions(self, bank, account_id, from_date=None, to_date=None):
+        self.debuts.append(from_date)
+        yield self.transactions
+
+
+class BanquesFictives:
+    """Plusieurs banques fictives, dont une en erreur ; les comptes attendent d'être interrogés ensemble."""
+
+    def __init__(self):
+        self.api_configs = {"banque_a": {}, "banque_b": {}, "banque_c": {}, "non_authentifiee": {}}
+        self.tokens = {"banque_a": {}, "banque_b": {}, "banque_c": {}}
+        self.rendez_vous = threading.Barrier(2, timeout=5)
+
+    def get_accounts(self, bank):
+        if bank == "banque_c":
+            raise RuntimeError("service indisponible")
+        return {"accounts": [{"id": f"{bank}_1"}, {"id": f"{bank}_2"}] if bank == "banque_a" else [{"id": f"{bank}_1"}]}
+
+    def iter_transactions(self, bank, account_id, from_date=None, to_date=None):
+        if account_id != "banque_a_2":
+            self.rendez_vous.wait()
+        yield [{"id": account_id, "date": "2025-01-02", "amount": "-10", "description": "CARREFOUR", "type": "DEBIT"}]
+        yield [{"id": "VIREMENT", "date": "2025-01-05", "amount": "100", "description": "VIREMENT", "type": "CREDIT"}]
+
+
+@pytest.fixture
+def synchro(tmp_path, monkeypatch):
+    """Synchronisation travaillant dans un répertoire temporaire."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "categories_mapping.json").write_text(
+        json.dumps({"depenses": {"CARREFOUR": "alimentation"}, "revenus": {}}), encoding="utf-8")
+    gestionnaire = GestionnaireFinancier(str(tmp_path / "Depenses.csv"), str(tmp_path / "Revenus.csv"))
+    return SynchronisationBancaire(gestionnaire, str(tmp_path / "transactions_importees.json"),
+                                   str(tmp_path / "reperes_synchronisation.json"),
+                                   fichier_modele_categories=str(tmp_path / "modele_categories.json"))
+
+
+def test_transactions_importees_une_seule_fois(synchro, tmp_path):
+    """Les transactions déjà importées (ou répétées dans le relevé) sont ignorées."""
+    transactions = [
+        {"id": "T1", "date": "2025-01-02", "amount": "-12.30", "description": "CARREFOUR", "type": "DEBIT"},
+        {"id": "T2", "date": "2025-01-03", "amount": "1500", "description": "SALAIRE", "type": "CREDIT"},
+        {"id": "T1", "date": "2025-01-02", "amount": "-12.30", "description": "CARREFOUR", "type": "DEBIT"},
+    ]
+    synchro.api = ApiFictive(transactions)
+
+    stats = synchro.synchroniser_transactions("monabanq", "compte")
+    assert (stats["depenses_ajoutees"], stats["revenus_ajoutes"], stats["transactions_ignorees"]) == (1, 1, 1)
+    assert synchro.gestionnaire.depenses[0].categorie == "alimentation"
+
+    stats = synchro.synchroniser_transactions("monabanq", "compte")
+    assert stats["transactions_ignorees"] == 3
+    with open(tmp_path / "transactions_importees.json") as f:
+        assert json.load(f) == ["T1", "T2"]
+
+
+def test_transactions_sans_reference_sur_plusieurs_pages(synchro):
+    """Des transactions identiques sans référence sont distinguées sur tout le compte, pas par page,
+    et la première garde l'identifiant des versions précédentes."""
+    transaction = {"date": "2025-01-02", "amount": "-2.5", "description": "CAFE", "type": "DEBIT"}
+
+    class ApiPaginee(ApiFictive):
+        def iter_transactions(self, bank, account_id, from_date=None, to_date=None):
+            yield [dict(transaction)]
+            yield [dict(transaction)]
+
+    synchro.api = ApiPaginee([])
+    stats = synchro.synchroniser_transactions("monabanq", "compte")
+    assert (stats["depenses_ajoutees"], stats["transactions_ignorees"]) == (2, 0)
+    assert synchro.gestionnaire.depenses[0].id_transaction == hashlib.md5(b"2025-01-02_-2.5_CAFE").hexdigest()
+
+    stats = synchro.synchroniser_transactions("monabanq", "compte")
+    assert (stats["depenses_ajoutees"], stats["transactions_ignorees"]) == (0, 2)
+
+
+def test_synchronisation_globale_parallele(synchro):
+    """Tous les comptes des banques authentifiées sont interrogés en parallèle puis fusionnés."""
+    synchro.api = BanquesFictives()
+
+    stats = synchro.synchroniser_tout(max_workers=4)
+    assert stats["comptes_synchronises"] == 3
+    assert stats["depenses_ajoutees"] == 3
+    assert stats["revenus_ajoutes"] == 1
+    assert stats["transactions_ignorees"] == 2
+    assert stats["erreurs"] == ["banque_c: service indisponible"]
+    assert len(synchro.gestionnaire.depenses) == 3
+
+
+def test_reprise_au_repere_du_compte(synchro):
+    """Une synchronisation sans date reprend au repère du compte, moins le chevauchement."""
+    synchro.api = ApiFictive([
+        {"id": "T1", "date": "2025-01-02", "amount": "-12.30", "description": "CARREFOUR", "type": "DEBIT"},
+        {"id": "T2", "date": "2025-01-05", "amount": "-8", "description": "CARREFOUR", "type": "DEBIT"},
+    ])
+
+    synchro.synchroniser_transactions("monabanq", "compte")
+    synchro.synchroniser_transactions("monabanq", "compte")
+    assert synchro.api.debuts[1] == datetime.datetime(2025, 1, 2)
+    assert synchro.reperes == {"monabanq": {"compte": {"date": "2025-01-05"}}}
+
+    # Une période commençant après le repère laisserait un trou : le repère ne bouge pas
+    synchro.api.transactions = [
+        {"id": "T3", "date": "2025-03-01", "amount": "-5", "description": "CARREFOUR", "type": "DEBIT"}]
+    synchro.synchroniser_transactions("monabanq", "compte", datetime.datetime(2025, 2, 15))
+    assert synchro.reperes["monabanq"]["compte"]["date"] == "2025-01-05"
+
+
+def test_modele_appris_apres_les_mappings(synchro):
+    """Les libellés sans mapping sont catégorisés par le modèle entraîné sur les imports recatégorisés."""
+    synchro.api = ApiFictive([
+        {"id": "T1", "date": "2025-01-02", "amount": "-9.90", "description": "CB NETFLIX.COM 02/01", "type": "DEBIT"},
+        {"id": "T2", "date": "2025-01-03", "amount": "-30", "description": "CB CARREFOUR NETFLIX", "type": "DEBIT"},
+    ])
+    synchro.synchroniser_transactions("monabanq", "compte")
+    assert [d.categorie for d in synchro.gestionnaire.depenses] == ["divers", "alimentation"]
+
+    synchro.gestionnaire.depenses[0].categorie = "abonnements"
+    assert synchro.entrainer_modele_categories() == {"depenses": 2, "revenus": 0}
+    assert synchro.guess_categories("DEBIT", ["PRLV NETFLIX 03/02", "CARREFOUR CITY", "VIREMENT"]) == [
+        "abonnements", "alimentation", "divers"]
+    recharge = SynchronisationBancaire(synchro.gestionnaire, fichier_modele_categories=synchro.fichier_modele_categories)
+    assert recharge.guess_category("DEBIT", "NETFLIX") == "abonnements"
+
+
+def test_repere_inchange_apres_une_page_en_echec(synchro, monkeypatch):
+    """Un compte dont une page n'a pas pu être intégrée garde son repère : la page sera redemandée."""
+    synchro.api = BanquesFictives()
+    synchro.api.rendez_vous = threading.Barrier(1)
+    integrer = synchro._integrer_transactions
+    echecs = []
+
+    def integrer_avec_echec(page, stats, occurrences=None):
+        if page[0]["id"] == "banque_b_1" and not echecs:
+            echecs.append(page)
+            raise OSError("disque plein")
+        integrer(page, stats, occurrences)
+
+    monkeypatch.setattr(synchro, "_integrer_transactions", integrer_avec_echec)
+    stats = synchro.synchroniser_tout(max_workers=4)
+    assert "banque_b (banque_b_1): disque plein" in stats["erreurs"]
+    assert stats["comptes_synchronises"] == 2
+    assert "banque_b_1" not in synchro.reperes.get("banque_b", {})
+    assert synchro.reperes["banque_a"]["banque_a_1"]["date"] == "2025-01-05"
+
+    # La synchronisation suivante redemande la page et importe la transaction perdue
+    stats = synchro.synchroniser_tout(max_workers=4)
+    assert stats["depenses_ajoutees"] == 1
+    assert synchro.reperes["banque_b"]["banque_b_1"]["date"] == "2025-01-05"
+
+
+def test_erreur_d_integration_sans_blocage(synchro):
+    """Une erreur de l'intégration hors des pages arrête les threads bloqués sur la file pleine."""
+
+    class BanqueVolumineuse:
+        api_configs = {"banque_a": {}, "banque_b": {}}
+        tokens = {"banque_a": {}, "banque_b": {}}
+
+        def get_accounts(self, bank):
+            # Le compte sans ID de banque_b fait échouer l'intégration des listes de comptes
+            return {"accounts": [{"id": "compte"}] if bank == "banque_a" else [{"numero": "sans id"}]}
+
+        def iter_transactions(self, bank, account_id, from_date=None, to_date=None):
+            for i in range(200):
+                yield [{"id": f"T{i}", "date": "2025-01-02", "amount": "-1", "description": "CAFE", "type": "DEBIT"}]
+
+    synchro.api = BanqueVolumineuse()
+    erreurs = []
+
+    def synchroniser():
+        try:
+            synchro.synchroniser_tout(max_workers=1)
+        except KeyError as e:
+            erreurs.append(e)
+
+    thread = threading.Thread(target=synchroniser, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert len(erreurs) == 1